@@ -10,16 +10,21 @@ import requests
 from dateutil import tz
 from tqdm import tqdm
 import typer
+from headline_reactor.vendors.bbg_fetch import PipelinedFetcher, security_rows
+from headline_reactor.vendors.bbg_session import get_pool
+from headline_reactor.catalogs.incremental import (REFRESH_COL, diff_universe, merge_refresh,
+                                                   load_existing, write_versioned)
+from headline_reactor.catalogs.stats import STATS_COLUMNS, liquidity_stats
+from headline_reactor.catalogs.fx import FxCache
 
-# Bloomberg
-try:
-    import blpapi
-except Exception as e:
-    blpapi = None
+# Bloomberg (real bindings, or the offline stand-in when BLP_OFFLINE is set)
+from headline_reactor.vendors.bbg_api import blpapi
 
 app = typer.Typer(add_completion=False)
 CATALOG_DIR = Path("catalog")
 CATALOG_DIR.mkdir(parents=True, exist_ok=True)
+BLP_CHUNK = int(os.getenv("BLP_CHUNK", "450"))        # securities per request
+BLP_INFLIGHT = int(os.getenv("BLP_INFLIGHT", "4"))    # chunk requests outstanding at once
 
 # -------------------------------
 # Bloomberg helpers (Request/Response)
@@ -30,22 +35,6 @@ def require_blp():
         typer.echo("blpapi not installed. Install Bloomberg Desktop API Python bindings.")
         raise typer.Exit(2)
 
-def _open_session() -> blpapi.Session:
-    host = os.getenv("BLP_HOST", "localhost")
-    port = int(os.getenv("BLP_PORT", "8194"))
-    opts = blpapi.SessionOptions()
-    opts.setServerHost(host)
-    opts.setServerPort(port)
-    sess = blpapi.Session(opts)
-    if not sess.start():
-        raise RuntimeError("Failed to start Bloomberg session")
-    return sess
-
-def _open_service(sess: blpapi.Session, name: str) -> blpapi.Service:
-    if not sess.openService(name):
-        raise RuntimeError(f"Failed to open Bloomberg service: {name}")
-    return sess.getService(name)
-
 def _send_request(sess: blpapi.Session, service: blpapi.Service, request: blpapi.Request) -> List[blpapi.Message]:
     cid = blpapi.CorrelationId()
     sess.sendRequest(request, correlationId=cid)
@@ -59,96 +48,43 @@ def _send_request(sess: blpapi.Session, service: blpapi.Service, request: blpapi
             break
     return out
 
-def bbg_refdata(securities: List[str], fields: List[str], overrides: Dict[str, Any] | None = None, chunk: int = 450) -> List[Dict[str, Any]]:
+def bbg_refdata(securities: List[str], fields: List[str], overrides: Dict[str, Any] | None = None,
+                chunk: int = BLP_CHUNK, concurrency: int = BLP_INFLIGHT) -> List[Dict[str, Any]]:
     """ReferenceDataRequest (//blp/refdata). Returns list of dicts with requested fields."""
     require_blp()
-    sess = _open_session()
-    try:
-        ref = _open_service(sess, "//blp/refdata")
+    with get_pool().lease() as bbg:
+        ref = bbg.service("//blp/refdata")
         out_rows: List[Dict[str, Any]] = []
-        for i in range(0, len(securities), chunk):
-            secs = securities[i:i+chunk]
-            req = ref.createRequest("ReferenceDataRequest")
-            e_secs = req.getElement("securities")
-            for s in secs:
-                e_secs.appendValue(s)
-            e_flds = req.getElement("fields")
-            for f in fields:
-                e_flds.appendValue(f)
-            if overrides:
-                e_ovr = req.getElement("overrides")
-                for k, v in overrides.items():
-                    o = e_ovr.appendElement()
-                    o.setElement("fieldId", k)
-                    o.setElement("value", v)
-            msgs = _send_request(sess, ref, req)
-            # Parse
-            for m in msgs:
-                if not m.hasElement("securityData"): 
-                    continue
-                sd = m.getElement("securityData")
-                for j in range(sd.numValues()):
-                    rec = sd.getValueAsElement(j)
-                    sec = rec.getElementAsString("security")
-                    fd = rec.getElement("fieldData")
-                    row = {"security": sec}
-                    for f in fields:
-                        if fd.hasElement(f):
-                            val = fd.getElement(f)
-                            row[f] = _bbg_any(val)
-                    # Attach error if any
-                    if rec.hasElement("securityError"):
-                        row["_securityError"] = rec.getElement("securityError").toString()
-                    out_rows.append(row)
+        fetcher = PipelinedFetcher(bbg.session, ref, "ReferenceDataRequest", chunk=chunk, concurrency=concurrency)
+        rep = fetcher.run(securities, fields,
+                          lambda _i, m: out_rows.extend(security_rows(m, fields, _bbg_any, errors=True)),
+                          overrides=overrides)
+        if len(rep.chunks) > 1 or rep.failed():
+            typer.echo(f"  refdata: {rep.summary()}")
         return out_rows
-    finally:
-        sess.stop()
 
-def bbg_static(securities: List[str], fields: List[str], chunk: int = 450) -> List[Dict[str, Any]]:
+def bbg_static(securities: List[str], fields: List[str], chunk: int = BLP_CHUNK,
+               concurrency: int = BLP_INFLIGHT) -> List[Dict[str, Any]]:
     """StaticMarketDataRequest (//blp/staticmktdata) for snapshot bid/ask, etc."""
     require_blp()
-    sess = _open_session()
-    try:
-        svc = _open_service(sess, "//blp/staticmktdata")
+    with get_pool().lease() as bbg:
+        svc = bbg.service("//blp/staticmktdata")
         out_rows: List[Dict[str, Any]] = []
-        for i in range(0, len(securities), chunk):
-            secs = securities[i:i+chunk]
-            req = svc.createRequest("StaticMarketDataRequest")
-            e_secs = req.getElement("securities")
-            for s in secs:
-                e_secs.appendValue(s)
-            e_flds = req.getElement("fields")
-            for f in fields:
-                e_flds.appendValue(f)
-            msgs = _send_request(sess, svc, req)
-            for m in msgs:
-                if not m.hasElement("securityData"): 
-                    continue
-                sd = m.getElement("securityData")
-                for j in range(sd.numValues()):
-                    rec = sd.getValueAsElement(j)
-                    sec = rec.getElementAsString("security")
-                    fd = rec.getElement("fieldData")
-                    row = {"security": sec}
-                    for f in fields:
-                        if fd.hasElement(f):
-                            val = fd.getElement(f)
-                            row[f] = _bbg_any(val)
-                    out_rows.append(row)
+        fetcher = PipelinedFetcher(bbg.session, svc, "StaticMarketDataRequest", chunk=chunk, concurrency=concurrency)
+        rep = fetcher.run(securities, fields, lambda _i, m: out_rows.extend(security_rows(m, fields, _bbg_any)))
+        if len(rep.chunks) > 1 or rep.failed():
+            typer.echo(f"  static: {rep.summary()}")
         return out_rows
-    finally:
-        sess.stop()
 
 def bbg_bulk(security: str, bulk_field: str) -> List[Dict[str, Any]]:
     """Request bulk field for a single security (e.g., INDX_MEMBERS, FUT_CHAIN)."""
     require_blp()
-    sess = _open_session()
-    try:
-        ref = _open_service(sess, "//blp/refdata")
+    with get_pool().lease() as bbg:
+        ref = bbg.service("//blp/refdata")
         req = ref.createRequest("ReferenceDataRequest")
         req.getElement("securities").appendValue(security)
         req.getElement("fields").appendValue(bulk_field)
-        msgs = _send_request(sess, ref, req)
+        msgs = _send_request(bbg.session, ref, req)
         out: List[Dict[str, Any]] = []
         for m in msgs:
             sd = m.getElement("securityData")
@@ -161,8 +97,6 @@ def bbg_bulk(security: str, bulk_field: str) -> List[Dict[str, Any]]:
                         el = blk.getValueAsElement(r)
                         out.append(_bbg_bulk_row(el))
         return out
-    finally:
-        sess.stop()
 
 def _bbg_any(el: blpapi.Element):
     if el.isArray():
@@ -263,14 +197,6 @@ def expand_index_members(index_ticker: str) -> List[str]:
                 break
     return list(dict.fromkeys(out))  # dedup keep order
 
-def _fx_pairs_needed(candidates: Iterable[Tuple[str,str]]) -> List[str]:
-    """Return FX tickers like EURUSD Curncy for non-USD conversions."""
-    pairs = set()
-    for crncy, _ in candidates:
-        if crncy and crncy.upper() != "USD":
-            pairs.add(f"{crncy.upper()}USD Curncy")
-    return sorted(pairs)
-
 def _get_fx(sessionless: bool, pairs: List[str]) -> Dict[str, float]:
     if not pairs:
         return {}
@@ -283,22 +209,29 @@ def _get_fx(sessionless: bool, pairs: List[str]) -> Dict[str, float]:
         if px: out[sec.split()[0].upper()] = float(px)  # "EURUSD Curncy" -> "EURUSD": px
     return out
 
-def build_secmaster(seeds: List[str], expand_indices: bool = True) -> pd.DataFrame:
-    """Build or extend secmaster from a seed universe."""
-    # Expand indices to members if asked
+def expand_seeds(seeds: List[str]) -> List[str]:
+    """Seed list -> unique security strings, with indices expanded to their members."""
     securities: List[str] = []
     for s in seeds:
         if s.upper().endswith("INDEX"):
             securities += expand_index_members(s)
         else:
             securities.append(normalize_equity(s))
-    securities = list(dict.fromkeys(securities))
+    return list(dict.fromkeys(securities))
+
+def build_secmaster(seeds: List[str], expand_indices: bool = True) -> pd.DataFrame:
+    """Build or extend secmaster from a seed universe."""
+    securities = expand_seeds(seeds)
     if not securities:
         return pd.DataFrame()
+    return secmaster_rows(securities)
 
-    # Fetch reference data
+def secmaster_rows(securities: List[str]) -> pd.DataFrame:
+    """Fetch reference data for `securities` and normalize it to secmaster columns."""
     rows = bbg_refdata(securities, REF_FIELDS)
     df = pd.DataFrame(rows)
+    if df.empty:
+        return df
     # Choose sector col (prefer GICS)
     if "GICS_SECTOR_NAME" in df and df["GICS_SECTOR_NAME"].notna().any():
         df["sector"] = df["GICS_SECTOR_NAME"]
@@ -347,61 +280,13 @@ def build_stats(secmaster: pd.DataFrame) -> pd.DataFrame:
     secs = secmaster["bbg"].tolist()
     snap = pd.DataFrame(bbg_static(secs, SNAP_FIELDS))
     if snap.empty:
-        return pd.DataFrame(columns=["symbol","adv_usd","avg_spread_bps"])
+        return pd.DataFrame(columns=STATS_COLUMNS)
 
     # Merge on security string
     tmp = secmaster[["bbg","symbol","exchange","mic","country"]].merge(snap, how="left", left_on="bbg", right_on="security")
-    # FX conversions
-    needed = []
-    for _, r in tmp.iterrows():
-        cur = r.get("CRNCY")
-        if isinstance(cur, str) and cur.upper()!="USD":
-            needed.append((cur, r["symbol"]))
-    fx_map = _get_fx(False, _fx_pairs_needed(needed))
-    def fx_to_usd(crncy: str) -> float:
-        if not isinstance(crncy, str) or crncy.upper()=="USD":
-            return 1.0
-        pair = (crncy.upper()+"USD")
-        return float(fx_map.get(pair, 0.0)) or 0.0
-
-    # ADV candidates: VOLUME_AVG_30D or VOLUME_AVG_20D
-    vol = tmp.get("VOLUME_AVG_30D")
-    if vol is None or vol.isna().all():
-        vol = tmp.get("VOLUME_AVG_20D")
-    px = tmp.get("PX_LAST")
-    cr = tmp.get("CRNCY")
-
-    adv_usd = []
-    for i, r in tmp.iterrows():
-        v = r.get("VOLUME_AVG_30D")
-        if v is None or (isinstance(v,float) and math.isnan(v)):
-            v = r.get("VOLUME_AVG_20D")
-        price = r.get("PX_LAST")
-        fxv = fx_to_usd(r.get("CRNCY"))
-        if v and price and fxv:
-            adv_usd.append(float(v) * float(price) * float(fxv))
-        else:
-            adv_usd.append(None)
-
-    # Spread bps from snapshot bid/ask
-    spreads = []
-    for _, r in tmp.iterrows():
-        bid, ask = r.get("BID"), r.get("ASK")
-        if bid and ask and bid>0 and ask>0:
-            mid = 0.5*(bid+ask)
-            bps = (ask - bid)/mid * 10000.0
-            spreads.append(max(bps, 0.0))
-        else:
-            spreads.append(None)
-
-    out = pd.DataFrame({
-        "symbol": tmp["symbol"],
-        "adv_usd": adv_usd,
-        "avg_spread_bps": spreads
-    })
-    # de-dup on symbol (keep max ADV if multiple lines)
-    out = out.groupby("symbol", as_index=False).agg({"adv_usd":"max","avg_spread_bps":"min"})
-    return out
+    fx = FxCache(fetch=lambda pairs: _get_fx(False, pairs))
+    fx_map = fx.ensure(tmp["CRNCY"].dropna().unique()) if "CRNCY" in tmp.columns else {}
+    return liquidity_stats(tmp, fx_map)
 
 def write_parquet(df: pd.DataFrame, path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -478,7 +363,9 @@ def try_futures_fronts(roots: List[str]) -> Dict[str,str]:
 def secmaster(seed_file: Optional[str] = typer.Option(None, help="Text file with one security per line (e.g., 'AAPL US Equity', '005930 KS Equity', 'SPX Index')"),
               seeds: Optional[str] = typer.Option(None, help="Comma-separated tickers or indices"),
               add_indices: str = typer.Option("SPX Index,NDX Index,RTY Index,SX5E Index,DAX Index,CAC Index,UKX Index", help="Index tickers to expand (comma-separated)"),
-              out: str = typer.Option(str(CATALOG_DIR / "secmaster.parquet"))):
+              out: str = typer.Option(str(CATALOG_DIR / "secmaster.parquet")),
+              incremental: bool = typer.Option(False, help="Refetch only new securities plus a stale slice of existing ones"),
+              stale_fraction: float = typer.Option(0.05, help="Share of unchanged rows refetched per incremental run")):
     """
     Build/extend catalog/secmaster.parquet from Bloomberg.
     """
@@ -499,12 +386,25 @@ def secmaster(seed_file: Optional[str] = typer.Option(None, help="Text file with
     seed_list = list(dict.fromkeys(seed_list))
 
     typer.echo(f"Resolving ~{len(seed_list)} seeds via Bloomberg...")
-    df = build_secmaster(seed_list, expand_indices=True)
-    if df.empty:
+    out_path = Path(out)
+    securities = expand_seeds(seed_list)
+    existing = load_existing(out_path) if incremental else None
+    if existing is not None and REFRESH_COL not in existing.columns:
+        typer.echo(f"{out} predates incremental builds; doing a full refresh.")
+        existing = None
+    diff = diff_universe(securities, existing, key="bbg", stale_fraction=stale_fraction)
+    if existing is not None:
+        typer.echo(f"Incremental: {diff.summary()}")
+    fresh = secmaster_rows(diff.to_fetch) if diff.to_fetch else pd.DataFrame()
+    if fresh.empty and existing is None:
         typer.echo("No rows returned; check entitlements and seeds.")
         raise typer.Exit(1)
-    write_parquet(df, Path(out))
-    typer.echo(f"Wrote {out} with {len(df):,} rows.")
+    if fresh.empty:
+        fresh = existing.iloc[0:0]
+    df = merge_refresh(existing, fresh, diff, securities, key="bbg")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    version = write_versioned(df, out_path)
+    typer.echo(f"Wrote {out} with {len(df):,} rows (version {version}).")
 
 @app.command()
 def stats(secmaster_path: str = typer.Option(str(CATALOG_DIR / "secmaster.parquet")),
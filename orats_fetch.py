@@ -4,8 +4,8 @@ import os
 from pathlib import Path
 from io import StringIO
 import pandas as pd
-import requests
 import typer
+from headline_reactor.vendors import orats_http
 
 app = typer.Typer(add_completion=False)
 BASE = "https://api.orats.io/datav2"
@@ -19,7 +19,7 @@ def _token() -> str:
 def _csv_get(path: str, params: dict) -> pd.DataFrame:
     p = dict(params)
     p["token"] = _token()
-    r = requests.get(f"{BASE}/{path}", params=p, timeout=30)
+    r = orats_http.get(f"{BASE}/{path}", p, timeout=30)
     r.raise_for_status()
     return pd.read_csv(StringIO(r.text))
 
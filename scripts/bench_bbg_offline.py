@@ -0,0 +1,76 @@
+"""Benchmark the catalog pipeline against the offline Bloomberg stand-in (no terminal needed)"""
+import argparse
+import cProfile
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=10000, help="Securities per screen")
+    ap.add_argument("--chunk", type=int, default=450)
+    ap.add_argument("--inflight", type=int, default=4)
+    ap.add_argument("--latency-ms", type=float, default=40.0, help="Per-request latency")
+    ap.add_argument("--per-sec-us", type=float, default=200.0, help="Extra latency per security")
+    ap.add_argument("--fixtures", default=None, help="Fixture directory (default: synthetic data)")
+    ap.add_argument("--cprofile", default=None, help="Write a cProfile dump of the run here")
+    args = ap.parse_args()
+
+    # Must be set before the pipeline imports blpapi
+    os.environ["BLP_OFFLINE"] = args.fixtures or "synthetic"
+    os.environ["BLP_OFFLINE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["BLP_OFFLINE_PER_SEC_US"] = str(args.per_sec_us)
+    os.environ["BLP_OFFLINE_UNIVERSE"] = str(args.n)
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(ROOT / "src"))
+
+    import us_universe_pipeline as up
+    from headline_reactor.catalogs.stats import liquidity_stats
+    from headline_reactor.vendors.bbg_status import StatusService, status_snapshot
+
+    results = []
+
+    def step(name, fn, n_items=None):
+        t = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t
+        n = n_items if n_items is not None else len(out)
+        results.append((name, n, dt))
+        return out
+
+    prof = cProfile.Profile() if args.cprofile else None
+    if prof:
+        prof.enable()
+    t0 = time.perf_counter()
+    secs = step("beqs", lambda: up.beqs_list("US_COMMON_PRIMARY", max_results=args.n, cache_ttl_hours=0))
+    ref = step("refdata", lambda: up.refdata(secs, up.REF_FIELDS, chunk=args.chunk, concurrency=args.inflight))
+    uni = step("normalize", lambda: up.normalize_ref(ref))
+    snap = step("static_snap", lambda: up.static_snap(secs, up.SNAP_FIELDS, chunk=args.chunk, concurrency=args.inflight))
+    tmp = uni[["bbg", "symbol"]].merge(snap, on="bbg", how="left")
+    step("stats", lambda: liquidity_stats(tmp, up.fx_rates(tmp["CRNCY"])))
+    step("status", lambda: status_snapshot(secs[:500]))
+    svc = StatusService()
+    step("status_sub", lambda: (svc.subscribe(secs[:500]), svc.wait_ready(30)), n_items=500)
+    step("halt_check", lambda: [svc.halted(s) for s in secs])
+    svc.stop()
+    total = time.perf_counter() - t0
+    if prof:
+        prof.disable()
+        prof.dump_stats(args.cprofile)
+
+    print("=" * 70)
+    print(f"OFFLINE PIPELINE BENCH: n={args.n:,} chunk={args.chunk} inflight={args.inflight} "
+          f"latency={args.latency_ms:.0f}ms+{args.per_sec_us:.0f}us/sec")
+    print("=" * 70)
+    for name, n, dt in results:
+        rate = n / dt if dt > 0 else float("inf")
+        print(f"  {name:<12} {n:>8,} rows  {dt*1000:>9.1f} ms  {rate:>10,.0f} rows/s")
+    print(f"  {'total':<12} {'':>8}       {total*1000:>9.1f} ms")
+    if prof:
+        print(f"\ncProfile written to {args.cprofile}")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from typing import Optional, Tuple
 from PIL import Image, ImageGrab, ImageOps
 import pygetwindow as gw
 import win32gui  # type: ignore
+from .ops.spans import span
 
 DEFAULT_WINDOW = "Alert Catcher"
 ROI_TOP_PX = 115
@@ -18,6 +19,7 @@ def find_news_window_rect(title_part: str = DEFAULT_WINDOW) -> Optional[Tuple[in
                 continue
     return None
 
+@span("capture.grab")
 def grab_topline(rect: Tuple[int,int,int,int], roi_top_px: int = ROI_TOP_PX, roi_h_px: int = ROI_HEIGHT_PX) -> Image.Image:
     l,t,r,b = rect
     roi_top = t + roi_top_px
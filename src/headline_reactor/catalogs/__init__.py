@@ -0,0 +1 @@
+"""Catalog build helpers shared by build_catalogs.py and us_universe_pipeline.py."""
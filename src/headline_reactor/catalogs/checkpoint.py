@@ -0,0 +1,111 @@
+# src/headline_reactor/catalogs/checkpoint.py
+from __future__ import annotations
+import hashlib
+import json
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+import pandas as pd
+
+def fingerprint(*parts: Iterable[Any]) -> str:
+    """Stable key for a fetch's inputs; a changed key invalidates saved chunks."""
+    h = hashlib.sha1()
+    for part in parts:
+        for x in (part if isinstance(part, (list, tuple)) else [part]):
+            h.update(str(x).encode())
+            h.update(b"\x1f")
+        h.update(b"\x1e")
+    return h.hexdigest()[:16]
+
+class ChunkCheckpoint:
+    """
+    Completed chunks of a chunked fetch, one parquet file each, plus a manifest.
+
+    A rerun with the same key skips chunks already on disk; a different key
+    (other securities, fields or chunk size) starts over.
+    """
+
+    def __init__(self, root: Path, key: str):
+        self.root = root
+        self.key = key
+        self._lock = threading.Lock()
+        self._done: Set[int] = set()
+        manifest = self._load_manifest()
+        if manifest.get("key") == key:
+            self._done = set(manifest.get("done", []))
+        elif root.exists():
+            shutil.rmtree(root, ignore_errors=True)
+
+    def _manifest(self) -> Path:
+        return self.root / "manifest.json"
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self._manifest().read_text())
+        except Exception:
+            return {}
+
+    def done(self) -> Set[int]:
+        return set(self._done)
+
+    def save(self, idx: int, rows: List[Dict[str, Any]]):
+        """Persist one completed chunk, then mark it done."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        if rows:
+            p = self.root / f"chunk-{idx:05d}.parquet"
+            tmp = p.with_suffix(".tmp")
+            pd.DataFrame(rows).to_parquet(tmp, index=False)
+            tmp.replace(p)
+        with self._lock:
+            self._done.add(idx)
+            m = self._manifest()
+            tmp = m.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"key": self.key, "done": sorted(self._done)}))
+            tmp.replace(m)
+
+    def iter_frames(self) -> Iterator[pd.DataFrame]:
+        """Saved chunks one at a time, in chunk order."""
+        for f in sorted(self.root.glob("chunk-*.parquet")) if self.root.exists() else []:
+            yield pd.read_parquet(f)
+
+    def load(self) -> pd.DataFrame:
+        """All saved rows, in chunk order."""
+        frames = list(self.iter_frames())
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._done.clear()
+
+class RunState:
+    """Completed-step markers (and small step outputs) for a resumable pipeline run."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._lock = threading.Lock()
+        try:
+            self._state: Dict[str, Any] = json.loads((root / "state.json").read_text())
+        except Exception:
+            self._state = {}
+
+    def is_done(self, step: str) -> bool:
+        return step in self._state
+
+    def value(self, step: str) -> Any:
+        return self._state.get(step)
+
+    def mark_done(self, step: str, value: Any = None):
+        with self._lock:
+            self._state[step] = value
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.root / "state.tmp"
+            tmp.write_text(json.dumps(self._state))
+            tmp.replace(self.root / "state.json")
+
+    def chunks(self, step: str, key: str) -> ChunkCheckpoint:
+        return ChunkCheckpoint(self.root / step, key)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._state = {}
@@ -0,0 +1,91 @@
+# src/headline_reactor/catalogs/dag.py
+from __future__ import annotations
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from .checkpoint import RunState
+
+@dataclass
+class Step:
+    """
+    One pipeline step. `run(ctx)` gets the outputs of earlier steps by name and
+    returns this step's output; `rows(output)` counts it for throughput.
+    Outputs must be JSON-serialisable (small values or file paths) to be resumable.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    deps: List[str] = field(default_factory=list)
+    rows: Optional[Callable[[Any], int]] = None
+
+@dataclass
+class StepResult:
+    name: str
+    status: str                 # ok | resumed | failed | skipped
+    wall_s: float = 0.0
+    rows: Optional[int] = None
+    error: Optional[str] = None
+
+    def line(self) -> str:
+        rate = f"{self.rows / self.wall_s:>10,.0f} rows/s" if self.rows and self.wall_s > 0 else " " * 17
+        rows = f"{self.rows:>9,} rows" if self.rows is not None else " " * 14
+        tail = f"  {self.error}" if self.error else ""
+        return f"  {self.name:<14} {self.status:<8} {self.wall_s:>8.1f}s {rows} {rate}{tail}"
+
+class Dag:
+    """Runs steps as soon as their dependencies finish; a failed step skips only its dependents."""
+
+    def __init__(self, steps: List[Step], state: Optional[RunState] = None, max_workers: int = 4):
+        names = {s.name for s in steps}
+        for s in steps:
+            missing = [d for d in s.deps if d not in names]
+            if missing:
+                raise ValueError(f"Step {s.name} depends on unknown steps: {missing}")
+        self.steps = {s.name: s for s in steps}
+        self.state = state
+        self.max_workers = max_workers
+
+    def run(self) -> Dict[str, StepResult]:
+        ctx: Dict[str, Any] = {}
+        results: Dict[str, StepResult] = {}
+        pending = dict(self.steps)
+        running: Dict[Future, str] = {}
+        started: Dict[str, float] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="catalog-step") as pool:
+            while pending or running:
+                for name, step in list(pending.items()):
+                    if any(results.get(d) and results[d].status in ("failed", "skipped") for d in step.deps):
+                        results[name] = StepResult(name, "skipped", error="upstream failed")
+                        del pending[name]
+                    elif all(d in results for d in step.deps):
+                        del pending[name]
+                        if self.state is not None and self.state.is_done(name):
+                            ctx[name] = self.state.value(name)
+                            results[name] = StepResult(name, "resumed")
+                            continue
+                        started[name] = time.perf_counter()
+                        running[pool.submit(step.run, dict(ctx))] = name
+                if not running:
+                    if pending and not any(all(d in results for d in s.deps) for s in pending.values()):
+                        break
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    step = self.steps[name]
+                    wall = time.perf_counter() - started[name]
+                    try:
+                        out = fut.result()
+                    except Exception as e:
+                        results[name] = StepResult(name, "failed", wall, error=f"{type(e).__name__}: {e}")
+                        continue
+                    ctx[name] = out
+                    try:
+                        rows = step.rows(out) if step.rows else None
+                    except Exception:
+                        rows = None  # the row count is cosmetic; the step's output stands
+                    results[name] = StepResult(name, "ok", wall, rows)
+                    if self.state is not None:
+                        self.state.mark_done(name, out)
+        return results
@@ -0,0 +1,110 @@
+# src/headline_reactor/catalogs/fx.py
+from __future__ import annotations
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+import pandas as pd
+
+FX_PATH = Path("catalog/fx_rates.parquet")
+FX_TTL_HOURS = float(os.getenv("FX_TTL_HOURS", "12"))
+
+# Listing country -> trading currency, for sizing local lines at runtime
+COUNTRY_CCY: Dict[str, str] = {
+    "US": "USD", "GB": "GBP", "JP": "JPY", "DE": "EUR", "FR": "EUR", "ES": "EUR", "IT": "EUR",
+    "NL": "EUR", "BE": "EUR", "IE": "EUR", "FI": "EUR", "PT": "EUR", "AT": "EUR", "CH": "CHF",
+    "SE": "SEK", "NO": "NOK", "DK": "DKK", "HK": "HKD", "CN": "CNY", "KR": "KRW", "TW": "TWD",
+    "AU": "AUD", "CA": "CAD", "IN": "INR", "BR": "BRL", "MX": "MXN", "ZA": "ZAR", "SG": "SGD",
+}
+
+Fetcher = Callable[[List[str]], Dict[str, float]]   # ["EURUSD Curncy", ...] -> {"EURUSD": rate}
+
+class FxCache:
+    """
+    Persisted currency -> USD rates (pair, rate, fetched_at) with a TTL.
+
+    `ensure` refreshes missing or expired pairs in one bulk fetch and saves the
+    table; lookups never fetch, and fall back to the last known rate when stale.
+    """
+
+    def __init__(self, path: Path = FX_PATH, ttl_hours: float = FX_TTL_HOURS, fetch: Optional[Fetcher] = None):
+        self.path = path
+        self.ttl_sec = ttl_hours * 3600
+        self.fetch = fetch
+        self._rates: Dict[str, float] = {}        # "EUR" -> USD per unit
+        self._fetched: Dict[str, float] = {}      # "EUR" -> epoch seconds
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            df = pd.read_parquet(self.path)
+        except Exception:
+            return
+        for pair, rate, ts in zip(df["pair"], df["rate"], df["fetched_at"]):
+            self._rates[pair[:3]] = float(rate)
+            self._fetched[pair[:3]] = float(ts)
+
+    def _save(self):
+        ccys = sorted(self._rates)
+        df = pd.DataFrame({"pair": [f"{c}USD" for c in ccys],
+                           "rate": [self._rates[c] for c in ccys],
+                           "fetched_at": [self._fetched[c] for c in ccys]})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        df.to_parquet(tmp, index=False)
+        tmp.replace(self.path)
+
+    @staticmethod
+    def _codes(currencies: Iterable) -> List[str]:
+        out = {str(c).upper() for c in currencies if isinstance(c, str) and c}
+        out.discard("USD")
+        return sorted(out)
+
+    def stale(self, currencies: Iterable) -> List[str]:
+        """Currencies whose rate is missing or older than the TTL."""
+        now = time.time()
+        return [c for c in self._codes(currencies) if now - self._fetched.get(c, 0.0) >= self.ttl_sec]
+
+    def ensure(self, currencies: Iterable) -> Dict[str, float]:
+        """Rates for `currencies` as {"EURUSD": rate}, bulk-refreshing stale pairs first."""
+        codes = self._codes(currencies)
+        with self._lock:
+            todo = self.stale(codes)
+            if todo and self.fetch is not None:
+                got = self.fetch([f"{c}USD Curncy" for c in todo])
+                now = time.time()
+                for c in todo:
+                    rate = got.get(f"{c}USD")
+                    if rate:
+                        self._rates[c] = float(rate)
+                        self._fetched[c] = now
+                if got:
+                    self._save()
+        return {f"{c}USD": self._rates[c] for c in codes if c in self._rates}
+
+    def rate(self, ccy: Optional[str]) -> Optional[float]:
+        """USD per unit of `ccy` (1.0 for USD/unknown currency code, None if no rate is known)."""
+        if not ccy or ccy.upper() == "USD":
+            return 1.0
+        return self._rates.get(ccy.upper())
+
+    def to_usd(self, amount: float, ccy: Optional[str]) -> Optional[float]:
+        r = self.rate(ccy)
+        return None if r is None else amount * r
+
+    def from_usd(self, amount_usd: float, ccy: Optional[str]) -> Optional[float]:
+        r = self.rate(ccy)
+        return None if not r else amount_usd / r
+
+_cache: Optional[FxCache] = None
+
+def get_fx_cache() -> FxCache:
+    """Process-wide read-only view of the persisted rates (runtime sizing never fetches)."""
+    global _cache
+    if _cache is None:
+        _cache = FxCache()
+    return _cache
@@ -0,0 +1,152 @@
+# src/headline_reactor/catalogs/incremental.py
+from __future__ import annotations
+import math
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .writer import ParquetStream
+
+REFRESH_COL = "refreshed_utc"
+VERSION_KEY = b"catalog_version"
+
+@dataclass
+class UniverseDiff:
+    """What an incremental build has to (re)fetch."""
+    added: List[str]
+    removed: List[str]
+    kept: List[str]
+    stale: List[str]
+
+    @property
+    def to_fetch(self) -> List[str]:
+        return self.added + self.stale
+
+    def summary(self) -> str:
+        return (f"{len(self.added):,} added, {len(self.removed):,} removed, "
+                f"{len(self.kept):,} unchanged ({len(self.stale):,} stale refetched)")
+
+def now_utc() -> str:
+    """UTC now as naive ISO seconds (the format existing catalogs hold)."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+def diff_universe(securities: List[str], existing: Optional[pd.DataFrame], key: str = "bbg",
+                  stale_fraction: float = 0.05, min_stale: int = 0) -> UniverseDiff:
+    """
+    Compare a fresh security list against the current catalog.
+
+    Besides new listings, the oldest-refreshed `stale_fraction` of unchanged rows
+    is refetched; since refetched rows get a new timestamp, the slice rotates
+    through the whole catalog over successive runs.
+    """
+    new = list(dict.fromkeys(securities))
+    if existing is None or existing.empty or key not in existing.columns:
+        return UniverseDiff(added=new, removed=[], kept=[], stale=[])
+    have = set(existing[key].dropna())
+    want = set(new)
+    added = [s for s in new if s not in have]
+    removed = sorted(have - want)
+    kept = [s for s in new if s in have]
+
+    n_stale = min(len(kept), max(min_stale, math.ceil(len(kept) * stale_fraction)))
+    stale: List[str] = []
+    if n_stale:
+        ex = existing[existing[key].isin(want)]
+        ts = ex[REFRESH_COL] if REFRESH_COL in ex.columns else pd.Series([""] * len(ex), index=ex.index)
+        order = ex.assign(_ts=ts.fillna("").astype(str)).sort_values("_ts", kind="stable")
+        stale = order[key].head(n_stale).tolist()
+    return UniverseDiff(added=added, removed=removed, kept=kept, stale=stale)
+
+def merge_refresh(existing: Optional[pd.DataFrame], fresh: pd.DataFrame, diff: UniverseDiff,
+                  securities: List[str], key: str = "bbg") -> pd.DataFrame:
+    """Existing rows minus removed/refetched ones, plus freshly fetched rows, in `securities` order."""
+    fresh = fresh.copy()
+    fresh[REFRESH_COL] = now_utc()
+    if existing is None or existing.empty:
+        out = fresh
+    else:
+        drop = set(diff.removed) | set(fresh[key])
+        base = existing[~existing[key].isin(drop)]
+        out = pd.concat([base, fresh], ignore_index=True)
+    rank = {s: i for i, s in enumerate(dict.fromkeys(securities))}
+    out = out[out[key].isin(rank)]
+    out = out.iloc[out[key].map(rank).argsort(kind="stable")]
+    return out.drop_duplicates(subset=[key], keep="last").reset_index(drop=True)
+
+def _new_version(path: Path) -> str:
+    """Microsecond UTC stamp, with a -N suffix if that version of `path` already exists."""
+    base = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    version, n = base, 0
+    while _version_path(path, version).exists():
+        n += 1
+        version = f"{base}-{n}"
+    return version
+
+def _version_path(path: Path, version: str) -> Path:
+    return path.parent / "versions" / f"{path.stem}.{version}.parquet"
+
+def _version_order(stem: str, p: Path) -> Tuple[str, int]:
+    """
+    Sort key for a version file: (stamp padded to microseconds, collision suffix).
+    Plain filename order is wrong: "<stamp>Z-1" sorts before "<stamp>Z".
+    """
+    version = p.name[len(stem) + 1:-len(".parquet")]
+    stamp, _, n = version.partition("-")
+    return stamp.rstrip("Z").ljust(21, "0"), int(n) if n.isdigit() else 0
+
+def _publish(version_file: Path, path: Path, keep: int):
+    """Atomically make a versioned file the current catalog and prune the oldest versions."""
+    tmp = path.with_suffix(".tmp")
+    shutil.copyfile(version_file, tmp)
+    tmp.replace(path)
+    old = sorted(version_file.parent.glob(f"{path.stem}.*.parquet"), key=lambda p: _version_order(path.stem, p))
+    for p in old[:-keep] if keep > 0 else []:
+        try:
+            p.unlink()
+        except OSError:
+            pass
+
+def write_versioned(df: pd.DataFrame, path: Path, keep: int = 10) -> str:
+    """
+    Write `df` as catalog/versions/<stem>.<version>.parquet and atomically replace `path`.
+    The version string is stored in the parquet schema metadata; returns it.
+    """
+    version = _new_version(path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[VERSION_KEY] = version.encode()
+    table = table.replace_schema_metadata(meta)
+    vfile = _version_path(path, version)
+    vfile.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, vfile)
+    _publish(vfile, path, keep)
+    return version
+
+class VersionedStream(ParquetStream):
+    """`ParquetStream` into a new catalog version; published to `path` on successful close."""
+
+    def __init__(self, path: Path, schema: pa.Schema, keep: int = 10):
+        self.version = _new_version(path)
+        self.target = path
+        self.keep = keep
+        super().__init__(_version_path(path, self.version), schema, {VERSION_KEY: self.version.encode()})
+
+    def close(self):
+        super().close()
+        _publish(self.path, self.target, self.keep)
+
+def catalog_version(path: Path) -> Optional[str]:
+    """Version stamp of a catalog parquet written by `write_versioned` (None if unstamped)."""
+    try:
+        meta = pq.read_schema(path).metadata or {}
+    except Exception:
+        return None
+    v = meta.get(VERSION_KEY)
+    return v.decode() if v else None
+
+def load_existing(path: Path) -> Optional[pd.DataFrame]:
+    return pd.read_parquet(path) if path.exists() else None
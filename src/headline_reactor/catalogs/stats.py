@@ -0,0 +1,45 @@
+# src/headline_reactor/catalogs/stats.py
+from __future__ import annotations
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+STATS_COLUMNS = ["symbol", "adv_usd", "avg_spread_bps"]
+
+def _num(frame: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in frame.columns:
+        return np.full(len(frame), np.nan)
+    return pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype="float64")
+
+def fx_vector(crncy: pd.Series, fx_map: Dict[str, float]) -> np.ndarray:
+    """Per-row USD conversion factor: 1.0 for USD/missing currency, NaN when the rate is unknown."""
+    codes = crncy.where(crncy.notna(), "USD").astype(str).str.upper().to_numpy()
+    uniq, inv = np.unique(codes, return_inverse=True)
+    rates = np.array([1.0 if c in ("USD", "") else float(fx_map.get(c + "USD") or np.nan) for c in uniq])
+    return rates[inv]
+
+def liquidity_stats(frame: pd.DataFrame, fx_map: Dict[str, float]) -> pd.DataFrame:
+    """
+    ADV (USD) and snapshot spread bps per symbol from a frame of snapshot fields
+    (VOLUME_AVG_30D/20D, PX_LAST, BID, ASK, CRNCY); rows with missing or
+    non-positive inputs yield NaN. Duplicate symbols keep max ADV / min spread.
+    """
+    if frame.empty:
+        return pd.DataFrame(columns=STATS_COLUMNS)
+    vol = _num(frame, "VOLUME_AVG_30D")
+    vol = np.where(np.isnan(vol), _num(frame, "VOLUME_AVG_20D"), vol)
+    px = _num(frame, "PX_LAST")
+    crncy = frame["CRNCY"] if "CRNCY" in frame.columns else pd.Series([None] * len(frame), index=frame.index)
+    fx = fx_vector(crncy, fx_map)
+    with np.errstate(invalid="ignore"):
+        ok = (vol > 0) & (px > 0) & (fx > 0)
+    adv = np.where(ok, vol * px * fx, np.nan)
+
+    bid, ask = _num(frame, "BID"), _num(frame, "ASK")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        quoted = (bid > 0) & (ask > 0)
+        bps = np.where(quoted, (ask - bid) / (0.5 * (bid + ask)) * 10000.0, np.nan)
+    bps = np.where(quoted, np.maximum(bps, 0.0), np.nan)
+
+    out = pd.DataFrame({"symbol": frame["symbol"].to_numpy(), "adv_usd": adv, "avg_spread_bps": bps})
+    return out.groupby("symbol", as_index=False, sort=True).agg({"adv_usd": "max", "avg_spread_bps": "min"})
@@ -0,0 +1,57 @@
+# src/headline_reactor/catalogs/writer.py
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+class ParquetStream:
+    """
+    Append DataFrame chunks to one parquet file as row groups under a fixed schema.
+
+    Missing columns are written as nulls and extra ones dropped, so every chunk
+    lands with the same types regardless of which fields Bloomberg returned.
+    The file appears at `path` only when the stream is closed successfully.
+    """
+
+    def __init__(self, path: Path, schema: pa.Schema, metadata: Optional[Dict[bytes, bytes]] = None):
+        if metadata:
+            schema = schema.with_metadata({**(schema.metadata or {}), **metadata})
+        self.path = path
+        self.schema = schema
+        self.rows = 0
+        self.row_groups = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = path.with_suffix(".partial")
+        self._writer = pq.ParquetWriter(self._tmp, schema)
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            return
+        cols = {}
+        for f in self.schema:
+            s = df[f.name] if f.name in df.columns else None
+            cols[f.name] = pa.nulls(len(df), f.type) if s is None else pa.array(s, type=f.type, from_pandas=True)
+        self._writer.write_table(pa.Table.from_pydict(cols, schema=self.schema))
+        self.rows += len(df)
+        self.row_groups += 1
+
+    def close(self):
+        self._writer.close()
+        self._tmp.replace(self.path)
+
+    def abort(self):
+        try:
+            self._writer.close()
+        finally:
+            self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ParquetStream":
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
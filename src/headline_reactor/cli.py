@@ -1,6 +1,7 @@
 from __future__ import annotations
 import time, hashlib
 from pathlib import Path
+from typing import Optional
 import typer
 from dotenv import load_dotenv
 from .capture import find_news_window_rect, grab_topline
@@ -8,10 +9,19 @@ from .ocr import ocr_topline
 from .rules import classify, map_ticker
 from .planner import load_cfg, plans_from_headline, plans_universe
 from .llm import suggest_with_llm
+from .liquidity import now_ms
+from .safety.circuits import Circuit, circuit_state, get_circuit
+from .ops import spans
+from .ops.metrics import metrics, registry
+from .ops.profiler import HeadlineProfiler
+from .ops import latency
+from .ops.latency import FrameTrace, LatencyLog
+from .ops.memory import MemoryTelemetry
 
 # V2 imports
 try:
     from .planner_v2 import plans_universe_v2
+    from .vendors.bbg_status import start_status_service
     V2_AVAILABLE = True
 except ImportError:
     V2_AVAILABLE = False
@@ -21,36 +31,163 @@ load_dotenv()
 
 app = typer.Typer(add_completion=False)
 
+_ocr_errors = {"count": 0, "mode": None}
+
+def _ocr(img, circuit: Circuit) -> str:
+    """OCR one frame, feeding failures and slow reads to the circuit (errors are logged on first sight and on mode changes)."""
+    t0 = time.perf_counter()
+    try:
+        text = ocr_topline(img)
+    except Exception as e:
+        now = now_ms()
+        circuit.record_error(now, "ocr")
+        _ocr_errors["count"] += 1
+        mode = circuit.next_mode(now)
+        if _ocr_errors["count"] == 1 or mode != _ocr_errors["mode"]:
+            _ocr_errors["mode"] = mode
+            typer.echo(f"[OCR] {type(e).__name__}: {e} ({_ocr_errors['count']} OCR errors so far, circuit {mode})", err=True)
+        return ""
+    if (time.perf_counter() - t0) * 1000 > circuit.cfg.slow_ocr_ms:
+        circuit.record_timeout(now_ms(), "ocr")
+    return text
+
+def _echo_spans():
+    """Per-stage latency for the session (also streamed to StatsD when enabled)."""
+    lines = spans.report()
+    if len(lines) > 1:
+        typer.echo("")
+        for line in lines:
+            typer.echo(line)
+
+def _serve_metrics(port: int, circuit: Circuit, catalog_paths: dict):
+    """Serve /metrics on localhost for this watch session, with runtime state added at scrape time."""
+    from .ops import prometheus
+    from .catalogs.incremental import catalog_version
+    from .vendors import orats_http
+    from .vendors.orats_cache import default_cache
+    from .vendors.orats_prefetch import get_prefetcher
+    from .vendors.bbg_status import get_status_service
+
+    @registry.collector
+    def _runtime() -> dict:
+        now = now_ms()
+        mode = circuit.next_mode(now)
+        out = {f'circuit.mode{{mode="{m}"}}': float(m == mode) for m in ("FULL", "ETF_ONLY")}
+        for kind, by in circuit.counts(now).items():
+            for source, n in by.items():
+                out[f'circuit.events{{kind="{kind}",source="{source}"}}'] = n
+        pf = get_prefetcher().snapshot()
+        out['queue.depth{queue="orats_prefetch"}'] = pf["inflight"]
+        cache = default_cache().snapshot()
+        for k in ("hit_rate", "mem_hits", "disk_hits", "misses", "mem_entries"):
+            out[f'cache.{k}{{cache="orats"}}'] = cache[k]
+        lim = orats_http.limiter().stats.snapshot()
+        out["orats.ratelimit.wait_ms_avg"] = lim["wait_ms_avg"]
+        status = get_status_service()
+        out["status.symbols"] = len(status)
+        out["status.updates"] = status.updates
+        for name, path in catalog_paths.items():
+            p = Path(path)
+            if p.suffix == ".parquet" and p.exists():
+                out[f'catalog.info{{catalog="{name}",version="{catalog_version(p) or "unversioned"}"}}'] = 1
+        return out
+
+    prometheus.serve(port)
+    typer.echo(f"Metrics: http://127.0.0.1:{port}/metrics")
+
+def _end_session(lat: Optional[LatencyLog], mem: Optional[MemoryTelemetry]):
+    """Session reports and teardown, however the watch loop ended."""
+    _echo_spans()
+    _echo_latency(lat)
+    if mem is not None:
+        mem.stop()
+        typer.echo("")
+        typer.echo("Memory over the session:")
+        for line in mem.report():
+            typer.echo(line)
+
+def _echo_latency(lat: Optional[LatencyLog]):
+    """Screen-to-suggestion percentiles for the session that just ended."""
+    if lat is None:
+        return
+    lat.close()
+    lines = latency.report([lat.path])
+    if len(lines) > 1:
+        typer.echo("")
+        typer.echo(f"Screen-to-suggestion latency ({lat.path}):")
+        for line in lines:
+            typer.echo(line)
+
+def _echo_profile(prof: HeadlineProfiler):
+    if prof.last_path is not None:
+        typer.echo(f"[PROFILE] {prof.last_path}")
+
+def _start_memory(interval_s: float, seen: set) -> Optional[MemoryTelemetry]:
+    """Memory telemetry for this watch session, tracking the dedup set and the ORATS memory tier."""
+    if interval_s <= 0:
+        return None
+    from .vendors import orats_cache
+    mem = MemoryTelemetry(interval_s)
+    mem.size("watch.seen", lambda: len(seen))
+    # Only once something has built the cache: default_cache() would build it (and its disk evictor).
+    # Until then the lookup raises and the sample skips this size.
+    mem.size("orats.mem_entries", lambda: len(orats_cache._default.mem))
+    mem.start()
+    typer.echo(f"Memory telemetry every {interval_s:g}s: {mem.summary()}")
+    return mem
+
+def _echo_memory(mem: Optional[MemoryTelemetry], last: int) -> int:
+    """Print each new memory sample once; returns the number of samples seen."""
+    if mem is None or mem.samples == last:
+        return last
+    typer.echo(f"[MEM] {mem.summary()}")
+    return mem.samples
+
+def _echo_mode(circuit: Circuit, last: str) -> str:
+    """Announce circuit mode changes; returns the current mode."""
+    now = now_ms()
+    mode = circuit.next_mode(now)
+    if mode != last:
+        why = circuit.reasons(now)
+        typer.echo(f"[CIRCUIT] {last} -> {mode}" + (f" ({why})" if why else ""))
+    return mode
+
 @app.command()
 def suggest(headline: str,
             config: str = typer.Option("newsreactor.yml"),
             universe: str = typer.Option("universe.yml"),
             whitelist: str = typer.Option("SPY,QQQ,IWM,EWP,EWY,EWJ,EWG,EWH,SMH,SOXX,AAPL,MSFT,META,NVDA,EA,BITO,ETHE"),
             llm: bool = typer.Option(False, help="Use LLM assist (requires OPENAI_API_KEY, LLM_ENABLED=1)"),
-            use_universe: bool = typer.Option(True, help="Use universe-aware cross-asset planner")
+            use_universe: bool = typer.Option(True, help="Use universe-aware cross-asset planner"),
+            profile: bool = typer.Option(False, help="Write sampled collapsed-stack profiles of headline evaluations to profiles/"),
+            profile_every: int = typer.Option(0, help="With --profile, keep every Nth headline's profile"),
+            profile_over_ms: float = typer.Option(0.0, help="With --profile, keep profiles of headlines slower than this")
             ):
     """Analyze a single headline and suggest trade actions across all asset classes."""
     headline = headline.upper()
     cfg = load_cfg(Path(config))
     wl = set([w.strip().upper() for w in whitelist.split(",") if w.strip()])
-    label = classify(headline) or "macro_ambiguous"
-    
-    # Use universe-aware planner if available and enabled
-    if use_universe and Path(universe).exists():
-        plans = plans_universe(label, headline, headline, cfg, Path(universe), wl)
-    else:
-        # Fallback to simple planner
-        primary = map_ticker(headline, wl)
-        plans = plans_from_headline(label, headline, primary, cfg, wl)
-    
-    # Optional LLM overlay for the first plan only (kept off by default)
-    if llm and plans:
-        llmres = suggest_with_llm(headline)
-        if llmres.action_line:
-            plans[0].line = llmres.action_line
+    prof = HeadlineProfiler(profile, every=profile_every, over_ms=profile_over_ms)
+    with prof.headline(hashlib.sha256(headline.encode()).hexdigest()[:12]):
+        label = classify(headline) or "macro_ambiguous"
+        
+        # Use universe-aware planner if available and enabled
+        if use_universe and Path(universe).exists():
+            plans = plans_universe(label, headline, headline, cfg, Path(universe), wl)
+        else:
+            # Fallback to simple planner
+            primary = map_ticker(headline, wl)
+            plans = plans_from_headline(label, headline, primary, cfg, wl)
+        
+        # Optional LLM overlay for the first plan only (kept off by default)
+        if llm and plans:
+            llmres = suggest_with_llm(headline)
+            if llmres.action_line:
+                plans[0].line = llmres.action_line
     
     for p in plans:
         typer.echo(p.line)
+    _echo_profile(prof)
 
 @app.command()
 def watch(config: str = typer.Option("newsreactor.yml"),
@@ -61,7 +198,13 @@ def watch(config: str = typer.Option("newsreactor.yml"),
           roi_top: int = typer.Option(115, help="Top px offset for first alert row"),
           roi_height: int = typer.Option(20, help="Row height in pixels"),
           llm: bool = typer.Option(False),
-          use_universe: bool = typer.Option(True, help="Use universe-aware cross-asset planner")):
+          use_universe: bool = typer.Option(True, help="Use universe-aware cross-asset planner"),
+          metrics_port: int = typer.Option(0, help="Serve Prometheus metrics on this local port (0 = off)"),
+          mem_telemetry: float = typer.Option(0.0, help="Sample RSS, tracemalloc growth and object counts every N seconds (0 = off; slows allocations, and each sample briefly stalls the loop)"),
+          latency_log: bool = typer.Option(False, help="Log per-headline screen-to-suggestion latency to data/latency/"),
+          profile: bool = typer.Option(False, help="Write sampled collapsed-stack profiles of headline evaluations to profiles/"),
+          profile_every: int = typer.Option(0, help="With --profile, keep every Nth headline's profile"),
+          profile_over_ms: float = typer.Option(0.0, help="With --profile, keep profiles of headlines slower than this")):
     """Watch Bloomberg Alert Catcher and generate trade suggestions in real-time."""
     rect = find_news_window_rect(window_title)
     if not rect:
@@ -71,6 +214,14 @@ def watch(config: str = typer.Option("newsreactor.yml"),
     cfg = load_cfg(Path(config))
     wl = set([w.strip().upper() for w in whitelist.split(",") if w.strip()])
     seen: set[str] = set()
+    circuit = get_circuit(circuit_state(cfg))
+    circ_mode = "FULL"
+    prof = HeadlineProfiler(profile, every=profile_every, over_ms=profile_over_ms)
+    lat = LatencyLog() if latency_log else None
+    if metrics_port:
+        _serve_metrics(metrics_port, circuit, cfg.get("catalog_paths", {}))
+    mem = _start_memory(mem_telemetry, seen)
+    mem_samples = mem.samples if mem else 0
     
     mode = "universe-aware" if use_universe and Path(universe).exists() else "simple"
     typer.echo(f"Watching '{window_title}' ({mode} mode)... Ctrl+C to exit.")
@@ -79,60 +230,85 @@ def watch(config: str = typer.Option("newsreactor.yml"),
     
     try:
         while True:
+            trace = FrameTrace()
             img = grab_topline(rect, roi_top, roi_height)
-            row_text = ocr_topline(img)
+            trace.mark("capture")
+            row_text = _ocr(img, circuit)
+            trace.mark("ocr")
+            circ_mode = _echo_mode(circuit, circ_mode)
+            mem_samples = _echo_memory(mem, mem_samples)
             if not row_text: 
                 time.sleep(poll_ms/1000)
                 continue
             
             h = hashlib.sha256(row_text.encode()).hexdigest()[:12]
             if h in seen: 
+                metrics.incr("watch.dedup_hits")
                 time.sleep(poll_ms/1000)
                 continue
             
             seen.add(h)
+            metrics.incr("watch.headlines")
+            metrics.gauge("watch.seen", len(seen))
             row_text = row_text.upper()
-            label = classify(row_text) or "macro_ambiguous"
-            
-            # Use universe-aware planner if enabled
-            if use_universe and Path(universe).exists():
-                plans = plans_universe(label, row_text, row_text, cfg, Path(universe), wl)
-            else:
-                primary = map_ticker(row_text, wl)
-                plans = plans_from_headline(label, row_text, primary, cfg, wl)
-            
-            if llm and plans:
-                llmres = suggest_with_llm(row_text)
-                if llmres.action_line:
-                    plans[0].line = llmres.action_line
+            trace.mark("queue")
+            with prof.headline(h):
+                label = classify(row_text) or "macro_ambiguous"
+                trace.mark("classify")
+                
+                # Use universe-aware planner if enabled
+                if use_universe and Path(universe).exists():
+                    plans = plans_universe(label, row_text, row_text, cfg, Path(universe), wl)
+                else:
+                    primary = map_ticker(row_text, wl)
+                    plans = plans_from_headline(label, row_text, primary, cfg, wl)
+                trace.mark("resolve")
+                
+                if llm and plans:
+                    llmres = suggest_with_llm(row_text)
+                    if llmres.action_line:
+                        plans[0].line = llmres.action_line
+                    trace.mark("llm")
             
             typer.echo(f"[NEWS] {row_text}")
             for p in plans: 
                 typer.echo(f" -> {p.line}")
+            trace.mark("render")
+            if lat is not None:
+                lat.record(trace, hash=h, label=label, plans=len(plans), mode=circ_mode)
+            _echo_profile(prof)
             typer.echo("")
             
             time.sleep(poll_ms/1000)
     except KeyboardInterrupt:
         pass
+    finally:
+        _end_session(lat, mem)
 
 @app.command()
 def suggest_v2(headline: str,
                config: str = typer.Option("universe_v2.yml"),
-               llm: bool = typer.Option(False)):
+               llm: bool = typer.Option(False),
+               profile: bool = typer.Option(False, help="Write sampled collapsed-stack profiles of headline evaluations to profiles/"),
+               profile_every: int = typer.Option(0, help="With --profile, keep every Nth headline's profile"),
+               profile_over_ms: float = typer.Option(0.0, help="With --profile, keep profiles of headlines slower than this")):
     """V2: Universe-wide analysis without whitelist gating (catalog-driven)."""
     if not V2_AVAILABLE:
         typer.echo("V2 system not available. Install required dependencies.")
         raise typer.Exit(1)
     
     h = headline.upper()
-    label = classify(h) or "macro_ambiguous"
-    plans = plans_universe_v2(label, h, h, config)
+    prof = HeadlineProfiler(profile, every=profile_every, over_ms=profile_over_ms)
+    with prof.headline(hashlib.sha256(h.encode()).hexdigest()[:12]):
+        label = classify(h) or "macro_ambiguous"
+        plans = plans_universe_v2(label, h, h, config)
     
     if not plans:
         typer.echo("NO ACTION (no tradeable instruments found)")
     
     for p in plans:
         typer.echo(p.line)
+    _echo_profile(prof)
 
 @app.command()
 def watch_v2(config: str = typer.Option("universe_v2.yml"),
@@ -140,7 +316,13 @@ def watch_v2(config: str = typer.Option("universe_v2.yml"),
              poll_ms: int = typer.Option(250),
              roi_top: int = typer.Option(115),
              roi_height: int = typer.Option(20),
-             llm: bool = typer.Option(False)):
+             llm: bool = typer.Option(False),
+             metrics_port: int = typer.Option(0, help="Serve Prometheus metrics on this local port (0 = off)"),
+             mem_telemetry: float = typer.Option(0.0, help="Sample RSS, tracemalloc growth and object counts every N seconds (0 = off; slows allocations, and each sample briefly stalls the loop)"),
+             latency_log: bool = typer.Option(False, help="Log per-headline screen-to-suggestion latency to data/latency/"),
+             profile: bool = typer.Option(False, help="Write sampled collapsed-stack profiles of headline evaluations to profiles/"),
+             profile_every: int = typer.Option(0, help="With --profile, keep every Nth headline's profile"),
+             profile_over_ms: float = typer.Option(0.0, help="With --profile, keep profiles of headlines slower than this")):
     """V2: Watch mode with universe-wide coverage (no whitelist gating)."""
     if not V2_AVAILABLE:
         typer.echo("V2 system not available. Install required dependencies.")
@@ -151,14 +333,35 @@ def watch_v2(config: str = typer.Option("universe_v2.yml"),
         typer.echo(f"Could not find '{window_title}' window; make it visible.")
         raise typer.Exit(1)
     
+    cfg = load_cfg(Path(config))
+    circuit = get_circuit(circuit_state(cfg))
+    circ_mode = "FULL"
+    prof = HeadlineProfiler(profile, every=profile_every, over_ms=profile_over_ms)
+    lat = LatencyLog() if latency_log else None
+    try:
+        status = start_status_service(cfg)
+        if status is not None:
+            typer.echo(f"Halt/LULD/SSR status: {len(status)} symbols via {status.source}")
+    except Exception as e:
+        typer.echo(f"Halt status unavailable ({e}); continuing without halt checks.")
+    if metrics_port:
+        _serve_metrics(metrics_port, circuit, cfg.get("catalog_paths", {}))
+    
     seen = set()
+    mem = _start_memory(mem_telemetry, seen)
+    mem_samples = mem.samples if mem else 0
     typer.echo(f"Watching '{window_title}' (V2 universe-wide mode)... Ctrl+C to exit.")
     typer.echo("")
     
     try:
         while True:
+            trace = FrameTrace()
             img = grab_topline(rect, roi_top, roi_height)
-            row_text = ocr_topline(img)
+            trace.mark("capture")
+            row_text = _ocr(img, circuit)
+            trace.mark("ocr")
+            circ_mode = _echo_mode(circuit, circ_mode)
+            mem_samples = _echo_memory(mem, mem_samples)
             if not row_text:
                 time.sleep(poll_ms / 1000)
                 continue
@@ -166,12 +369,20 @@ def watch_v2(config: str = typer.Option("universe_v2.yml"),
             row_text = row_text.upper()
             h = hashlib.sha256(row_text.encode()).hexdigest()[:12]
             if h in seen:
+                metrics.incr("watch.dedup_hits")
                 time.sleep(poll_ms / 1000)
                 continue
             seen.add(h)
+            metrics.incr("watch.headlines")
+            metrics.gauge("watch.seen", len(seen))
             
-            label = classify(row_text) or "macro_ambiguous"
-            plans = plans_universe_v2(label, row_text, row_text, config)
+            trace.mark("queue")
+            with prof.headline(h):
+                label = classify(row_text) or "macro_ambiguous"
+                trace.mark("classify")
+                plans = plans_universe_v2(label, row_text, row_text, config)
+                trace.mark("resolve")
+            circ_mode = _echo_mode(circuit, circ_mode)
             
             typer.echo(f"[NEWS] {row_text}")
             if not plans:
@@ -179,8 +390,30 @@ def watch_v2(config: str = typer.Option("universe_v2.yml"),
             else:
                 for p in plans:
                     typer.echo(f" -> {p.line}")
+            trace.mark("render")
+            if lat is not None:
+                lat.record(trace, hash=h, label=label, plans=len(plans), mode=circ_mode)
+            _echo_profile(prof)
             typer.echo("")
             
             time.sleep(poll_ms / 1000)
     except KeyboardInterrupt:
         pass
+    finally:
+        _end_session(lat, mem)
+
+@app.command()
+def latency_report(paths: Optional[list[str]] = typer.Argument(None, help="Session logs or directories (default: latest in data/latency)")):
+    """Percentiles of screen-to-suggestion latency, per stage, from watch session logs."""
+    files: list[Path] = []
+    for p in map(Path, paths or []):
+        files += sorted(p.glob("session-*.jsonl")) if p.is_dir() else [p]
+    if not paths:
+        last = latency.latest()
+        files = [last] if last else []
+    if not files:
+        typer.echo("No latency logs found.")
+        raise typer.Exit(1)
+    typer.echo(f"{len(files)} session log(s)")
+    for line in latency.report(files):
+        typer.echo(line)
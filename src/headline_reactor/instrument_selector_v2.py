@@ -1,13 +1,25 @@
 from __future__ import annotations
+import time
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import yaml
 
 from .resolver import extract_entities, Secmaster
-from .proxy_engine import Catalogs, build_proxies
-from .liquidity import LqGuard, load_stats, stats_ok
+from .proxy_engine import Catalogs, Proxy, build_proxies, etf_proxy_map
+from .liquidity import LqGuard, load_stats, stats_ok, now_ms
 from .options2 import atm_call, delta_put
+from .vendors.orats_prefetch import get_prefetcher
+from .vendors.bbg_status import get_status_service
+from .catalogs.fx import COUNTRY_CCY, get_fx_cache
+from .safety.circuits import Circuit, circuit_state, get_circuit
+from .ops.metrics import metrics
+from .ops.spans import span
+
+# Event labels that get an options overlay on single-name equities
+CALL_LABELS = ("ma_confirmed", "ma_rumor", "pop_positive", "supplier_pop_korea_semi")
+PUT_LABELS = ("guide_cut", "downgrade", "halt_negative", "supply_shock_neg")
+US_EXCH = ("US", "NYSE", "NASDAQ", "N", "O", "UQ", "XNYS", "XNAS")
 
 @dataclass
 class Candidate:
@@ -16,6 +28,18 @@ class Candidate:
     score: float
     rationale: str
 
+def _local_ccy(p: Proxy, row: Dict) -> Optional[str]:
+    """Trading currency of a non-US local-line proxy (None for US listings, ADRs and ETFs)."""
+    if p.asset_class != "EQUITY" or p.instr != row.get("symbol") or str(row.get("exchange") or "").upper() in US_EXCH:
+        return None
+    ccy = COUNTRY_CCY.get(str(row.get("country") or "").upper())
+    return None if ccy in (None, "USD") else ccy
+
+def _size(notion: float, ccy: Optional[str]) -> str:
+    """USD budget, with the local-currency equivalent when the line trades in another currency."""
+    local = get_fx_cache().from_usd(notion, ccy) if ccy else None
+    return f"${notion} (~{ccy} {local:,.0f})" if local else f"${notion}"
+
 def _cfg(path: Path) -> dict:
     """Load configuration."""
     return yaml.safe_load(path.read_text(encoding="utf-8"))
@@ -84,6 +108,47 @@ def _macro_from_headline(headline: str, cfg: dict) -> List[Candidate]:
     
     return out
 
+_etf_maps: Dict[Tuple, Dict[str, List[Proxy]]] = {}
+
+def _etf_map(sec_path: Path, etf_path: Path) -> Dict[str, List[Proxy]]:
+    """Precomputed symbol -> ETF proxies, rebuilt only when either catalog file changes."""
+    key = tuple((str(p), p.stat().st_mtime_ns if p.exists() else 0) for p in (sec_path, etf_path))
+    if key not in _etf_maps:
+        _etf_maps.clear()
+        _etf_maps[key] = etf_proxy_map(Catalogs(sec_path, etf_path))
+    return _etf_maps[key]
+
+def _etf_only(label: str, side: str, row_text: str, cfg: dict, sec_path: Path, etf_path: Path) -> List[Candidate]:
+    """Degraded mode: headline symbols -> precomputed sector/country ETFs; no resolution, options or vendors."""
+    etf_map = _etf_map(sec_path, etf_path)
+    ttlm = cfg["order_defaults"]["ttl_sec"] // 60
+    notion = cfg["budgets"]["equity_usd"]
+    out: List[Candidate] = []
+    for ent in extract_entities(row_text):
+        for p in etf_map.get((ent.symbol or "").upper(), []):
+            out.append(Candidate(
+                f"{p.instr} {side} ${notion} IOC TTL={ttlm}m (NEWS: {label})",
+                p.asset_class,
+                p.base_score,
+                f"{p.why} [ETF_ONLY]"
+            ))
+    return out
+
+def _resolve(sec: Secmaster, entities, circuit: Circuit) -> List[List[Dict]]:
+    """Resolve headline entities, feeding resolution errors and slow lookups to the circuit."""
+    t0 = time.perf_counter()
+    resolved = []
+    for ent in entities:
+        if ent.kind == "MACRO":
+            continue  # Handled by macro router
+        try:
+            resolved.append(sec.resolve(ent))
+        except Exception:
+            circuit.record_error(now_ms(), "secmaster")
+    if (time.perf_counter() - t0) * 1000 > circuit.cfg.slow_resolve_ms:
+        circuit.record_timeout(now_ms(), "secmaster")
+    return resolved
+
 def choose_side(label: str) -> str:
     """Determine BUY/SELL based on label."""
     down = {
@@ -92,78 +157,112 @@ def choose_side(label: str) -> str:
     }
     return "SELL" if label in down else "BUY"
 
-def select_candidates(label: str, headline: str, row_text: str, cfg_path: Path) -> List[Candidate]:
-    """Select best tradeable instruments across all asset classes."""
-    cfg = _cfg(cfg_path)
-    
-    # Load catalogs
-    sec_path = Path(cfg["catalog_paths"]["secmaster"])
-    etf_path = Path(cfg["catalog_paths"]["etf_catalog"])
-    stats_path = Path(cfg["catalog_paths"]["stats"])
-    
+def _full(label: str, side: str, row_text: str, cfg: dict, circuit: Circuit,
+          sec_path: Path, etf_path: Path, stats_path: Path) -> List[Candidate]:
+    """Normal mode: resolve entities -> proxy waterfall -> liquidity/halt filters -> options overlay."""
     cats = Catalogs(sec_path, etf_path)
     sec = Secmaster(sec_path)
     stats = load_stats(stats_path)
     guard = _guardrails(cfg)
+    status = get_status_service()
     allow_local = bool(cfg.get("guardrails", {}).get("allow_foreign_local", False))
-    side = choose_side(label)
     
     # Extract entities from headline
     entities = extract_entities(row_text)
     cands: List[Candidate] = []
     
-    # For each entity → resolve → proxies → guard → format
-    for ent in entities:
-        if ent.kind == "MACRO":
-            continue  # Handled by macro router
+    wants_call = label in CALL_LABELS
+    wants_put = side == "SELL" and label in PUT_LABELS
+    opt_wait = float(cfg.get("options", {}).get("prefetch_wait_ms", 300)) / 1000
+    
+    # Resolve first, so option prefetch overlaps proxy/liquidity filtering
+    resolved = _resolve(sec, entities, circuit)
+    
+    with get_prefetcher().batch() as prefetch:
+        if wants_call or wants_put:
+            for rows in resolved:
+                for r in rows:
+                    if str(r.get("exchange") or "").upper() in US_EXCH and r.get("symbol"):
+                        prefetch.warm(r["symbol"])
+                    if cats.adr_for(r):
+                        prefetch.warm(r["adr_us"])
         
-        rows = sec.resolve(ent)
-        for r in rows:
-            proxies = build_proxies(r, cats, allow_local=allow_local)
-            
-            # Filter by liquidity
-            kept = []
-            for p in proxies:
-                if p.asset_class == "EQUITY":
-                    if not stats_ok(p.instr, stats, guard):
-                        continue
-                kept.append(p)
-            
-            # Format top proxies
-            for p in kept[:3]:
-                ttlm = cfg["order_defaults"]["ttl_sec"] // 60
-                notion = cfg["budgets"]["equity_usd"]
+        # For each resolved row → proxies → guard → format
+        for rows in resolved:
+            for r in rows:
+                proxies = build_proxies(r, cats, allow_local=allow_local)
                 
-                cands.append(Candidate(
-                    f"{p.instr} {side} ${notion} IOC TTL={ttlm}m (NEWS: {label})",
-                    p.asset_class,
-                    p.base_score,
-                    p.why
-                ))
+                # Filter by liquidity
+                kept = []
+                for p in proxies:
+                    if p.asset_class == "EQUITY":
+                        if not stats_ok(p.instr, stats, guard):
+                            continue
+                        if status.halted(p.instr, p.exch):
+                            continue
+                    kept.append(p)
                 
-                # Options overlay for single-names (event-aware)
-                if p.asset_class == "EQUITY":
-                    # Calls for M&A and positive pops
-                    if label in ("ma_confirmed", "ma_rumor", "pop_positive", "supplier_pop_korea_semi"):
-                        oi = atm_call(p.instr)
-                        if oi:
-                            cands.append(Candidate(
-                                f"{oi.line} (NEWS: {label})",
-                                "OPTION",
-                                oi.score,
-                                oi.rationale
-                            ))
+                # Format top proxies
+                for p in kept[:3]:
+                    ttlm = cfg["order_defaults"]["ttl_sec"] // 60
+                    notion = cfg["budgets"]["equity_usd"]
                     
-                    # Puts for downgrades and guidance cuts
-                    if side == "SELL" and label in ("guide_cut", "downgrade", "halt_negative", "supply_shock_neg"):
-                        oi = delta_put(p.instr, 0.30)
-                        if oi:
-                            cands.append(Candidate(
-                                f"{oi.line} (NEWS: {label})",
-                                "OPTION",
-                                oi.score,
-                                oi.rationale
-                            ))
+                    cands.append(Candidate(
+                        f"{p.instr} {side} {_size(notion, _local_ccy(p, r))} IOC TTL={ttlm}m (NEWS: {label})",
+                        p.asset_class,
+                        p.base_score,
+                        p.why
+                    ))
+                    
+                    # Options overlay for single-names (event-aware)
+                    if p.asset_class == "EQUITY":
+                        # Calls for M&A and positive pops
+                        if wants_call:
+                            oi = atm_call(p.instr, chain=prefetch.wait(p.instr, opt_wait))
+                            if oi:
+                                cands.append(Candidate(
+                                    f"{oi.line} (NEWS: {label})",
+                                    "OPTION",
+                                    oi.score,
+                                    oi.rationale
+                                ))
+                        
+                        # Puts for downgrades and guidance cuts
+                        if wants_put:
+                            oi = delta_put(p.instr, 0.30, chain=prefetch.wait(p.instr, opt_wait))
+                            if oi:
+                                cands.append(Candidate(
+                                    f"{oi.line} (NEWS: {label})",
+                                    "OPTION",
+                                    oi.score,
+                                    oi.rationale
+                                ))
+    
+    # Options vendor health feeds the circuit too. A prefetch that merely missed
+    # the wait budget is still running and says nothing about ORATS health.
+    if prefetch.late:
+        metrics.incr("planner.prefetch_late", prefetch.late)
+    for _ in range(prefetch.timeouts):
+        circuit.record_timeout(now_ms(), "orats")
+    for _ in range(prefetch.errors):
+        circuit.record_error(now_ms(), "orats")
+    return cands
+
+@span("planner.select")
+def select_candidates(label: str, headline: str, row_text: str, cfg_path: Path) -> List[Candidate]:
+    """Select best tradeable instruments across all asset classes."""
+    cfg = _cfg(cfg_path)
+    circuit = get_circuit(circuit_state(cfg))
+    
+    sec_path = Path(cfg["catalog_paths"]["secmaster"])
+    etf_path = Path(cfg["catalog_paths"]["etf_catalog"])
+    stats_path = Path(cfg["catalog_paths"]["stats"])
+    side = choose_side(label)
+    
+    if circuit.next_mode(now_ms()) == "ETF_ONLY":
+        cands = _etf_only(label, side, row_text, cfg, sec_path, etf_path)
+    else:
+        cands = _full(label, side, row_text, cfg, circuit, sec_path, etf_path, stats_path)
     
     # Add macro candidates
     cands += _macro_from_headline(headline, cfg)
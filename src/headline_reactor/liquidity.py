@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Optional
 import pandas as pd
 import time
+from .ops.spans import span
 
 @dataclass
 class LqGuard:
@@ -12,6 +13,7 @@ class LqGuard:
     max_spread_bps: float
     max_quote_age_ms: int
 
+@span("liquidity.load_stats")
 def load_stats(path: Path) -> Optional[pd.DataFrame]:
     """Load liquidity statistics catalog."""
     if not path.exists(): 
@@ -24,6 +26,7 @@ def load_stats(path: Path) -> Optional[pd.DataFrame]:
     except Exception:
         return None
 
+@span("liquidity.stats_ok")
 def stats_ok(symbol: str, stats: Optional[pd.DataFrame], g: LqGuard) -> bool:
     """Check if symbol meets liquidity guardrails."""
     if stats is None: 
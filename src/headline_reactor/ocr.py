@@ -2,10 +2,12 @@ from __future__ import annotations
 import re
 from PIL import Image
 import pytesseract
+from .ops.spans import span
 
 # Set Tesseract path for Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+@span("ocr.topline")
 def ocr_topline(img: Image.Image) -> str:
     # Keep it simple and fast; PSM 7 = single text line
     cfg = "--psm 7"
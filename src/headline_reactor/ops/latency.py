@@ -0,0 +1,100 @@
+# src/headline_reactor/ops/latency.py
+"""Screen-to-suggestion latency: per-frame stage timelines, a per-session JSONL log and percentile reports."""
+from __future__ import annotations
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from .metrics import metrics
+
+LOG_DIR = Path("data/latency")
+
+class FrameTrace:
+    """
+    Timeline of one captured frame: wall-clock capture time plus a
+    perf_counter mark at the end of each stage. A stage's duration is the
+    time since the previous mark, so the stages add up to the end-to-end age.
+    """
+    __slots__ = ("captured_at", "t0", "marks")
+
+    def __init__(self):
+        self.captured_at = time.time()
+        self.t0 = time.perf_counter_ns()
+        self.marks: List[Tuple[str, int]] = []
+
+    def mark(self, stage: str):
+        self.marks.append((stage, time.perf_counter_ns()))
+
+    def age_ms(self) -> float:
+        return (time.perf_counter_ns() - self.t0) / 1e6
+
+    def breakdown(self) -> Dict[str, float]:
+        """{"<stage>_ms": duration, ..., "e2e_ms": capture start -> last mark}."""
+        out: Dict[str, float] = {}
+        prev = self.t0
+        for stage, t in self.marks:
+            out[f"{stage}_ms"] = round(out.get(f"{stage}_ms", 0.0) + (t - prev) / 1e6, 3)
+            prev = t
+        out["e2e_ms"] = round((prev - self.t0) / 1e6, 3)
+        return out
+
+class LatencyLog:
+    """Append-only JSONL of emitted headlines for one watch session (one line per headline)."""
+
+    def __init__(self, root: Path = LOG_DIR):
+        root.mkdir(parents=True, exist_ok=True)
+        self.path = root / f"session-{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
+        self._fh = self.path.open("a", encoding="utf-8")
+
+    def record(self, trace: FrameTrace, **fields) -> Dict[str, float]:
+        """Write one headline's breakdown (plus e.g. hash/label/plans) and feed e2e to the metrics registry."""
+        b = trace.breakdown()
+        rec = {"ts": round(trace.captured_at, 3), **fields, **b}
+        self._fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        self._fh.flush()
+        metrics.timing("latency.e2e", b["e2e_ms"])
+        return b
+
+    def close(self):
+        self._fh.close()
+
+def load(paths: Iterable[Path]) -> List[Dict]:
+    rows = []
+    for p in paths:
+        with p.open(encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+    return rows
+
+def percentiles(rows: List[Dict], qs: Tuple[float, ...] = (50, 90, 99)) -> Dict[str, Dict[str, float]]:
+    """Per stage (plus e2e): count, mean and the requested percentiles in ms."""
+    cols: Dict[str, List[float]] = {}
+    for r in rows:
+        for k, v in r.items():
+            if k.endswith("_ms") and isinstance(v, (int, float)):
+                cols.setdefault(k[:-3], []).append(float(v))
+    out: Dict[str, Dict[str, float]] = {}
+    for stage, vals in cols.items():
+        a = np.asarray(vals)
+        out[stage] = {"count": len(a), "mean": float(a.mean()),
+                      **{f"p{q:g}": float(np.percentile(a, q)) for q in qs}, "max": float(a.max())}
+    return out
+
+def report(paths: Iterable[Path]) -> List[str]:
+    """Table lines of stage percentiles across one or more session logs (e2e last)."""
+    stats = percentiles(load(paths))
+    order = [s for s in stats if s != "e2e"] + (["e2e"] if "e2e" in stats else [])
+    lines = [f"{'stage':<10} {'count':>7} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  (ms)"]
+    for s in order:
+        d = stats[s]
+        lines.append(f"{s:<10} {d['count']:>7} {d['mean']:>9.1f} {d['p50']:>9.1f} {d['p90']:>9.1f} "
+                     f"{d['p99']:>9.1f} {d['max']:>9.1f}")
+    return lines
+
+def latest(root: Path = LOG_DIR) -> Optional[Path]:
+    logs = sorted(root.glob("session-*.jsonl")) if root.exists() else []
+    return logs[-1] if logs else None
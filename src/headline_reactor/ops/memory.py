@@ -0,0 +1,211 @@
+# src/headline_reactor/ops/memory.py
+"""Opt-in memory telemetry for long watch sessions: RSS, tracemalloc growth and counts of our own objects."""
+from __future__ import annotations
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from .metrics import metrics, registry
+
+# (module prefix, class name): instances are counted per defining module
+TRACKED: Tuple[Tuple[str, str], ...] = (
+    ("headline_reactor", "Plan"),
+    ("headline_reactor", "Candidate"),
+    ("headline_reactor", "Entity"),
+    ("PIL.", "Image"),           # captured OCR frames
+)
+
+_IGNORE = (tracemalloc.Filter(False, tracemalloc.__file__),
+           tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+           tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+           tracemalloc.Filter(False, "<unknown>"))
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where the current value is not available)."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class _Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        c = _Counters()
+        c.cb = ctypes.sizeof(c)
+        proc = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(proc, ctypes.byref(c), c.cb):
+            return int(c.WorkingSetSize)
+        return 0
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def count_objects(tracked: Tuple[Tuple[str, str], ...] = TRACKED) -> Dict[str, int]:
+    """Live instances of the tracked classes, keyed "<module>.<Class>" (one full gc heap walk)."""
+    out: Dict[str, int] = {}
+    names = {name for _, name in tracked}
+    for obj in gc.get_objects():
+        cls = type(obj)
+        if cls.__name__ not in names:
+            continue
+        mod = cls.__module__
+        if any(cls.__name__ == name and mod.startswith(prefix) for prefix, name in tracked):
+            key = f"{mod.rsplit('.', 1)[-1]}.{cls.__name__}"
+            out[key] = out.get(key, 0) + 1
+    return out
+
+def _site(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{Path(frame.filename).name}:{frame.lineno}"
+
+class MemoryTelemetry:
+    """
+    Samples the process every `interval_s` on a background thread: RSS,
+    tracemalloc totals, the `top_n` allocation sites that grew most since the
+    previous sample, counts of TRACKED objects and any registered sizes
+    (e.g. the watch loop's `seen` set). Scalars go out as `mem.*` gauges;
+    per-site growth is served to Prometheus through a registry collector.
+
+    Not free: tracemalloc slows every allocation while it runs, and each
+    sample walks the whole gc heap and takes a snapshot while holding the
+    GIL, which stalls the watch loop for that long. Keep `interval_s` in minutes.
+    """
+
+    def __init__(self, interval_s: float = 60.0, top_n: int = 10, frames: int = 1):
+        self.interval = interval_s
+        self.top_n = top_n
+        self.frames = frames
+        self.samples = 0
+        self.last: Dict[str, float] = {}
+        self.first: Dict[str, float] = {}
+        self.top: List[Tuple[str, int, int]] = []     # (site, size_diff, count_diff) vs the previous sample
+        self._sizes: Dict[str, Callable[[], float]] = {}
+        self._types: set = set()
+        self._base: Optional[tracemalloc.Snapshot] = None
+        self._prev: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_tracing = False
+        self._final: List[Tuple[str, int, int]] = []
+
+    def size(self, name: str, fn: Callable[[], float]):
+        """Report `fn()` as gauge `mem.size.<name>` on every sample."""
+        self._sizes[name] = fn
+
+    def start(self) -> "MemoryTelemetry":
+        if self._thread is not None:
+            return self
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        registry.collector(self._collect)
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="mem-telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling, and stop tracemalloc if this instance started it (growth() keeps the final diff)."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+        registry.remove_collector(self._collect)
+        if self._started_tracing:
+            self._final = self.growth()
+            self._base = self._prev = None
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                pass
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_IGNORE)
+
+    def sample(self) -> Dict[str, float]:
+        """Take one sample now, publish it and return it."""
+        vals: Dict[str, float] = {"rss_mb": rss_bytes() / 2**20}
+        top: List[Tuple[str, int, int]] = []
+        if tracemalloc.is_tracing():
+            cur, peak = tracemalloc.get_traced_memory()
+            vals["traced_mb"] = cur / 2**20
+            vals["traced_peak_mb"] = peak / 2**20
+            snap = self._snapshot()
+            if self._prev is not None:
+                diffs = [d for d in snap.compare_to(self._prev, "lineno") if d.size_diff > 0]
+                top = [(_site(d), d.size_diff, d.count_diff) for d in diffs[:self.top_n]]
+            if self._base is None:
+                self._base = snap
+            self._prev = snap
+        objects = count_objects()
+        self._types.update(objects)
+        for key in self._types:         # types seen once keep reporting, so gauges fall back to 0
+            vals[f"objects.{key}"] = objects.get(key, 0)
+        for name, fn in self._sizes.items():
+            try:
+                vals[f"size.{name}"] = float(fn())
+            except Exception:
+                continue
+        for k, v in vals.items():
+            metrics.gauge(f"mem.{k}", v)
+        with self._lock:
+            self.samples += 1
+            self.last = vals
+            self.first = self.first or dict(vals)
+            self.top = top
+        return vals
+
+    def growth(self, limit: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """Allocation sites that grew most since the first sample: (site, size_diff, count_diff)."""
+        if self._base is None:
+            return self._final[:limit or self.top_n]
+        diffs = [d for d in self._snapshot().compare_to(self._base, "lineno") if d.size_diff > 0]
+        return [(_site(d), d.size_diff, d.count_diff) for d in diffs[:limit or self.top_n]]
+
+    def _collect(self) -> Dict[str, float]:
+        with self._lock:
+            top = list(self.top)
+        return {f'mem.alloc_growth_bytes{{site="{site}"}}': size for site, size, _ in top}
+
+    def summary(self) -> str:
+        """One line: RSS and traced memory with change since the first sample, plus the fastest-growing site."""
+        with self._lock:
+            last, first, top = dict(self.last), dict(self.first), list(self.top)
+        if not last:
+            return "no samples"
+        parts = [f"rss {last['rss_mb']:.1f}MB ({last['rss_mb'] - first['rss_mb']:+.1f})"]
+        if "traced_mb" in last:
+            parts.append(f"traced {last['traced_mb']:.1f}MB ({last['traced_mb'] - first.get('traced_mb', 0.0):+.1f})")
+        objs = [f"{k[8:]}={int(v)}" for k, v in sorted(last.items()) if k.startswith("objects.")]
+        if objs:
+            parts.append(" ".join(objs))
+        if top:
+            site, size, count = top[0]
+            parts.append(f"top {site} {size / 1024:+.0f}KB/{count:+d}")
+        return ", ".join(parts)
+
+    def report(self) -> List[str]:
+        """End-of-session lines: summary plus the sites that grew most over the whole session."""
+        lines = [self.summary()]
+        growth = self.growth()
+        if growth:
+            lines.append(f"{'site':<40} {'growth KB':>10} {'blocks':>8}")
+            lines += [f"{site:<40} {size / 1024:>10.1f} {count:>+8d}" for site, size, count in growth]
+        return lines
@@ -1,53 +1,246 @@
 from __future__ import annotations
+import atexit
+import os
+import random
 import socket
-import time
-from typing import Optional
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+SUB_BITS = 5                      # 32 sub-buckets per power of two: <= ~3% relative error
+SUB = 1 << SUB_BITS
+MAX_BITS = 43                     # values clamp at 2^43 ns (~2.4 h)
+N_BUCKETS = (MAX_BITS - SUB_BITS + 1) * SUB
+
+def _index(v: int) -> int:
+    if v < SUB:
+        return max(v, 0)
+    shift = v.bit_length() - SUB_BITS - 1
+    return min((shift + 1) * SUB + (v >> shift) - SUB, N_BUCKETS - 1)
+
+def _upper(i: int) -> int:
+    """Highest value that lands in bucket i."""
+    if i < SUB:
+        return i
+    shift = i // SUB - 1
+    return ((SUB + i % SUB) << shift) + (1 << shift) - 1
+
+class Histogram:
+    """
+    Log-linear histogram of nanosecond durations (HDR-style): fixed memory,
+    O(1) record, percentiles to within one sub-bucket.
+    """
+
+    def __init__(self):
+        self.counts = [0] * N_BUCKETS
+        self.n = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.min_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def record(self, ns: int):
+        i = _index(ns)
+        with self._lock:
+            self.counts[i] += 1
+            self.n += 1
+            self.total_ns += ns
+            if ns > self.max_ns:
+                self.max_ns = ns
+            if self.min_ns is None or ns < self.min_ns:
+                self.min_ns = ns
+
+    def percentile(self, q: float) -> int:
+        """Duration (ns) at or below which `q` percent of samples fall."""
+        if not self.n:
+            return 0
+        rank = max(1, int(q / 100 * self.n + 0.5))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(_upper(i), self.max_ns)
+        return self.max_ns
+
+    def snapshot(self) -> Dict[str, float]:
+        """count plus mean/p50/p90/p99/max in milliseconds."""
+        with self._lock:
+            if not self.n:
+                return {"count": 0}
+            ms = lambda ns: round(ns / 1e6, 3)
+            return {"count": self.n, "mean_ms": ms(self.total_ns / self.n),
+                    "p50_ms": ms(self.percentile(50)), "p90_ms": ms(self.percentile(90)),
+                    "p99_ms": ms(self.percentile(99)), "max_ms": ms(self.max_ns)}
+
+Collector = Callable[[], Dict[str, float]]
+
+class Registry:
+    """
+    In-process metrics behind both exporters: cumulative counters, gauges and
+    latency histograms fed through `metrics`, plus collectors that report
+    point-in-time values (queue depths, cache hit rates...) at scrape time.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def inc(self, key: str, n: float = 1):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def set(self, key: str, val: float):
+        self.gauges[key] = val
+
+    def histogram(self, key: str) -> Histogram:
+        h = self.histograms.get(key)
+        if h is None:
+            with self._lock:
+                h = self.histograms.setdefault(key, Histogram())
+        return h
+
+    def collector(self, fn: Collector) -> Collector:
+        """Register a callable returning {metric: value}; usable as a decorator."""
+        self.collectors.append(fn)
+        return fn
+
+    def remove_collector(self, fn: Collector):
+        """Unregister a collector (no-op if it is not registered)."""
+        # Swap in a new list so a concurrent collect() keeps iterating the old one
+        self.collectors = [c for c in self.collectors if c != fn]
+
+    def collect(self) -> Dict[str, float]:
+        """Current gauge values, including everything the collectors report."""
+        out = dict(self.gauges)
+        for fn in self.collectors:
+            try:
+                out.update(fn())
+            except Exception:
+                pass
+        return out
+
+registry = Registry()
 
 class Statsd:
-    """Minimal StatsD client for SLO metrics (optional - no-op if not configured)."""
-    
-    def __init__(self, host: str = "127.0.0.1", port: int = 8125, ns: str = "reactor", enabled: bool = False):
+    """
+    Aggregating StatsD client for SLO metrics (optional - no-op if not configured).
+
+    Every call also feeds `registry`, which the Prometheus endpoint serves
+    whether or not StatsD is enabled. For StatsD, calls only update memory:
+    counters are summed, gauges keep the last value and timings are
+    buffered. A background thread flushes every
+    `flush_ms` as newline-separated multi-metric datagrams of at most
+    `max_packet` bytes, so the hot path never makes a syscall. Sampled calls
+    (`rate` < 1) are dropped client-side and tagged @rate for the server.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8125, ns: str = "reactor", enabled: bool = False,
+                 flush_ms: int = 1000, max_packet: int = 1432, max_timings: int = 2000):
         self.addr = (host, port)
         self.ns = ns
         self.enabled = enabled
+        self.flush_sec = flush_ms / 1000
+        self.max_packet = max_packet
+        self.max_timings = max_timings        # per key per interval; extra samples are dropped
+        self.packets = 0
+        self.dropped = 0
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._timings: Dict[str, List[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
         if self.enabled:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.sock.setblocking(False)
+            self._thread = threading.Thread(target=self._run, name="statsd-flush", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
         else:
             self.sock = None
 
-    def timing(self, key: str, ms: int):
-        """Record timing metric."""
-        if not self.enabled:
+    def timing(self, key: str, ms: float, rate: float = 1.0):
+        """Record timing metric (the local histogram sees every sample; `rate` applies to StatsD)."""
+        registry.histogram(key).record(int(ms * 1e6))
+        if not self.enabled or (rate < 1.0 and random.random() >= rate):
             return
-        try:
-            self.sock.sendto(f"{self.ns}.{key}:{ms}|ms".encode(), self.addr)
-        except Exception:
-            pass  # Non-blocking
+        with self._lock:
+            buf = self._timings.setdefault(key, [])
+            if len(buf) < self.max_timings:
+                buf.append((ms, rate))
+            else:
+                self.dropped += 1
 
-    def incr(self, key: str, n: int = 1):
+    def incr(self, key: str, n: int = 1, rate: float = 1.0):
         """Increment counter."""
-        if not self.enabled:
+        registry.inc(key, n)
+        if not self.enabled or (rate < 1.0 and random.random() >= rate):
             return
-        try:
-            self.sock.sendto(f"{self.ns}.{key}:{n}|c".encode(), self.addr)
-        except Exception:
-            pass
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + n / rate
 
     def gauge(self, key: str, val: float):
         """Set gauge value."""
+        registry.set(key, val)
         if not self.enabled:
             return
+        with self._lock:
+            self._gauges[key] = val
+
+    def _lines(self) -> List[str]:
+        with self._lock:
+            counters, gauges, timings = self._counters, self._gauges, self._timings
+            self._counters, self._gauges, self._timings = {}, {}, {}
+        ns = self.ns
+        lines = [f"{ns}.{k}:{v:g}|c" for k, v in counters.items()]
+        lines += [f"{ns}.{k}:{v:g}|g" for k, v in gauges.items()]
+        for k, samples in timings.items():
+            for ms, rate in samples:
+                lines.append(f"{ns}.{k}:{ms:g}|ms" + (f"|@{rate:g}" if rate < 1.0 else ""))
+        return lines
+
+    def flush(self):
+        """Send everything accumulated since the last flush."""
+        if not self.enabled:
+            return
+        packet: List[str] = []
+        size = 0
+        for line in self._lines():
+            n = len(line) + 1
+            if packet and size + n > self.max_packet:
+                self._send(packet)
+                packet, size = [], 0
+            packet.append(line)
+            size += n
+        if packet:
+            self._send(packet)
+
+    def _send(self, lines: List[str]):
         try:
-            self.sock.sendto(f"{self.ns}.{key}:{val}|g".encode(), self.addr)
+            self.sock.sendto("\n".join(lines).encode(), self.addr)
+            self.packets += 1
         except Exception:
-            pass
+            pass  # Non-blocking
+
+    def _run(self):
+        while not self._stop.wait(self.flush_sec):
+            self.flush()
+
+    def close(self):
+        """Stop the flush thread and send what is left."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+        self.flush()
 
 # Global metrics instance (configure with STATSD_ENABLED=1 in env)
-import os
 _enabled = os.getenv("STATSD_ENABLED", "0") == "1"
 _host = os.getenv("STATSD_HOST", "127.0.0.1")
 _port = int(os.getenv("STATSD_PORT", "8125"))
+_flush_ms = int(os.getenv("STATSD_FLUSH_MS", "1000"))
 
-metrics = Statsd(host=_host, port=_port, ns="reactor", enabled=_enabled)
-
+metrics = Statsd(host=_host, port=_port, ns="reactor", enabled=_enabled, flush_ms=_flush_ms)
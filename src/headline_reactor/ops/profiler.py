@@ -0,0 +1,92 @@
+# src/headline_reactor/ops/profiler.py
+"""Sampling profiler for single headline evaluations, written as collapsed stacks for flamegraphs."""
+from __future__ import annotations
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+def _stack(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+class HeadlineProfiler:
+    """
+    Samples the evaluating thread's stack every `interval_ms` while a headline
+    is being evaluated, and keeps the profile when the headline is every
+    `every`-th one or took at least `over_ms` (with neither set, every
+    headline is kept). Kept profiles go to `<out_dir>/<time>-<hash>-<ms>ms.folded`
+    in the collapsed format flamegraph.pl and speedscope read.
+    """
+
+    def __init__(self, enabled: bool = False, out_dir: Path = Path("profiles"), every: int = 0,
+                 over_ms: float = 0.0, interval_ms: float = 2.0):
+        self.enabled = enabled
+        self.out_dir = out_dir
+        self.every = every
+        self.over_ms = over_ms
+        self.interval = interval_ms / 1000
+        self.seen = 0
+        self.last_path: Optional[Path] = None
+        self._target: Optional[int] = None
+        self._samples: Counter = Counter()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                target = self._target
+                if target is None:
+                    continue
+                frame = sys._current_frames().get(target)
+                if frame is not None:
+                    self._samples[_stack(frame)] += 1
+
+    def _keep(self, ms: float) -> bool:
+        if not self.every and not self.over_ms:
+            return True
+        return bool((self.every and self.seen % self.every == 0) or (self.over_ms and ms >= self.over_ms))
+
+    @contextmanager
+    def headline(self, tag: str) -> Iterator[None]:
+        """Profile the enclosed evaluation; `tag` (the headline hash) names the output file."""
+        if not self.enabled:
+            yield
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="headline-profiler", daemon=True)
+            self._thread.start()
+        self.seen += 1
+        self.last_path = None
+        with self._lock:
+            self._samples = Counter()
+            self._target = threading.get_ident()
+        self._wake.set()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            self._wake.clear()
+            with self._lock:
+                self._target = None
+                samples = self._samples
+            if samples and self._keep(ms):
+                self.last_path = self._write(tag, ms, samples)
+
+    def _write(self, tag: str, ms: float, samples: Counter) -> Path:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        p = self.out_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{tag}-{ms:.0f}ms.folded"
+        p.write_text("".join(f"{stack} {n}\n" for stack, n in samples.most_common()), encoding="utf-8")
+        return p
@@ -0,0 +1,70 @@
+# src/headline_reactor/ops/prometheus.py
+"""Serve the ops.metrics registry over HTTP in the Prometheus text exposition format."""
+from __future__ import annotations
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from .metrics import Registry, registry
+
+NS = "reactor"
+QUANTILES = (50, 90, 99)
+_BAD = re.compile(r"[^a-zA-Z0-9_]")
+
+def _split(key: str) -> Tuple[str, str]:
+    """'circuit.events{kind="error"}' -> ('reactor_circuit_events', '{kind="error"}')."""
+    name, brace, labels = key.partition("{")
+    return f"{NS}_{_BAD.sub('_', name)}", brace + labels
+
+def _family(out: List[str], seen: Dict[str, bool], name: str, kind: str):
+    if name not in seen:
+        seen[name] = True
+        out.append(f"# TYPE {name} {kind}")
+
+def render(reg: Registry = registry) -> str:
+    """Counters, gauges/collector values and latency summaries in exposition format."""
+    out: List[str] = []
+    seen: Dict[str, bool] = {}
+    for key, v in sorted(dict(reg.counters).items()):
+        name, labels = _split(key)
+        _family(out, seen, name + "_total", "counter")
+        out.append(f"{name}_total{labels} {v:g}")
+    for key, v in sorted(reg.collect().items()):
+        name, labels = _split(key)
+        _family(out, seen, name, "gauge")
+        out.append(f"{name}{labels} {float(v):g}")
+    name = f"{NS}_latency_seconds"
+    for key, h in sorted(dict(reg.histograms).items()):
+        if not h.n:
+            continue
+        _family(out, seen, name, "summary")
+        with h._lock:
+            qs = [(q, h.percentile(q)) for q in QUANTILES]
+            n, total = h.n, h.total_ns
+        for q, ns in qs:
+            out.append(f'{name}{{name="{key}",quantile="{q / 100:g}"}} {ns / 1e9:.9g}')
+        out.append(f'{name}_sum{{name="{key}"}} {total / 1e9:.9g}')
+        out.append(f'{name}_count{{name="{key}"}} {n}')
+    return "\n".join(out) + "\n"
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # scrapes would otherwise spam the watch console
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Start the /metrics endpoint on a daemon thread; returns the server (call shutdown() to stop)."""
+    srv = ThreadingHTTPServer((host, port), _Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, name="metrics-http", daemon=True).start()
+    return srv
@@ -0,0 +1,70 @@
+# src/headline_reactor/ops/spans.py
+"""Per-stage latency spans, recorded as `span.<stage>` timings in the ops.metrics registry."""
+from __future__ import annotations
+import functools
+import os
+import time
+from typing import Callable, Dict, List
+from .metrics import Histogram, metrics, registry
+
+SPAN_SAMPLE_RATE = float(os.getenv("STATSD_SPAN_RATE", "1"))   # share of spans also sent to StatsD
+
+PREFIX = "span."
+
+def histogram(name: str) -> Histogram:
+    return registry.histogram(PREFIX + name)
+
+def record(name: str, ns: int):
+    """Add one duration to the stage's histogram (always) and the StatsD sink (sampled)."""
+    metrics.timing(PREFIX + name, ns / 1e6, SPAN_SAMPLE_RATE)
+
+class span:
+    """
+    Time a stage of the headline path, as a context manager or decorator:
+
+        with span("resolver.resolve"): ...
+
+        @span("ocr.topline")
+        def ocr_topline(img): ...
+    """
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.t0 = 0
+
+    def __enter__(self) -> "span":
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter_ns() - self.t0)
+
+    def __call__(self, fn: Callable) -> Callable:
+        name = self.name
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter_ns() - t0)
+        return wrapper
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Per-stage summaries, by stage name."""
+    hists = dict(registry.histograms)
+    return {k[len(PREFIX):]: hists[k].snapshot() for k in sorted(hists) if k.startswith(PREFIX)}
+
+def report() -> List[str]:
+    """Table lines of per-stage latency, for printing when a watch session ends."""
+    lines = [f"{'stage':<22} {'count':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+    for name, s in snapshot().items():
+        if s["count"]:
+            lines.append(f"{name:<22} {s['count']:>7} {s['p50_ms']:>9.3f} {s['p90_ms']:>9.3f} "
+                         f"{s['p99_ms']:>9.3f} {s['max_ms']:>9.3f}")
+    return lines
+
+def reset():
+    for k in [k for k in registry.histograms if k.startswith(PREFIX)]:
+        registry.histograms.pop(k, None)
@@ -2,7 +2,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
+from datetime import date
 import pandas as pd
+from .vendors.orats_store import ChainPartition, OptQuote
+from .ops.spans import span
 
 @dataclass
 class OptIdea:
@@ -35,8 +38,28 @@ def last_close(symbol: str, root: Path = Path("data/live")) -> Optional[float]:
     except Exception:
         return None
 
-def atm_call(symbol: str, next_code: str = "NEXT_FRI", prem_usd: int = 300) -> Optional[OptIdea]:
+def _expiry_code(expiry: str) -> str:
+    """YYYY-MM-DD -> 21JUN24."""
+    return date.fromisoformat(expiry).strftime("%d%b%y").upper()
+
+def _fmt_strike(k: float) -> str:
+    return f"{k:g}"
+
+def _chain_line(symbol: str, q: OptQuote, qty: int) -> str:
+    sign = "+C" if q.right == "C" else "+P"
+    return f"{symbol} {sign}{_fmt_strike(q.strike)} {_expiry_code(q.expiry)} x{qty} LMT=mid IOC TTL=10m"
+
+@span("options.atm_call")
+def atm_call(symbol: str, next_code: str = "NEXT_FRI", prem_usd: int = 300,
+             chain: Optional[ChainPartition] = None) -> Optional[OptIdea]:
     """Generate ATM call suggestion for quick scalp (M&A, positive pops)."""
+    if chain is not None:
+        q = chain.atm("C")
+        if q is not None:
+            mid = q.mid
+            qty = max(1, int(prem_usd // (mid * 100))) if mid else 1
+            return OptIdea(line=_chain_line(symbol, q, qty), score=0.45,
+                           rationale=f"ATM call quick scalp ({q.dte}d, Δ{q.delta:.2f})")
     px = last_close(symbol)
     if px is None: 
         return None
@@ -45,8 +68,15 @@ def atm_call(symbol: str, next_code: str = "NEXT_FRI", prem_usd: int = 300) -> O
     line = f"{symbol} +C{strike} {next_code} x{qty} LMT=mid IOC TTL=10m"
     return OptIdea(line=line, score=0.45, rationale="ATM call quick scalp")
 
-def delta_put(symbol: str, delta: float = 0.30, next_code: str = "NEXT_FRI") -> Optional[OptIdea]:
+@span("options.delta_put")
+def delta_put(symbol: str, delta: float = 0.30, next_code: str = "NEXT_FRI",
+              chain: Optional[ChainPartition] = None) -> Optional[OptIdea]:
     """Generate ~30 delta put for guidance cuts, downgrades."""
+    if chain is not None:
+        q = chain.by_delta(delta, "P")
+        if q is not None:
+            return OptIdea(line=_chain_line(symbol, q, 1), score=0.48,
+                           rationale=f"~{delta:.2f}Δ put for down headlines ({q.dte}d, Δ{q.delta:.2f})")
     px = last_close(symbol)
     if px is None: 
         return None
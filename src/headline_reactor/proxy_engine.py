@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional
 from pathlib import Path
 import pandas as pd
+from .ops.spans import span
 
 @dataclass
 class Proxy:
@@ -11,6 +12,7 @@ class Proxy:
     asset_class: str  # EQUITY/ETF/FUT/FX/CRYPTO
     why: str
     base_score: float
+    exch: Optional[str] = None  # listing exchange for single names (status checks key on it)
 
 class Catalogs:
     """Manage ETF and secmaster catalogs."""
@@ -62,6 +64,7 @@ class Catalogs:
         except Exception:
             return None
 
+@span("proxy.build")
 def build_proxies(row: Dict, cats: Catalogs, allow_local: bool) -> List[Proxy]:
     """Build proxy waterfall: single-name → ADR → sector ETF → country ETF."""
     out: List[Proxy] = []
@@ -70,16 +73,16 @@ def build_proxies(row: Dict, cats: Catalogs, allow_local: bool) -> List[Proxy]:
     
     # 1) Single-name US (preferred)
     if exch in ("US", "NYSE", "NASDAQ", "N", "O", "UQ", "XNYS", "XNAS"):
-        out.append(Proxy(sym, "EQUITY", "US listing", 0.95))
+        out.append(Proxy(sym, "EQUITY", "US listing", 0.95, "US"))
     
     # 2) ADR if available
     adr = cats.adr_for(row)
     if adr: 
-        out.append(Proxy(adr, "EQUITY", "US ADR", 0.85))
+        out.append(Proxy(adr, "EQUITY", "US ADR", 0.85, "US"))
     
     # 3) Local line (if explicitly allowed)
     if allow_local and exch not in ("US", "N", "O", "UQ", "XNYS", "XNAS"):
-        out.append(Proxy(sym, "EQUITY", f"Local line {exch}", 0.75))
+        out.append(Proxy(sym, "EQUITY", f"Local line {exch}", 0.75, exch))
     
     # 4) Sector ETF (sympathy)
     se = cats.sector_etf(sect)
@@ -93,3 +96,40 @@ def build_proxies(row: Dict, cats: Catalogs, allow_local: bool) -> List[Proxy]:
     
     return out
 
+
+def etf_proxy_map(cats: Catalogs) -> Dict[str, List[Proxy]]:
+    """
+    Symbol -> sector/country ETF proxies for every secmaster row, precomputed
+    so ETF_ONLY mode needs no secmaster resolution. US listings win on
+    symbols shared across exchanges.
+    """
+    if cats.secmaster is None or cats.etfs is None:
+        return {}
+    etfs = cats.etfs
+    def first(kind: str, col: str) -> Dict[str, str]:
+        # Older ETF catalogs may lack the type/sector/country columns (as sector_etf tolerates)
+        if not {"type", "etf", col}.issubset(etfs.columns):
+            return {}
+        r = etfs[etfs["type"] == kind].dropna(subset=[col])
+        return dict(zip(r[col].astype(str).str.upper()[::-1], r["etf"][::-1]))
+    by_sector, by_country = first("sector", "sector"), first("country", "country")
+    if (not by_sector and not by_country) or "symbol" not in cats.secmaster.columns:
+        return {}
+
+    sm = cats.secmaster.dropna(subset=["symbol"])
+    blank = pd.Series(None, index=sm.index, dtype=object)
+    us = sm.get("exchange", blank).fillna("").astype(str).str.upper().isin(["US", "NYSE", "NASDAQ", "N", "O", "UQ", "XNYS", "XNAS"])
+    sm = sm.assign(_us=us).sort_values("_us", ascending=False, kind="stable").drop_duplicates("symbol")
+    blank = blank.reindex(sm.index)
+    out: Dict[str, List[Proxy]] = {}
+    for sym, sect, ctry in zip(sm["symbol"].astype(str).str.upper(), sm.get("sector", blank), sm.get("country", blank)):
+        px: List[Proxy] = []
+        se = by_sector.get(sect.upper()) if isinstance(sect, str) else None
+        if se:
+            px.append(Proxy(se, "ETF", f"Sector ETF ({sect})", 0.65))
+        ce = by_country.get(ctry.upper()) if isinstance(ctry, str) else None
+        if ce:
+            px.append(Proxy(ce, "ETF", f"Country ETF ({ctry})", 0.60))
+        if px:
+            out[sym] = px
+    return out
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Dict
 import pandas as pd
+from .ops.spans import span
 
 @dataclass
 class Entity:
@@ -23,6 +24,7 @@ RX_RIC = re.compile(r'\b([A-Z0-9]{1,15})\.(?:O|N|KQ|KS|HK|SS|SZ|L|PA|DE|SW|MI|VX
 RX_LOCAL = re.compile(r'\b(\d{1,6}|[A-Z]{1,6})\s+(KS|KQ|TT|TW|HK|SS|SZ|L|FP|GY|SW|IM|AU|PA|DE|SM)\b')
 RX_US = re.compile(r'\b([A-Z]{1,6})(?:\s+US)?\b')
 
+@span("resolver.extract")
 def extract_entities(text: str) -> List[Entity]:
     """Extract all tradeable entities from headline text."""
     T = text.upper()
@@ -93,6 +95,7 @@ class Secmaster:
             except Exception:
                 pass
 
+    @span("resolver.resolve")
     def resolve(self, ent: Entity) -> List[Dict]:
         """Return zero or more tradeable rows for an entity (local, ADR, US)."""
         if not self.ok: 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import re
 from typing import Optional, List
+from .ops.spans import span
 
 # --- Classifier rules (expanded for tradeable events)
 RULES = [
@@ -92,11 +93,13 @@ def _sector_proxy_from_headline(headline: str) -> Optional[str]:
 
 # --------- Public API used by CLI
 
+@span("rules.classify")
 def classify(headline: str) -> Optional[str]:
     for label, rx in RULES:
         if rx.search(headline): return label
     return None
 
+@span("rules.map_ticker")
 def map_ticker(headline: str, whitelist: set[str]) -> Optional[str]:
     """
     Primary symbol selection:
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from collections import deque
+import threading
 from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 
 @dataclass
 class CircuitState:
@@ -9,49 +10,141 @@ class CircuitState:
     max_errors: int = 3            # Max errors before degrading
     max_timeouts: int = 2          # Max timeouts before degrading
     max_wide_spreads: int = 2      # Max wide-spread events
+    slow_ocr_ms: int = 400         # OCR slower than this counts as a timeout
+    slow_resolve_ms: int = 150     # Entity resolution slower than this counts as a timeout
+
+def circuit_state(cfg: dict) -> CircuitState:
+    """Circuit configuration from the `circuit` config section (defaults for missing keys)."""
+    c = cfg.get("circuit") or {}
+    d = CircuitState()
+    return CircuitState(**{k: int(c.get(k, getattr(d, k))) for k in d.__dataclass_fields__})
+
+class RollingCounter:
+    """
+    Event count over a rolling window, kept in `buckets` fixed-width time
+    buckets. Recording and counting are O(1): at most `buckets` slots are
+    expired per call and no per-event memory is allocated. The window is
+    exact to one bucket width (5s for a 60s window).
+    """
+    __slots__ = ("width", "n", "counts", "head", "total")
+
+    def __init__(self, window_ms: int, buckets: int = 12):
+        self.n = buckets
+        self.width = max(1, window_ms // buckets)
+        self.counts = [0] * buckets
+        self.head = -1          # newest bucket number seen
+        self.total = 0
+
+    def _advance(self, b: int):
+        if b <= self.head:
+            return
+        if b - self.head >= self.n:
+            self.counts = [0] * self.n
+            self.total = 0
+        else:
+            for k in range(self.head + 1, b + 1):
+                i = k % self.n
+                self.total -= self.counts[i]
+                self.counts[i] = 0
+        self.head = b
+
+    def add(self, now_ms: int, k: int = 1):
+        b = now_ms // self.width
+        self._advance(b)
+        if self.head - b < self.n:      # late events still inside the window count
+            self.counts[b % self.n] += k
+            self.total += k
+
+    def count(self, now_ms: int) -> int:
+        self._advance(now_ms // self.width)
+        return self.total
+
+    def clear(self):
+        self.counts = [0] * self.n
+        self.head = -1
+        self.total = 0
+
+# Event kinds and the CircuitState limit each one is checked against
+KINDS = {"error": "max_errors", "timeout": "max_timeouts", "wide_spread": "max_wide_spreads"}
 
 class Circuit:
-    """Circuit breaker for operational safety during market stress."""
+    """
+    Circuit breaker for operational safety during market stress.
+
+    Errors and timeouts are tagged with the vendor that produced them (ocr,
+    secmaster, orats, bbg) and wide spreads with the venue; limits apply to
+    the total of each kind, per-source counts say who tripped it. Safe to
+    call from capture, OCR and planning threads.
+    """
     
     def __init__(self, cfg: CircuitState):
         self.cfg = cfg
-        self.err = deque()      # error timestamps (ms)
-        self.to  = deque()      # timeout timestamps (ms)
-        self.wide= deque()      # wide-spread event timestamps (ms)
-
-    def _prune(self, now_ms: int):
-        """Remove events outside rolling window."""
-        w = self.cfg.rolling_ms
-        for q in (self.err, self.to, self.wide):
-            while q and now_ms - q[0] > w:
-                q.popleft()
-
-    def record_error(self, now_ms: int):
+        self._lock = threading.Lock()
+        self._totals = {k: RollingCounter(cfg.rolling_ms) for k in KINDS}
+        self._by_source: Dict[Tuple[str, str], RollingCounter] = {}
+
+    def record(self, kind: str, now_ms: int, source: str = "other"):
+        """Record one event of `kind` (error/timeout/wide_spread) from a vendor or venue."""
+        with self._lock:
+            self._totals[kind].add(now_ms)
+            c = self._by_source.get((kind, source))
+            if c is None:
+                c = self._by_source[(kind, source)] = RollingCounter(self.cfg.rolling_ms)
+            c.add(now_ms)
+
+    def record_error(self, now_ms: int, vendor: str = "other"):
         """Record an error event."""
-        self.err.append(now_ms)
+        self.record("error", now_ms, vendor)
     
-    def record_timeout(self, now_ms: int):
+    def record_timeout(self, now_ms: int, vendor: str = "other"):
         """Record a timeout event."""
-        self.to.append(now_ms)
+        self.record("timeout", now_ms, vendor)
     
-    def record_wide_spread(self, now_ms: int):
+    def record_wide_spread(self, now_ms: int, venue: str = "other"):
         """Record a wide-spread event."""
-        self.wide.append(now_ms)
+        self.record("wide_spread", now_ms, venue)
 
     def should_degrade(self, now_ms: int) -> bool:
         """Check if we should degrade to safe mode."""
-        self._prune(now_ms)
-        return (len(self.err) >= self.cfg.max_errors or
-                len(self.to) >= self.cfg.max_timeouts or
-                len(self.wide) >= self.cfg.max_wide_spreads)
+        with self._lock:
+            return any(self._totals[k].count(now_ms) >= getattr(self.cfg, lim) for k, lim in KINDS.items())
 
     def next_mode(self, now_ms: int) -> str:
         """Get recommended operating mode."""
         return "ETF_ONLY" if self.should_degrade(now_ms) else "FULL"
+
+    def counts(self, now_ms: int) -> Dict[str, Dict[str, int]]:
+        """Events in the window by kind and source, e.g. {"timeout": {"orats": 2}}."""
+        out: Dict[str, Dict[str, int]] = {k: {} for k in KINDS}
+        with self._lock:
+            for (kind, source), c in self._by_source.items():
+                n = c.count(now_ms)
+                if n:
+                    out[kind][source] = n
+        return out
+
+    def reasons(self, now_ms: int) -> str:
+        """Short description of what is tripping the circuit ("" when FULL)."""
+        parts = []
+        for kind, by in self.counts(now_ms).items():
+            if sum(by.values()) >= getattr(self.cfg, KINDS[kind]):
+                parts.append(f"{kind}s: " + ", ".join(f"{s}={n}" for s, n in sorted(by.items())))
+        return "; ".join(parts)
     
     def reset(self):
         """Reset all circuit breaker state."""
-        self.err.clear()
-        self.to.clear()
-        self.wide.clear()
+        with self._lock:
+            for c in self._totals.values():
+                c.clear()
+            self._by_source.clear()
+
+_circuit: Optional[Circuit] = None
+_circuit_lock = threading.Lock()
 
+def get_circuit(cfg: Optional[CircuitState] = None) -> Circuit:
+    """Process-wide circuit shared by the watch loop and the planner; `cfg` applies on first use."""
+    global _circuit
+    with _circuit_lock:
+        if _circuit is None:
+            _circuit = Circuit(cfg or CircuitState())
+        return _circuit
@@ -1,7 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import date, datetime
+import threading
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
 import pandas_market_calendars as mcal
 import pytz
 
@@ -13,38 +16,73 @@ class SessionInfo:
     minutes_to_close: int
     reason: str
 
+def _epoch(col: pd.Series) -> np.ndarray:
+    """Schedule timestamps (tz-aware, or naive UTC) -> float64 epoch seconds."""
+    if col.dt.tz is not None:
+        col = col.dt.tz_convert("UTC").dt.tz_localize(None)
+    return col.to_numpy(dtype="datetime64[ns]").astype(np.int64) / 1e9
+
 class USMarketCalendar:
-    """Market session calendar for US equities (NYSE/Nasdaq)."""
-    
-    def __init__(self):
+    """
+    Market session calendar for US equities (NYSE/Nasdaq).
+
+    A calendar year of sessions (holidays and early closes included) is
+    precomputed into sorted open/close arrays, so lookups are one bisect;
+    the next year is loaded lazily the first time a lookup crosses into it.
+    Construction builds that schedule, so use the shared `get_market_calendar()`.
+    """
+
+    def __init__(self, year: Optional[int] = None):
         self.nyse = mcal.get_calendar("XNYS")
+        self._lock = threading.Lock()
+        self._load(year or datetime.now(ET).year)
+
+    def _load(self, year: int):
+        sched = self.nyse.schedule(start_date=date(year, 1, 1), end_date=date(year, 12, 31))
+        days = np.array([d.toordinal() for d in pd.DatetimeIndex(sched.index).date], dtype=np.int64)
+        # One tuple, swapped atomically: readers never see a half-loaded year
+        self._sched: Tuple[int, np.ndarray, np.ndarray, np.ndarray] = (
+            year, days, _epoch(sched["market_open"]), _epoch(sched["market_close"]))
+
+    def _for(self, year: int) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        sched = self._sched
+        if sched[0] != year:
+            with self._lock:
+                if self._sched[0] != year:
+                    self._load(year)
+                sched = self._sched
+        return sched
 
     def session_info(self, now: Optional[datetime] = None) -> SessionInfo:
-        """Get current market session status."""
+        """Get current market session status (naive datetimes are taken as ET)."""
         now = now or datetime.now(ET)
-        
-        # Get schedule for today
-        sched = self.nyse.schedule(
-            start_date=(now.date() - timedelta(days=7)), 
-            end_date=(now.date() + timedelta(days=7))
-        )
-        
-        # Find today's session (handles holidays/early-closes)
-        today = sched[sched.index.date == now.date()]
-        if today.empty:
-            return SessionInfo(False, 0, "holiday/closed")
-        
-        open_ts = ET.localize(today["market_open"].iloc[0].to_pydatetime().replace(tzinfo=None))
-        close_ts = ET.localize(today["market_close"].iloc[0].to_pydatetime().replace(tzinfo=None))
-        
-        if now < open_ts:
-            return SessionInfo(False, int((close_ts - open_ts).total_seconds() // 60), "pre-open")
-        if now > close_ts:
+        if now.tzinfo is None:
+            now = ET.localize(now)
+        today = now.astimezone(ET).date()
+        _, days, opens, closes = self._for(today.year)
+        t = now.timestamp()
+
+        # Last session that opened at or before `now`
+        i = int(np.searchsorted(opens, t, side="right")) - 1
+        if i >= 0 and t <= closes[i]:
+            return SessionInfo(True, max(0, int((closes[i] - t) // 60)), "open")
+        if i + 1 < len(days) and days[i + 1] == today.toordinal():
+            return SessionInfo(False, int((closes[i + 1] - opens[i + 1]) // 60), "pre-open")
+        if i >= 0 and days[i] == today.toordinal():
             return SessionInfo(False, 0, "post-close")
-        
-        return SessionInfo(True, max(0, int((close_ts - now).total_seconds() // 60)), "open")
-    
+        return SessionInfo(False, 0, "holiday/closed")
+
     def is_market_open(self, now: Optional[datetime] = None) -> bool:
         """Quick check if market is currently open."""
         return self.session_info(now).is_open
 
+_calendar: Optional[USMarketCalendar] = None
+_calendar_lock = threading.Lock()
+
+def get_market_calendar() -> USMarketCalendar:
+    """Process-wide calendar (built once; rolls over to a new year on first use)."""
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None:
+            _calendar = USMarketCalendar()
+        return _calendar
@@ -0,0 +1,17 @@
+# src/headline_reactor/vendors/bbg_api.py
+"""The `blpapi` module in use: the real bindings, or the offline stand-in when BLP_OFFLINE is set."""
+from __future__ import annotations
+import os
+
+def _load():
+    if os.getenv("BLP_OFFLINE"):
+        from . import bbg_offline
+        return bbg_offline
+    try:
+        import blpapi
+        return blpapi
+    except Exception:
+        return None
+
+blpapi = _load()
+OFFLINE = blpapi is not None and blpapi.__name__.endswith("bbg_offline")
@@ -0,0 +1,301 @@
+# src/headline_reactor/vendors/bbg_fetch.py
+"""Pipelined Bloomberg request/response: several chunk requests in flight on one session."""
+from __future__ import annotations
+import itertools, time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from .bbg_api import blpapi
+
+# Correlation IDs stay unique across fetches on a reused (pooled) session
+_CID_BLOCK = 1_000_000
+_fetch_ids = itertools.count(1)
+
+@dataclass
+class ChunkTiming:
+    """Per-chunk round-trip stats."""
+    chunk: int
+    size: int
+    sent_at: float
+    first_msg_ms: Optional[float] = None
+    done_ms: Optional[float] = None
+    messages: int = 0
+    attempts: int = 1
+    error: Optional[str] = None
+
+@dataclass
+class FetchReport:
+    """Latency summary for one pipelined fetch."""
+    chunks: List[ChunkTiming] = field(default_factory=list)
+    wall_ms: float = 0.0
+
+    def latencies(self) -> List[float]:
+        return sorted(c.done_ms for c in self.chunks if c.done_ms is not None)
+
+    def failed(self) -> List[ChunkTiming]:
+        return [c for c in self.chunks if c.error is not None]
+
+    def summary(self) -> str:
+        lat = self.latencies()
+        if not lat:
+            return f"no chunks completed ({len(self.failed())} failed)" if self.chunks else "no chunks"
+        p = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))]
+        n = sum(c.size for c in self.chunks)
+        failed = self.failed()
+        return (f"{len(lat)} chunks / {n:,} securities in {self.wall_ms/1000:.1f}s "
+                f"(chunk p50 {p(0.5):.0f}ms, p90 {p(0.9):.0f}ms, max {lat[-1]:.0f}ms)"
+                + (f", {len(failed)} failed" if failed else ""))
+
+def security_rows(msg, fields: List[str], conv: Callable[[Any], Any], key: str = "security",
+                  errors: bool = False) -> Iterator[Dict[str, Any]]:
+    """Decode securityData[] of a Reference/StaticMarketData response message into dict rows."""
+    if not msg.hasElement("securityData"):
+        return
+    sd = msg.getElement("securityData")
+    for j in range(sd.numValues()):
+        rec = sd.getValueAsElement(j)
+        row = {key: rec.getElementAsString("security")}
+        fd = rec.getElement("fieldData")
+        for f in fields:
+            if fd.hasElement(f):
+                row[f] = conv(fd.getElement(f))
+        if errors and rec.hasElement("securityError"):
+            row["_securityError"] = rec.getElement("securityError").toString()
+        yield row
+
+class PipelinedFetcher:
+    """
+    Keep up to `concurrency` chunk requests outstanding on a session.
+
+    Each chunk gets its own CorrelationId; PARTIAL_RESPONSE and RESPONSE
+    messages are routed to `on_message(chunk_index, msg)` as they arrive and
+    a new chunk is sent as soon as one completes. A chunk that gets a
+    RequestFailure (REQUEST_STATUS) or no RESPONSE within `chunk_timeout_sec`
+    is resent up to `retries` times, then recorded as failed (`error` set,
+    `on_chunk_done` not called) so one bad chunk never stalls the rest.
+    """
+
+    def __init__(self, session, service, request_type: str, chunk: int = 450, concurrency: int = 4,
+                 timeout_ms: int = 500, chunk_timeout_sec: float = 120.0, retries: int = 1):
+        self.sess = session
+        self.service = service
+        self.request_type = request_type
+        self.chunk = chunk
+        self.concurrency = max(1, concurrency)
+        self.timeout_ms = timeout_ms
+        self.chunk_timeout_sec = chunk_timeout_sec
+        self.retries = retries
+
+    def _request(self, securities: List[str], fields: List[str], overrides: Optional[Dict[str, Any]]):
+        req = self.service.createRequest(self.request_type)
+        e_secs = req.getElement("securities")
+        for s in securities:
+            e_secs.appendValue(s)
+        e_flds = req.getElement("fields")
+        for f in fields:
+            e_flds.appendValue(f)
+        if overrides:
+            e_ovr = req.getElement("overrides")
+            for k, v in overrides.items():
+                o = e_ovr.appendElement()
+                o.setElement("fieldId", k)
+                o.setElement("value", v)
+        return req
+
+    def run(self, securities: List[str], fields: List[str], on_message: Callable[[int, Any], None],
+            overrides: Optional[Dict[str, Any]] = None, skip: Optional[set] = None,
+            on_chunk_done: Optional[Callable[[int], None]] = None) -> FetchReport:
+        """Send all chunks (except indices in `skip`), keeping the window full until each one completes or fails."""
+        chunks = [(i // self.chunk, securities[i:i + self.chunk]) for i in range(0, len(securities), self.chunk)]
+        todo = [c for c in chunks if not skip or c[0] not in skip]
+        by_idx = dict(todo)
+        report = FetchReport()
+        pending: Dict[int, ChunkTiming] = {}   # correlation id -> timing of the attempt it belongs to
+        base = next(_fetch_ids) * _CID_BLOCK
+        seq = itertools.count()                # resends get fresh ids, so late messages of a dropped attempt are ignored
+        t0 = time.perf_counter()
+        nxt = 0
+
+        def send(idx: int, timing: ChunkTiming):
+            cid = base + next(seq)
+            pending[cid] = timing
+            self.sess.sendRequest(self._request(by_idx[idx], fields, overrides), correlationId=blpapi.CorrelationId(cid))
+
+        def send_next():
+            nonlocal nxt
+            idx, secs = todo[nxt]
+            nxt += 1
+            timing = ChunkTiming(idx, len(secs), time.perf_counter())
+            report.chunks.append(timing)
+            send(idx, timing)
+
+        def finish(cid: int):
+            del pending[cid]
+            if nxt < len(todo):
+                send_next()
+
+        def give_up(cid: int, why: str):
+            """Resend the chunk behind `cid`, or record it as failed once retries are used up."""
+            timing = pending.pop(cid)
+            cancel = getattr(self.sess, "cancel", None)
+            if cancel is not None:
+                try:
+                    cancel(blpapi.CorrelationId(cid))
+                except Exception:
+                    pass
+            if timing.attempts <= self.retries and timing.messages == 0:
+                timing.attempts += 1
+                timing.sent_at = time.perf_counter()
+                send(timing.chunk, timing)
+                return
+            timing.error = why
+            if nxt < len(todo):
+                send_next()
+
+        while nxt < len(todo) and len(pending) < self.concurrency:
+            send_next()
+
+        while pending:
+            ev = self.sess.nextEvent(self.timeout_ms)
+            et = ev.eventType()
+            if et in (blpapi.Event.PARTIAL_RESPONSE, blpapi.Event.RESPONSE, blpapi.Event.REQUEST_STATUS):
+                for msg in ev:
+                    cids = msg.correlationIds()
+                    if not cids:
+                        continue
+                    cid = cids[0].value()
+                    timing = pending.get(cid)
+                    if timing is None:
+                        continue
+                    if et == blpapi.Event.REQUEST_STATUS:
+                        if str(msg.messageType()) == "RequestFailure":
+                            give_up(cid, "RequestFailure")
+                        continue
+                    now = time.perf_counter()
+                    if timing.first_msg_ms is None:
+                        timing.first_msg_ms = (now - timing.sent_at) * 1000
+                    timing.messages += 1
+                    on_message(timing.chunk, msg)
+                    if et == blpapi.Event.RESPONSE:
+                        timing.done_ms = (now - timing.sent_at) * 1000
+                        if on_chunk_done:
+                            on_chunk_done(timing.chunk)
+                        finish(cid)
+            now = time.perf_counter()
+            for cid in [c for c, t in pending.items() if now - t.sent_at > self.chunk_timeout_sec]:
+                give_up(cid, f"no response in {self.chunk_timeout_sec:g}s")
+        report.wall_ms = (time.perf_counter() - t0) * 1000
+        return report
+
+def beqs_securities(msg) -> List[str]:
+    """Security strings in one BeqsResponse message (data.securityData[] or top-level securityData[])."""
+    out: List[str] = []
+    for holder in (msg.getElement("data") if msg.hasElement("data") else None, msg):
+        if holder is None or not holder.hasElement("securityData"):
+            continue
+        sd = holder.getElement("securityData")
+        for i in range(sd.numValues()):
+            rec = sd.getValueAsElement(i)
+            if rec.hasElement("security"):
+                sec = rec.getElementAsString("security")
+                if sec:
+                    out.append(sec)
+    return out
+
+@dataclass
+class BeqsResult:
+    """Merged screen output; `pages` counts pages requested, including speculative empty ones."""
+    securities: List[str]
+    pages: int
+    error: Optional[str] = None
+    wall_ms: float = 0.0
+
+class BeqsPager:
+    """
+    BEQS screen pages (START_POSITION overrides) fetched several at a time on one session.
+
+    BEQS responses carry no result count, so the size is unknown up front: the
+    first page is fetched alone, and if it is full the following pages are
+    requested in speculative windows of `window` until a short page shows the
+    end. Pages are merged in page order. A page that gets a RequestFailure or
+    no RESPONSE within `page_timeout_sec` counts as an error, which ends the screen.
+    """
+
+    def __init__(self, session, service, page_size: int = 3000, window: int = 4, timeout_ms: int = 500,
+                 page_timeout_sec: float = 120.0):
+        self.sess = session
+        self.service = service
+        self.page_size = page_size
+        self.window = max(1, window)
+        self.timeout_ms = timeout_ms
+        self.page_timeout_sec = page_timeout_sec
+
+    def _request(self, screen_name: str, screen_type: str, offset: int):
+        req = self.service.createRequest("BeqsRequest")
+        req.getElement("screenName").setValue(screen_name)
+        req.getElement("screenType").setValue(screen_type)
+        if offset > 0:
+            o = req.getElement("overrides").appendElement()
+            o.setElement("fieldId", "START_POSITION")
+            o.setElement("value", str(offset))
+        return req
+
+    def _pages(self, screen_name: str, screen_type: str, pages: List[int]) -> Dict[int, Any]:
+        """Send `pages` together; page index -> list of securities, or an error string."""
+        base = next(_fetch_ids) * _CID_BLOCK
+        out: Dict[int, Any] = {p: [] for p in pages}
+        pending = set(pages)
+        for p in pages:
+            self.sess.sendRequest(self._request(screen_name, screen_type, p * self.page_size),
+                                  correlationId=blpapi.CorrelationId(base + p))
+        deadline = time.perf_counter() + self.page_timeout_sec
+        while pending:
+            if time.perf_counter() > deadline:
+                for p in pending:
+                    out[p] = f"no response in {self.page_timeout_sec:g}s"
+                break
+            ev = self.sess.nextEvent(self.timeout_ms)
+            et = ev.eventType()
+            if et not in (blpapi.Event.PARTIAL_RESPONSE, blpapi.Event.RESPONSE, blpapi.Event.REQUEST_STATUS):
+                continue
+            for msg in ev:
+                cids = msg.correlationIds()
+                p = cids[0].value() - base if cids else None
+                if p not in pending:
+                    continue
+                if et == blpapi.Event.REQUEST_STATUS:
+                    if str(msg.messageType()) == "RequestFailure":
+                        out[p] = "RequestFailure"
+                        pending.discard(p)
+                    continue
+                if msg.hasElement("responseError"):
+                    err = msg.getElement("responseError")
+                    out[p] = err.getElementAsString("message") if err.hasElement("message") else "Unknown error"
+                elif isinstance(out[p], list):
+                    out[p].extend(beqs_securities(msg))
+                if et == blpapi.Event.RESPONSE:
+                    pending.discard(p)
+        return out
+
+    def fetch(self, screen_name: str, screen_type: str = "PRIVATE", max_results: int = 25000) -> BeqsResult:
+        t0 = time.perf_counter()
+        max_pages = max(1, -(-max_results // self.page_size))
+        got = self._pages(screen_name, screen_type, [0])
+        nxt, requested = 1, 1
+        while isinstance(got[nxt - 1], list) and len(got[nxt - 1]) >= self.page_size and nxt < max_pages:
+            batch = list(range(nxt, min(nxt + self.window, max_pages)))
+            got.update(self._pages(screen_name, screen_type, batch))
+            requested += len(batch)
+            # Advance only past full pages; a short page (or an error) ends the screen
+            while nxt < batch[-1] + 1 and isinstance(got[nxt], list) and len(got[nxt]) >= self.page_size:
+                nxt += 1
+            if nxt <= batch[-1]:
+                nxt += 1
+                break
+        secs: List[str] = []
+        error = None
+        for p in range(nxt):
+            if not isinstance(got[p], list):
+                error = got[p]
+                break
+            secs.extend(got[p])
+        return BeqsResult(secs, requested, error, (time.perf_counter() - t0) * 1000)
@@ -0,0 +1,590 @@
+# src/headline_reactor/vendors/bbg_offline.py
+"""
+Offline stand-in for the subset of `blpapi` the catalog builds and status checks use.
+
+Enabled with BLP_OFFLINE (see `bbg_api`): "1"/"synthetic" generates deterministic
+values for any security, a directory path loads fixtures first:
+
+    <dir>/refdata.csv|.parquet   security column + one column per field
+    <dir>/bulk.json              {security: {bulk_field: [{col: value, ...}, ...]}}
+    <dir>/beqs.json              {screen_name: [security, ...]}
+
+Responses arrive after BLP_OFFLINE_LATENCY_MS per request plus
+BLP_OFFLINE_PER_SEC_US per security, split into PARTIAL_RESPONSE events of
+BLP_OFFLINE_PAGE securities. Outstanding requests are served concurrently, as
+the real service does, so chunking and pipelining show up in benchmarks.
+Subscriptions deliver the initial paint (current field values) and no ticks.
+"""
+from __future__ import annotations
+import os, json, heapq, hashlib, itertools, threading, time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+class DataType:
+    BOOL = 1
+    CHAR = 2
+    BYTE = 3
+    INT32 = 4
+    INT64 = 5
+    FLOAT32 = 6
+    FLOAT64 = 7
+    STRING = 8
+    DATE = 10
+    TIME = 11
+    DATETIME = 13
+    ENUMERATION = 14
+    SEQUENCE = 15
+    CHOICE = 16
+
+class Event:
+    ADMIN = 1
+    SESSION_STATUS = 2
+    SUBSCRIPTION_STATUS = 3
+    REQUEST_STATUS = 4
+    RESPONSE = 5
+    PARTIAL_RESPONSE = 6
+    SUBSCRIPTION_DATA = 8
+    SERVICE_STATUS = 9
+    TIMEOUT = 10
+
+    def __init__(self, event_type: int, messages: List["Message"]):
+        self._type = event_type
+        self._messages = messages
+
+    def eventType(self) -> int:
+        return self._type
+
+    def __iter__(self):
+        return iter(self._messages)
+
+_auto_cid = itertools.count(1)
+
+class CorrelationId:
+    def __init__(self, value: Any = None):
+        self._value = value if value is not None else ("auto", next(_auto_cid))
+
+    def value(self):
+        return self._value
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CorrelationId) and other._value == self._value
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
+    def __repr__(self) -> str:
+        return f"CorrelationId({self._value!r})"
+
+class Name(str):
+    """Element names are plain strings here."""
+
+class _Def:
+    def __init__(self, name: str):
+        self._name = name
+
+    def name(self) -> Name:
+        return Name(self._name)
+
+def _dtype(v: Any) -> int:
+    if isinstance(v, bool):
+        return DataType.BOOL
+    if isinstance(v, int):
+        return DataType.INT64
+    if isinstance(v, float):
+        return DataType.FLOAT64
+    if isinstance(v, dict):
+        return DataType.SEQUENCE
+    return DataType.STRING
+
+class Element:
+    """
+    Scalar, array or sequence element. Arrays hold values (or Elements for arrays
+    of sequences); sequences hold named sub-elements in insertion order.
+    """
+
+    def __init__(self, name: str, value: Any = None, datatype: Optional[int] = None, array: bool = False):
+        self._name = name
+        self._array = array
+        self._values: List[Any] = []
+        self._children: Dict[str, Element] = {}
+        self._value = None
+        if array:
+            for v in value or []:
+                self._values.append(Element.of(name, v) if isinstance(v, dict) else v)
+            self._type = datatype or (DataType.SEQUENCE if self._values and isinstance(self._values[0], Element) else DataType.STRING)
+        elif isinstance(value, dict):
+            self._type = DataType.SEQUENCE
+            for k, v in value.items():
+                self._children[k] = Element.of(k, v)
+        else:
+            self._value = value
+            self._type = datatype or _dtype(value)
+
+    @staticmethod
+    def of(name: str, v: Any) -> "Element":
+        if isinstance(v, list):
+            return Element(name, v, array=True)
+        return Element(name, v)
+
+    # ---- introspection ----
+    def name(self) -> Name:
+        return Name(self._name)
+
+    def datatype(self) -> int:
+        return self._type
+
+    def isArray(self) -> bool:
+        return self._array
+
+    def isComplexType(self) -> bool:
+        return not self._array and self._type in (DataType.SEQUENCE, DataType.CHOICE)
+
+    def isNull(self) -> bool:
+        return not self._array and self._type != DataType.SEQUENCE and self._value is None
+
+    def numValues(self) -> int:
+        if self._array:
+            return len(self._values)
+        return 0 if self._value is None and self._type != DataType.SEQUENCE else 1
+
+    def numElements(self) -> int:
+        return len(self._children)
+
+    def getElementDefinition(self, i: int) -> _Def:
+        return _Def(list(self._children)[i])
+
+    # ---- sub-elements ----
+    def hasElement(self, name: str, excludeNullElements: bool = False) -> bool:
+        el = self._children.get(str(name))
+        return el is not None and not (excludeNullElements and el.isNull())
+
+    def getElement(self, name) -> "Element":
+        if isinstance(name, int):
+            return list(self._children.values())[name]
+        el = self._children.get(str(name))
+        if el is None:
+            raise KeyError(f"Element '{self._name}' has no sub-element '{name}'")
+        return el
+
+    def getElementAsString(self, name: str) -> str:
+        return self.getElement(name).getValueAsString()
+
+    def getElementAsFloat(self, name: str) -> float:
+        return self.getElement(name).getValueAsFloat64()
+
+    # ---- values ----
+    def _get(self, i: int):
+        if self._array:
+            return self._values[i]
+        if i != 0 or self._value is None:
+            raise IndexError(f"Element '{self._name}' has no value {i}")
+        return self._value
+
+    def getValue(self, i: int = 0):
+        return self._get(i)
+
+    def getValueAsString(self, i: int = 0) -> str:
+        v = self._get(i)
+        if isinstance(v, bool):
+            return "true" if v else "false"
+        return str(v)
+
+    def getValueAsFloat64(self, i: int = 0) -> float:
+        return float(self._get(i))
+
+    def getValueAsInteger(self, i: int = 0) -> int:
+        return int(self._get(i))
+
+    def getValueAsBool(self, i: int = 0) -> bool:
+        v = self._get(i)
+        return v.upper() in ("TRUE", "Y", "YES", "1") if isinstance(v, str) else bool(v)
+
+    def getValueAsElement(self, i: int = 0) -> "Element":
+        v = self._get(i)
+        if not isinstance(v, Element):
+            raise TypeError(f"Element '{self._name}' value {i} is not an element")
+        return v
+
+    # ---- request building ----
+    def setValue(self, value: Any):
+        self._value = value
+        self._type = _dtype(value)
+
+    def appendValue(self, value: Any):
+        self._values.append(value)
+
+    def appendElement(self) -> "Element":
+        el = Element(self._name, {})
+        self._values.append(el)
+        return el
+
+    def setElement(self, name: str, value: Any):
+        self._children[str(name)] = Element(str(name), value)
+        self._type = DataType.SEQUENCE
+
+    def values(self) -> List[Any]:
+        return list(self._values)
+
+    def toPy(self):
+        if self._array:
+            return [v.toPy() if isinstance(v, Element) else v for v in self._values]
+        if self._type == DataType.SEQUENCE:
+            return {k: c.toPy() for k, c in self._children.items()}
+        return self._value
+
+    def toString(self) -> str:
+        return json.dumps({self._name: self.toPy()}, default=str)
+
+    __str__ = toString
+
+# Request schemas: element name -> is array
+_SCHEMAS: Dict[str, Dict[str, bool]] = {
+    "ReferenceDataRequest": {"securities": True, "fields": True, "overrides": True},
+    "StaticMarketDataRequest": {"securities": True, "fields": True, "overrides": True},
+    "BeqsRequest": {"screenName": False, "screenType": False, "Group": False, "overrides": True},
+}
+
+class Request(Element):
+    def __init__(self, service: str, request_type: str):
+        super().__init__(request_type, {})
+        self.service_name = service
+        self.request_type = request_type
+        for name, is_array in _SCHEMAS[request_type].items():
+            self._children[name] = Element(name, [], array=True) if is_array else Element(name, None)
+
+    def overrides(self) -> Dict[str, str]:
+        out = {}
+        for o in self.getElement("overrides").values():
+            out[o.getElementAsString("fieldId")] = o.getElementAsString("value")
+        return out
+
+class Service:
+    _TYPES = {
+        "//blp/refdata": ("ReferenceDataRequest", "BeqsRequest"),
+        "//blp/staticmktdata": ("StaticMarketDataRequest",),
+        "//blp/mktdata": (),
+    }
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def name(self) -> str:
+        return self._name
+
+    def createRequest(self, request_type: str) -> Request:
+        if request_type not in self._TYPES.get(self._name, ()):
+            raise ValueError(f"{self._name} has no operation {request_type}")
+        return Request(self._name, request_type)
+
+class Message(Element):
+    def __init__(self, message_type: str, body: Dict[str, Any], cid: Optional[CorrelationId]):
+        super().__init__(message_type, body)
+        self._cids = [cid] if cid is not None else []
+
+    def messageType(self) -> Name:
+        return self.name()
+
+    def correlationIds(self) -> List[CorrelationId]:
+        return self._cids
+
+class SubscriptionList:
+    def __init__(self):
+        self._items: List[Tuple[str, List[str], CorrelationId]] = []
+
+    def add(self, topic: str, fields=None, options=None, correlationId: Optional[CorrelationId] = None):
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+        self._items.append((topic, list(fields or []), correlationId or CorrelationId()))
+
+    def size(self) -> int:
+        return len(self._items)
+
+class SessionOptions:
+    def __init__(self):
+        self.host, self.port = "localhost", 8194
+
+    def setServerHost(self, host: str):
+        self.host = host
+
+    def setServerPort(self, port: int):
+        self.port = port
+
+# ---------------------------------------------------------------------------
+# Data source: fixtures first, deterministic synthetic values otherwise
+# ---------------------------------------------------------------------------
+
+_SECTORS = ["Information Technology", "Health Care", "Financials", "Industrials", "Energy",
+            "Consumer Discretionary", "Consumer Staples", "Utilities", "Materials",
+            "Communication Services", "Real Estate"]
+_MICS = {"US": "XNAS", "UW": "XNAS", "UQ": "XNAS", "UN": "XNYS", "N": "XNYS", "UA": "ARCX"}
+
+def _h(*parts: str) -> int:
+    return int.from_bytes(hashlib.blake2b("|".join(parts).encode(), digest_size=8).digest(), "big")
+
+@dataclass
+class OfflineConfig:
+    fixtures: Optional[Path] = None
+    synthetic: bool = True
+    latency_ms: float = 40.0
+    per_security_us: float = 200.0
+    page: int = 100
+    universe: int = 10000
+
+    @classmethod
+    def from_env(cls) -> "OfflineConfig":
+        mode = os.getenv("BLP_OFFLINE", "1")
+        fixtures = None if mode.lower() in ("1", "true", "synthetic") else Path(mode)
+        return cls(fixtures=fixtures,
+                   synthetic=os.getenv("BLP_OFFLINE_STRICT", "0") != "1",
+                   latency_ms=float(os.getenv("BLP_OFFLINE_LATENCY_MS", "40")),
+                   per_security_us=float(os.getenv("BLP_OFFLINE_PER_SEC_US", "200")),
+                   page=int(os.getenv("BLP_OFFLINE_PAGE", "100")),
+                   universe=int(os.getenv("BLP_OFFLINE_UNIVERSE", "10000")))
+
+class FixtureData:
+    def __init__(self, cfg: OfflineConfig):
+        self.cfg = cfg
+        self.ref: Dict[str, Dict[str, Any]] = {}
+        self.bulk: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self.beqs: Dict[str, List[str]] = {}
+        d = cfg.fixtures
+        if d is None:
+            return
+        for name in ("refdata.parquet", "refdata.csv"):
+            p = d / name
+            if p.exists():
+                import pandas as pd
+                df = pd.read_parquet(p) if p.suffix == ".parquet" else pd.read_csv(p)
+                for rec in df.to_dict("records"):
+                    sec = rec.pop("security")
+                    self.ref[sec] = {k: (v.item() if hasattr(v, "item") else v)
+                                     for k, v in rec.items() if v == v and v is not None}
+                break
+        if (d / "bulk.json").exists():
+            self.bulk = json.loads((d / "bulk.json").read_text())
+        if (d / "beqs.json").exists():
+            self.beqs = json.loads((d / "beqs.json").read_text())
+
+    def fields(self, security: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Field values for a security, or None if unknown."""
+        fx = self.ref.get(security)
+        if fx is None and not self.cfg.synthetic:
+            return None
+        out: Dict[str, Any] = {}
+        for f in fields:
+            if security in self.bulk and f in self.bulk[security]:
+                out[f] = self.bulk[security][f]
+            elif fx is not None and f in fx:
+                out[f] = fx[f]
+            elif self.cfg.synthetic:
+                v = self._synthetic(security, f)
+                if v is not None:
+                    out[f] = v
+        return out
+
+    def screen(self, name: str) -> List[str]:
+        if name in self.beqs:
+            return list(self.beqs[name])
+        if not self.cfg.synthetic:
+            return []
+        tag = "".join(c for c in name.upper() if c.isalpha())[:3] or "SYN"
+        return [f"{tag}{i:05d} US Equity" for i in range(self.cfg.universe)]
+
+    def _synthetic(self, security: str, f: str) -> Any:
+        parts = security.split()
+        ticker = parts[0]
+        exch = parts[1] if len(parts) > 2 else "US"
+        yellow = parts[-1].upper()
+        h = _h(security, f)
+        u = (h % 1_000_000) / 1_000_000
+        if yellow == "CURNCY":
+            return round(0.5 + u, 5) if f == "PX_LAST" else None
+        px = 5 + (_h(security, "px") % 50_000) / 100
+        if f in ("INDX_MEMBERS", "INDX_MWEIGHT"):
+            return [{"Member Ticker And Exchange Code": f"{ticker[:3]}{i:04d} US"} for i in range(500)]
+        if f == "TICKER":
+            return ticker
+        if f == "EXCH_CODE":
+            return exch
+        if f == "ID_MIC_PRIM_EXCH":
+            return _MICS.get(exch)
+        if f in ("CNTRY_OF_DOMICILE", "COUNTRY_ISO"):
+            return "US"
+        if f in ("SECURITY_NAME", "NAME"):
+            return f"{ticker} Corp"
+        if f in ("GICS_SECTOR_NAME", "INDUSTRY_SECTOR"):
+            return _SECTORS[_h(security, "sector") % len(_SECTORS)]
+        if f == "ID_ISIN":
+            return f"US{_h(security, 'isin') % 10**10:010d}"
+        if f == "ID_RIC":
+            return f"{ticker}.O"
+        if f == "SECURITY_TYP":
+            return "ETP" if _h(security, "etf") % 10 == 0 else "Common Stock"
+        if f == "SECURITY_TYP2":
+            return "ETF" if _h(security, "etf") % 10 == 0 else "Common Stock"
+        if f == "ADR_FLAG":
+            return _h(security, "adr") % 20 == 0
+        if f in ("CRNCY", "QUOTED_CRNCY"):
+            return "USD"
+        if f == "PX_LAST":
+            return round(px, 2)
+        if f in ("BID", "ASK"):
+            half = px * (0.5 + 20 * u) / 20_000
+            return round(px - half if f == "BID" else px + half, 4)
+        if f in ("VOLUME_AVG_30D", "VOLUME_AVG_20D"):
+            return float(10 ** (4 + 3 * u))
+        if f == "EQY_SH_OUT":
+            return round(10 + 5000 * u, 2)
+        if f == "TRADING_STATUS":
+            return "Halted" if h % 997 == 0 else "Trading"
+        if f == "LULD_LOWER_PRICE_BAND":
+            return round(px * 0.95, 2)
+        if f == "LULD_UPPER_PRICE_BAND":
+            return round(px * 1.05, 2)
+        if f == "SHORT_SALE_RESTRICTION":
+            return "Y" if h % 50 == 0 else "N"
+        return None
+
+_data: Optional[FixtureData] = None
+_data_lock = threading.Lock()
+
+def configure(cfg: Optional[OfflineConfig] = None) -> OfflineConfig:
+    """(Re)load fixtures; sessions created afterwards use `cfg` (default: from environment)."""
+    global _data
+    cfg = cfg or OfflineConfig.from_env()
+    with _data_lock:
+        _data = FixtureData(cfg)
+    return cfg
+
+def _source() -> FixtureData:
+    global _data
+    with _data_lock:
+        if _data is None:
+            _data = FixtureData(OfflineConfig.from_env())
+        return _data
+
+# ---------------------------------------------------------------------------
+# Session
+# ---------------------------------------------------------------------------
+
+class Session:
+    """Request/response session; responses are scheduled on a clock and handed out by nextEvent."""
+
+    def __init__(self, options: Optional[SessionOptions] = None, eventHandler=None):
+        self.options = options or SessionOptions()
+        self.data = _source()
+        self.cfg = self.data.cfg
+        self._queue: List[Tuple[float, int, Event]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._services: Dict[str, Service] = {}
+        self._started = False
+        self.requests = 0
+
+    def start(self) -> bool:
+        self._started = True
+        return True
+
+    def stop(self) -> bool:
+        self._started = False
+        return True
+
+    def openService(self, name: str) -> bool:
+        if name not in Service._TYPES:
+            return False
+        self._services[name] = Service(name)
+        return True
+
+    def getService(self, name: str) -> Service:
+        if name not in self._services:
+            raise RuntimeError(f"Service {name} not opened")
+        return self._services[name]
+
+    def sendRequest(self, request: Request, correlationId: Optional[CorrelationId] = None, identity=None) -> CorrelationId:
+        if not self._started:
+            raise RuntimeError("Session not started")
+        cid = correlationId or CorrelationId()
+        self.requests += 1
+        now = time.monotonic()
+        if request.request_type == "BeqsRequest":
+            pages = [self._beqs(request, cid)]
+        else:
+            pages = self._securities(request, cid)
+        t = now + self.cfg.latency_ms / 1000
+        with self._cond:
+            for i, (n, msg) in enumerate(pages):
+                t += n * self.cfg.per_security_us / 1e6
+                et = Event.RESPONSE if i == len(pages) - 1 else Event.PARTIAL_RESPONSE
+                heapq.heappush(self._queue, (t, next(self._seq), Event(et, [msg])))
+            self._cond.notify_all()
+        return cid
+
+    def subscribe(self, subscriptions: SubscriptionList, identity=None):
+        """Initial paint only: one MarketDataEvents message per topic, no subsequent ticks."""
+        if not self._started:
+            raise RuntimeError("Session not started")
+        t = time.monotonic() + self.cfg.latency_ms / 1000
+        with self._cond:
+            for topic, fields, cid in subscriptions._items:
+                sec = topic.split("/ticker/", 1)[-1]
+                vals = self.data.fields(sec, fields)
+                if vals is None:
+                    ev = Event(Event.SUBSCRIPTION_STATUS, [Message("SubscriptionFailure", {"reason": {
+                        "description": "Unknown/Invalid security"}}, cid)])
+                else:
+                    body = {k: v for k, v in vals.items() if v is not None}
+                    ev = Event(Event.SUBSCRIPTION_DATA, [Message("MarketDataEvents", body, cid)])
+                t += self.cfg.per_security_us / 1e6
+                heapq.heappush(self._queue, (t, next(self._seq), ev))
+            self._cond.notify_all()
+
+    def unsubscribe(self, subscriptions: SubscriptionList):
+        pass
+
+    def _securities(self, request: Request, cid: CorrelationId) -> List[Tuple[int, Message]]:
+        secs = request.getElement("securities").values()
+        fields = request.getElement("fields").values()
+        mtype = request.request_type.replace("Request", "Response")
+        pages: List[Tuple[int, Message]] = []
+        page = max(1, self.cfg.page)
+        for start in range(0, max(len(secs), 1), page):
+            rows = []
+            for j, sec in enumerate(secs[start:start + page]):
+                vals = self.data.fields(sec, fields)
+                rec: Dict[str, Any] = {"security": sec, "sequenceNumber": start + j}
+                if vals is None:
+                    rec["securityError"] = {"source": "offline", "code": 15, "category": "BAD_SEC",
+                                            "message": "Unknown/Invalid security"}
+                    rec["fieldData"] = {}
+                else:
+                    rec["fieldData"] = vals
+                rows.append(rec)
+            pages.append((len(rows), Message(mtype, {"securityData": rows}, cid)))
+        return pages
+
+    def _beqs(self, request: Request, cid: CorrelationId) -> Tuple[int, Message]:
+        name = request.getElementAsString("screenName")
+        secs = self.data.screen(name)
+        if not secs:
+            return 0, Message("BeqsResponse", {"responseError": {"message": f"Screen not found: {name}"}}, cid)
+        ovr = request.overrides()
+        start = int(ovr.get("START_POSITION", "0") or 0)
+        size = int(ovr.get("MAX_RESULTS", "3000") or 3000)
+        page = [{"security": s.rsplit(" ", 1)[0], "fieldData": {}} for s in secs[start:start + size]]
+        return len(page), Message("BeqsResponse", {"data": {"securityData": page}}, cid)
+
+    def nextEvent(self, timeout: int = 0) -> Event:
+        """Next due event; waits up to `timeout` ms (0 = forever) before returning a TIMEOUT event."""
+        deadline = None if not timeout else time.monotonic() + timeout / 1000
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._queue and self._queue[0][0] <= now:
+                    return heapq.heappop(self._queue)[2]
+                wake = self._queue[0][0] if self._queue else None
+                if deadline is not None:
+                    if now >= deadline:
+                        return Event(Event.TIMEOUT, [])
+                    wake = deadline if wake is None else min(wake, deadline)
+                self._cond.wait(None if wake is None else max(0.0, wake - now))
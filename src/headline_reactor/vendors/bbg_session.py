@@ -0,0 +1,140 @@
+# src/headline_reactor/vendors/bbg_session.py
+"""Long-lived Bloomberg sessions and opened services, shared by catalog builds and runtime checks."""
+from __future__ import annotations
+import os, atexit, threading, time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from .bbg_api import blpapi
+
+def start_session(host: Optional[str] = None, port: Optional[int] = None):
+    """A started, unpooled session (for long-lived subscriptions that own their event queue)."""
+    if blpapi is None:
+        raise RuntimeError("blpapi not installed")
+    opts = blpapi.SessionOptions()
+    opts.setServerHost(host or os.getenv("BLP_HOST", "localhost"))
+    opts.setServerPort(int(port or os.getenv("BLP_PORT", "8194")))
+    s = blpapi.Session(opts)
+    if not s.start():
+        raise RuntimeError("Failed to start Bloomberg session")
+    return s
+
+class BbgLease:
+    """Exclusive use of one pooled session; services are opened once and cached on it."""
+
+    def __init__(self, session, services: Dict[str, object]):
+        self.session = session
+        self._services = services
+
+    def service(self, name: str, required: bool = True):
+        """Opened service by name (e.g. //blp/refdata); None if not required and unavailable."""
+        if name not in self._services:
+            ok = self.session.openService(name)
+            self._services[name] = self.session.getService(name) if ok else None
+        svc = self._services[name]
+        if svc is None and required:
+            raise RuntimeError(f"Failed to open Bloomberg service: {name}")
+        return svc
+
+class _Slot:
+    __slots__ = ("session", "services", "started_at", "leases")
+
+    def __init__(self, session):
+        self.session = session
+        self.services: Dict[str, object] = {}
+        self.started_at = time.time()
+        self.leases = 0
+
+class BbgSessionPool:
+    """
+    Up to `size` started sessions, leased one caller at a time.
+
+    A session's event queue is drained by whoever holds it, so sessions are
+    never shared concurrently; they are reused across calls instead of being
+    started and stopped per request. A lease that ends in an exception
+    discards its session (it may still have responses in flight).
+    """
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None, size: int = 2):
+        self.host = host or os.getenv("BLP_HOST", "localhost")
+        self.port = int(port or os.getenv("BLP_PORT", "8194"))
+        self.size = size
+        self._idle: List[_Slot] = []
+        self._total = 0
+        self._cond = threading.Condition()
+        self.started = 0
+        self.reused = 0
+
+    def _start(self) -> _Slot:
+        s = start_session(self.host, self.port)
+        self.started += 1
+        return _Slot(s)
+
+    def _acquire(self, timeout: Optional[float]) -> _Slot:
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._idle and self._total >= self.size:
+                left = None if deadline is None else deadline - time.monotonic()
+                if left is not None and left <= 0:
+                    raise TimeoutError("No Bloomberg session available")
+                self._cond.wait(left)
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+            self._total += 1
+        try:
+            return self._start()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, slot: _Slot, broken: bool):
+        with self._cond:
+            if broken:
+                self._total -= 1
+            else:
+                self._idle.append(slot)
+            self._cond.notify()
+        if broken:
+            try:
+                slot.session.stop()
+            except Exception:
+                pass
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[BbgLease]:
+        """Borrow a started session for the duration of the block."""
+        slot = self._acquire(timeout)
+        slot.leases += 1
+        broken = False
+        try:
+            yield BbgLease(slot.session, slot.services)
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            self._release(slot, broken)
+
+    def close(self):
+        """Stop every idle session (leased ones are stopped when returned broken or at exit)."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+        for slot in idle:
+            try:
+                slot.session.stop()
+            except Exception:
+                pass
+
+_pool: Optional[BbgSessionPool] = None
+_lock = threading.Lock()
+
+def get_pool() -> BbgSessionPool:
+    """Process-wide session pool (size from BLP_SESSIONS, default 2)."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = BbgSessionPool(size=int(os.getenv("BLP_SESSIONS", "2")))
+            atexit.register(_pool.close)
+        return _pool
@@ -1,12 +1,10 @@
 from __future__ import annotations
-from typing import List, Dict, Any
+import json, os, threading, time
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 import pandas as pd
-
-try:
-    import blpapi
-except Exception:
-    blpapi = None
+from .bbg_session import get_pool, start_session
+from .bbg_api import blpapi
 
 HALT_FIELDS = [
     # Try several; keep what your entitlement returns
@@ -16,33 +14,20 @@ HALT_FIELDS = [
     "LULD_UPPER_PRICE_BAND",
     "SHORT_SALE_RESTRICTION",    # boolean/flag if available
 ]
-
-def _session():
-    """Create Bloomberg session."""
-    opts = blpapi.SessionOptions()
-    opts.setServerHost("localhost")
-    opts.setServerPort(8194)
-    s = blpapi.Session(opts)
-    if not s.start():
-        raise RuntimeError("BLP session start failed")
-    return s
+STATUS_COLUMNS = ["bbg", "TRADING_STATUS", "LULD_LOWER_PRICE_BAND", "LULD_UPPER_PRICE_BAND", "SHORT_SALE_RESTRICTION"]
 
 def refdata(secs: List[str], fields: List[str]) -> pd.DataFrame:
-    """Get reference/static data for securities."""
+    """Get reference/static data for securities (on a pooled, already-started session)."""
     if blpapi is None:
         return pd.DataFrame()
     
-    s = _session()
-    try:
-        # Try static market data first
-        if s.openService("//blp/staticmktdata"):
-            service = s.getService("//blp/staticmktdata")
+    with get_pool().lease() as bbg:
+        # Try static market data first, fallback to refdata
+        service = bbg.service("//blp/staticmktdata", required=False)
+        if service is not None:
             req = service.createRequest("StaticMarketDataRequest")
         else:
-            # Fallback to refdata
-            if not s.openService("//blp/refdata"):
-                raise RuntimeError("Failed to open refdata service")
-            service = s.getService("//blp/refdata")
+            service = bbg.service("//blp/refdata")
             req = service.createRequest("ReferenceDataRequest")
 
         # Populate request
@@ -55,6 +40,7 @@ def refdata(secs: List[str], fields: List[str]) -> pd.DataFrame:
             e_flds.appendValue(f)
 
         # Send and collect
+        s = bbg.session
         cid = blpapi.CorrelationId()
         s.sendRequest(req, correlationId=cid)
         
@@ -81,13 +67,11 @@ def refdata(secs: List[str], fields: List[str]) -> pd.DataFrame:
                 break
         
         return pd.DataFrame(rows)
-    finally:
-        s.stop()
 
 def status_snapshot(bbg_secs: List[str]) -> pd.DataFrame:
     """Get trading status snapshot for securities (halts, LULD, SSR)."""
     if blpapi is None:  # Degrade gracefully
-        return pd.DataFrame(columns=["bbg", "TRADING_STATUS", "LULD_LOWER_PRICE_BAND", "LULD_UPPER_PRICE_BAND", "SHORT_SALE_RESTRICTION"])
+        return pd.DataFrame(columns=STATUS_COLUMNS)
     
     df = refdata(bbg_secs, HALT_FIELDS)
     
@@ -96,7 +80,7 @@ def status_snapshot(bbg_secs: List[str]) -> pd.DataFrame:
         if c not in df.columns:
             df[c] = None
     
-    return df[["bbg", "TRADING_STATUS", "LULD_LOWER_PRICE_BAND", "LULD_UPPER_PRICE_BAND", "SHORT_SALE_RESTRICTION"]]
+    return df[STATUS_COLUMNS]
 
 def is_halted(status_row: Dict[str, Any]) -> bool:
     """Check if security is currently halted."""
@@ -124,3 +108,232 @@ def has_ssr(status_row: Dict[str, Any]) -> bool:
     # Handle boolean or string representation
     return str(ssr).upper() in ("TRUE", "YES", "1", "Y")
 
+
+# US exchange codes that all read the composite 'US' line
+US_CODES = {"US", "UN", "UW", "UQ", "UA", "UP", "UR", "N", "O", "NYSE", "NASDAQ", "XNYS", "XNAS"}
+
+def status_key(sec: str, exch: Optional[str] = None) -> str:
+    """
+    Table key: ticker plus exchange, so listings don't share a status
+    ('VOD LN Equity' -> 'VOD LN'). A bare ticker takes `exch`, else the US
+    composite ('AAPL' -> 'AAPL US'); US exchange codes fold into 'US'.
+    """
+    parts = sec.split() if sec else []
+    if not parts:
+        return ""
+    code = (parts[1] if len(parts) > 1 and parts[1].upper() != "EQUITY" else exch or "US").upper()
+    return f"{parts[0].upper()} {'US' if code in US_CODES else code}"
+
+class StatusService:
+    """
+    In-memory halt/LULD/SSR table for the active universe.
+
+    Kept current by one market-data subscription (or a local JSONL replay feed
+    standing in for it), so suggestion-time checks are dict reads rather than a
+    refdata round trip. Each update swaps in a new row dict, so readers never
+    take the lock. Symbols with no status read as tradeable.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._session = None
+        self.source: Optional[str] = None
+        self.updates = 0
+        self.updated_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def update(self, sec: str, fields: Dict[str, Any]):
+        """Merge new field values for one security into its row."""
+        key = status_key(sec)
+        vals = {f: fields[f] for f in HALT_FIELDS if fields.get(f) is not None}
+        if not key or not vals:
+            return
+        with self._lock:
+            self._rows[key] = {**self._rows.get(key, {}), **vals}
+            self.updates += 1
+            self.updated_at = time.time()
+
+    def row(self, sec: str, exch: Optional[str] = None) -> Dict[str, Any]:
+        return self._rows.get(status_key(sec, exch), {})
+
+    def halted(self, sec: str, exch: Optional[str] = None) -> bool:
+        r = self._rows.get(status_key(sec, exch))
+        return r is not None and is_halted(r)
+
+    def luld_ok(self, sec: str, px: float, exch: Optional[str] = None) -> bool:
+        """Price inside the LULD bands. Not used by the planner, which only drops halted proxies."""
+        r = self._rows.get(status_key(sec, exch))
+        return r is None or luld_guard(px, r.get("LULD_LOWER_PRICE_BAND"), r.get("LULD_UPPER_PRICE_BAND"))
+
+    def ssr(self, sec: str, exch: Optional[str] = None) -> bool:
+        """Short sale restriction active. Like luld_ok, not consulted by the planner."""
+        r = self._rows.get(status_key(sec, exch))
+        return r is not None and has_ssr(r)
+
+    def seed(self, bbg_secs: List[str]):
+        """Fill the table from one refdata snapshot (e.g. before a subscription's first ticks)."""
+        for rec in status_snapshot(bbg_secs).to_dict("records"):
+            self.update(rec.pop("bbg"), rec)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the initial paint (or the replay backlog) has been applied."""
+        return self._ready.wait(timeout)
+
+    def subscribe(self, bbg_secs: List[str]):
+        """Subscribe once to the status fields on a dedicated session and apply ticks as they arrive."""
+        if blpapi is None:
+            raise RuntimeError("blpapi not installed")
+        session = start_session()
+        subs = blpapi.SubscriptionList()
+        for i, sec in enumerate(bbg_secs):
+            subs.add(f"//blp/mktdata/ticker/{sec}", HALT_FIELDS, "", blpapi.CorrelationId(i))
+        try:
+            session.subscribe(subs)
+        except Exception:
+            session.stop()             # not yet owned by the service: stop() would never reach it
+            raise
+        self._session = session
+        self.source = f"subscription ({len(bbg_secs)} securities)"
+        self._spawn(self._pump, session, list(bbg_secs))
+
+    def _pump(self, session, secs: List[str]):
+        painted = set()                # painted or failed: either way, nothing more to wait for
+        while not self._stop.is_set():
+            ev = session.nextEvent(500)
+            et = ev.eventType()
+            if et == blpapi.Event.SUBSCRIPTION_STATUS:
+                for msg in ev:
+                    if str(msg.messageType()) == "SubscriptionFailure" and msg.correlationIds():
+                        painted.add(msg.correlationIds()[0].value())
+                if len(painted) >= len(secs):
+                    self._ready.set()
+                continue
+            if et != blpapi.Event.SUBSCRIPTION_DATA:
+                continue
+            for msg in ev:
+                idx = msg.correlationIds()[0].value()
+                fields = {}
+                for f in HALT_FIELDS:
+                    if msg.hasElement(f, True):
+                        try:
+                            fields[f] = msg.getElement(f).getValueAsString()
+                        except Exception:
+                            pass
+                self.update(secs[idx], fields)
+                painted.add(idx)
+            if len(painted) >= len(secs):
+                self._ready.set()
+
+    def replay(self, path: Path, speed: float = 0.0, follow: bool = True):
+        """
+        Apply a JSONL feed of {"ts": epoch, "security": ..., <status field>: value} lines.
+
+        speed=0 applies lines as fast as they are read, 1.0 in recorded time;
+        with `follow`, lines appended later keep being applied (like tail -f).
+        """
+        if not path.exists():
+            raise RuntimeError(f"Status replay feed not found: {path}")
+        self.source = f"replay ({path})"
+        self._spawn(self._replay, path, speed, follow)
+
+    def _replay(self, path: Path, speed: float, follow: bool):
+        t0 = w0 = None
+        buf = ""
+        with open(path, encoding="utf-8") as fh:
+            while not self._stop.is_set():
+                buf += fh.readline()
+                if not buf.endswith("\n"):
+                    self._ready.set()  # caught up with the backlog
+                    if not follow:
+                        break
+                    self._stop.wait(0.25)
+                    continue
+                line, buf = buf, ""
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                ts = rec.pop("ts", None)
+                if speed > 0 and ts is not None:
+                    if t0 is None:
+                        t0, w0 = float(ts), time.monotonic()
+                    delay = (float(ts) - t0) / speed - (time.monotonic() - w0)
+                    if delay > 0 and self._stop.wait(delay):
+                        break
+                sec = rec.pop("security", None) or rec.pop("bbg", None)
+                if sec:
+                    self.update(sec, rec)
+
+    def _spawn(self, target, *args):
+        if self.running:
+            raise RuntimeError("Status service already running")
+        self._stop.clear()
+        self._ready.clear()
+        self._thread = threading.Thread(target=target, args=args, name="bbg-status", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._session is not None:
+            try:
+                self._session.stop()
+            except Exception:
+                pass
+            self._session = None
+
+_service: Optional[StatusService] = None
+_service_lock = threading.Lock()
+
+def get_status_service() -> StatusService:
+    """Process-wide status table (empty, and therefore permissive, until started)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = StatusService()
+        return _service
+
+def status_universe(universe: Path, stats: Optional[Path] = None, limit: int = 3000) -> List[str]:
+    """Bloomberg securities to subscribe to: the catalog universe, most liquid first when stats exist."""
+    df = pd.read_parquet(universe, columns=["symbol", "bbg"]).dropna(subset=["bbg"])
+    if stats is not None and stats.exists():
+        adv = pd.read_parquet(stats, columns=["symbol", "adv_usd"]).drop_duplicates("symbol")
+        df = df.merge(adv, on="symbol", how="left").sort_values("adv_usd", ascending=False, na_position="last")
+    return df["bbg"].drop_duplicates().head(limit).tolist()
+
+def start_status_service(cfg: dict) -> Optional[StatusService]:
+    """
+    Start the process-wide table from the `status` config section; None when disabled.
+
+    BLP_STATUS_REPLAY (or `status.replay`) selects a local replay feed instead
+    of a live subscription.
+    """
+    sc = cfg.get("status") or {}
+    if not sc.get("enabled"):
+        return None
+    svc = get_status_service()
+    if svc.running:
+        return svc
+    replay = os.getenv("BLP_STATUS_REPLAY") or sc.get("replay")
+    if replay:
+        svc.replay(Path(replay), speed=float(sc.get("replay_speed", 0)))
+    else:
+        paths = cfg.get("catalog_paths", {})
+        secs = status_universe(Path(sc.get("universe", "catalog/us_universe.parquet")),
+                               Path(paths["stats"]) if paths.get("stats") else None,
+                               int(sc.get("max_securities", 3000)))
+        svc.subscribe(secs)
+    svc.wait_ready(float(sc.get("ready_timeout_sec", 5)))
+    return svc
@@ -0,0 +1,163 @@
+# src/headline_reactor/vendors/orats_async.py
+from __future__ import annotations
+import asyncio, threading, time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+import requests
+from . import orats_http
+from .orats_cache import TwoTierCache, default_cache
+from .orats_client import BASE, TOKEN
+
+ENDPOINTS = {
+    "summaries": "live/one-minute/summaries",
+    "chain": "live/one-minute/strikes/chain",
+    "option": "live/one-minute/strikes/option",
+}
+RETRY_STATUS = (500, 502, 503, 504)
+
+class AsyncOratsClient:
+    """
+    asyncio ORATS client.
+
+    - Requests run on a bounded thread pool over the shared pooled session and
+      rate limiter (`orats_http`), so at most max_connections sockets are busy.
+    - Identical in-flight requests are coalesced: the second caller awaits the
+      first caller's fetch instead of going to the network.
+    - Every call takes an optional `timeout`; a caller that gives up does not
+      cancel the shared fetch, which still lands in the cache for the next caller.
+    """
+
+    def __init__(self, max_connections: int = 8, cache: Optional[TwoTierCache] = None,
+                 retries: int = 4, request_timeout: float = 8.0):
+        assert TOKEN, "Set ORATS_TOKEN environment variable"
+        self.cache = cache or default_cache()
+        self.retries = retries
+        self.request_timeout = request_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="orats-io")
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def _get(self, endpoint: str, params: Dict[str,str], timeout: Optional[float] = None) -> str:
+        """Cached/coalesced GET; raises asyncio.TimeoutError if `timeout` elapses first."""
+        key = self.cache.key(endpoint, params)
+        text = self.cache.get(endpoint, key)
+        if text is not None:
+            return text
+
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._fetch(endpoint, params, key))
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda _f, k=key: self._inflight.pop(k, None))
+        else:
+            self.coalesced += 1
+        # shield: one caller's deadline must not cancel a fetch others are waiting on
+        return await asyncio.wait_for(asyncio.shield(fut), timeout)
+
+    async def _fetch(self, endpoint: str, params: Dict[str,str], key: str) -> str:
+        loop = asyncio.get_running_loop()
+        q = dict(params)
+        q["token"] = TOKEN
+        url = f"{BASE}/{endpoint}"
+        r = None
+        for i in range(self.retries):
+            try:
+                t0 = time.perf_counter()
+                r = await loop.run_in_executor(self._pool, partial(orats_http.get, url, q, self.request_timeout))
+                self.cache.stats.record_fetch((time.perf_counter() - t0) * 1000)
+                if r.status_code == 200:
+                    self.cache.put(endpoint, key, r.text)
+                    return r.text
+                if r.status_code == 429:
+                    continue  # orats_http has throttled the shared limiter
+                if r.status_code in RETRY_STATUS:
+                    await asyncio.sleep(0.3 * (2**i))
+                    continue
+                r.raise_for_status()
+            except requests.exceptions.Timeout:
+                if i < self.retries - 1:
+                    await asyncio.sleep(0.3 * (2**i))
+                    continue
+                raise
+        r.raise_for_status()
+        return r.text
+
+    async def summaries(self, ticker: str, timeout: Optional[float] = None) -> str:
+        return await self._get(ENDPOINTS["summaries"], {"ticker": ticker}, timeout)
+
+    async def chain(self, ticker: str, timeout: Optional[float] = None) -> str:
+        return await self._get(ENDPOINTS["chain"], {"ticker": ticker}, timeout)
+
+    async def option(self, opra: str, timeout: Optional[float] = None) -> str:
+        return await self._get(ENDPOINTS["option"], {"ticker": opra}, timeout)
+
+    async def fetch_many(self, tickers: Iterable[str], kinds: Tuple[str, ...] = ("summaries", "chain"),
+                         budget_ms: Optional[float] = None) -> Dict[Tuple[str, str], Optional[str]]:
+        """
+        Fire every (ticker, kind) request at once and return whatever finished within the budget.
+        Unfinished or failed entries map to None; unfinished fetches keep running and warm the cache.
+        """
+        keys: List[Tuple[str, str]] = [(t, k) for t in dict.fromkeys(tickers) for k in kinds]
+        tasks = {asyncio.ensure_future(self._get(ENDPOINTS[k], {"ticker": t})): (t, k) for t, k in keys}
+        out: Dict[Tuple[str, str], Optional[str]] = {k: None for k in keys}
+        if not tasks:
+            return out
+        done, _pending = await asyncio.wait(tasks, timeout=None if budget_ms is None else budget_ms / 1000)
+        for t in done:
+            if not t.cancelled() and t.exception() is None:
+                out[tasks[t]] = t.result()
+        return out
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+class OratsLoop:
+    """Background event loop so synchronous callers (planner, watch loops) can use the async client."""
+
+    def __init__(self, client: Optional[AsyncOratsClient] = None):
+        self.loop = asyncio.new_event_loop()
+        self._t = threading.Thread(target=self.loop.run_forever, name="orats-loop", daemon=True)
+        self._t.start()
+        self.client = client or AsyncOratsClient()
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the background loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def fetch_many(self, tickers: Iterable[str], kinds: Tuple[str, ...] = ("summaries", "chain"),
+                   budget_ms: float = 250) -> Dict[Tuple[str, str], Optional[str]]:
+        """Blocking batch fetch bounded by `budget_ms`."""
+        tickers = list(dict.fromkeys(tickers))
+        fut = self.submit(self.client.fetch_many(tickers, kinds, budget_ms))
+        try:
+            return fut.result(timeout=budget_ms / 1000 + 0.05)
+        except Exception:
+            fut.cancel()
+            return {(t, k): None for t in tickers for k in kinds}
+
+    def close(self):
+        """Cancel outstanding fetches, then stop the loop thread and the client's I/O pool."""
+        async def _drain():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            self.submit(_drain()).result(timeout=2)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._t.join(timeout=2)
+        self.client.close()
+
+_loop: Optional[OratsLoop] = None
+_loop_lock = threading.Lock()
+
+def get_loop() -> OratsLoop:
+    """Process-wide background ORATS loop (created on first use)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = OratsLoop()
+        return _loop
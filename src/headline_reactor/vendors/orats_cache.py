@@ -0,0 +1,289 @@
+# src/headline_reactor/vendors/orats_cache.py
+from __future__ import annotations
+import os, time, json, hashlib, tempfile, threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CACHE = Path("data/cache/orats")
+
+# Per-endpoint freshness (seconds). Live one-minute data changes every minute;
+# single-option lookups are re-checked more often.
+DEFAULT_TTLS: Dict[str, int] = {
+    "live/one-minute/summaries": 15,
+    "live/one-minute/strikes/chain": 15,
+    "live/one-minute/strikes/option": 5,
+}
+
+@dataclass
+class CacheStats:
+    """Hit/miss/latency counters for the two-tier cache."""
+    mem_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions_mem: int = 0
+    evictions_disk: int = 0
+    fetches: int = 0
+    fetch_ms_total: float = 0.0
+    fetch_ms_max: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        n = self.mem_hits + self.disk_hits + self.misses
+        return (self.mem_hits + self.disk_hits) / n if n else 0.0
+
+    def record_fetch(self, ms: float):
+        self.fetches += 1
+        self.fetch_ms_total += ms
+        self.fetch_ms_max = max(self.fetch_ms_max, ms)
+
+    def snapshot(self) -> Dict[str, float]:
+        d = asdict(self)
+        d["hit_rate"] = self.hit_rate
+        d["fetch_ms_avg"] = self.fetch_ms_total / self.fetches if self.fetches else 0.0
+        return d
+
+class _Entry:
+    __slots__ = ("expires", "text", "parsed")
+
+    def __init__(self, expires: float, text: str):
+        self.expires = expires
+        self.text = text
+        self.parsed: Dict[str, Any] = {}
+
+class MemoryLRU:
+    """Bounded in-memory LRU of responses (raw text plus any parsed forms)."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._d: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str, now: float) -> Optional[_Entry]:
+        with self._lock:
+            e = self._d.get(key)
+            if e is None:
+                return None
+            if e.expires <= now:
+                del self._d[key]
+                return None
+            self._d.move_to_end(key)
+            return e
+
+    def put(self, key: str, text: str, expires: float) -> _Entry:
+        e = _Entry(expires, text)
+        with self._lock:
+            self._d[key] = e
+            self._d.move_to_end(key)
+            while len(self._d) > self.max_entries:
+                self._d.popitem(last=False)
+                self.evictions += 1
+        return e
+
+    def __len__(self) -> int:
+        return len(self._d)
+
+    def clear(self):
+        with self._lock:
+            self._d.clear()
+
+class DiskTier:
+    """
+    Size-capped directory of cached responses with atomic writes and background
+    eviction. Use `disk_tier(root)`: one tier (and one evictor thread) per
+    directory keeps the byte count in step with what is on disk.
+    """
+
+    def __init__(self, root: Path = CACHE, max_bytes: int = 256 * 1024 * 1024, low_water: float = 0.8):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.evictions = 0
+        self._bytes = self._scan_bytes()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._evictor = threading.Thread(target=self._evict_loop, name="orats-cache-evict", daemon=True)
+        self._evictor.start()
+
+    def path(self, key: str) -> Path:
+        return self.root / f"{key}.csv"
+
+    def get(self, key: str, ttl: float, now: float) -> Optional[Tuple[str, float]]:
+        """(text, age_sec) if the file is younger than `ttl`."""
+        p = self.path(key)
+        try:
+            age = now - p.stat().st_mtime
+            if age >= ttl:
+                return None
+            return p.read_text(encoding="utf-8"), age
+        except OSError:
+            return None
+
+    def put(self, key: str, text: str):
+        """Write via temp file + rename so readers never see a partial response."""
+        p = self.path(key)
+        data = text.encode("utf-8")
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp_", suffix=".csv")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                replaced = p.stat().st_size
+            except OSError:
+                replaced = 0
+            os.replace(tmp, p)
+        except OSError:
+            return
+        with self._lock:
+            self._bytes += len(data) - replaced
+            over = self._bytes > self.max_bytes
+        if over:
+            self._wake.set()
+
+    def _scan_bytes(self) -> int:
+        total = 0
+        for p in self.root.glob("*.csv"):
+            try:
+                total += p.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def evict(self):
+        """Delete oldest files until the directory is under the low-water mark."""
+        files = []
+        for p in self.root.glob("*.csv"):
+            try:
+                st = p.stat()
+                files.append((st.st_mtime, st.st_size, p))
+            except OSError:
+                pass
+        files.sort()
+        total = sum(f[1] for f in files)
+        target = int(self.max_bytes * self.low_water)
+        for _, size, p in files:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+                total -= size
+                self.evictions += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._bytes = total
+
+    def _evict_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.evict()
+            except Exception:
+                pass
+
+_tiers: Dict[Path, DiskTier] = {}
+_tiers_lock = threading.Lock()
+
+def disk_tier(root: Path = CACHE, max_bytes: int = 256 * 1024 * 1024) -> DiskTier:
+    """Process-wide disk tier for `root` (the smallest requested cap wins)."""
+    key = Path(root).resolve()
+    with _tiers_lock:
+        tier = _tiers.get(key)
+        if tier is None:
+            tier = _tiers[key] = DiskTier(Path(root), max_bytes)
+        elif max_bytes < tier.max_bytes:
+            tier.max_bytes = max_bytes
+        return tier
+
+class TwoTierCache:
+    """Memory LRU in front of a disk tier, with per-endpoint TTLs."""
+
+    def __init__(self, root: Path = CACHE, default_ttl: int = 15, ttls: Optional[Dict[str, int]] = None,
+                 max_entries: int = 512, max_disk_bytes: int = 256 * 1024 * 1024):
+        self.default_ttl = default_ttl
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.mem = MemoryLRU(max_entries)
+        self.disk = disk_tier(root, max_disk_bytes)
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(endpoint: str, params: Dict[str, str]) -> str:
+        """Stable cache key for an endpoint + params (exclude secrets before calling)."""
+        raw = json.dumps([endpoint, sorted(params.items())], separators=(",", ":"))
+        return f"{endpoint.replace('/', '_')}_{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    def ttl(self, endpoint: str) -> int:
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def _entry(self, endpoint: str, key: str) -> Optional[_Entry]:
+        now = time.time()
+        e = self.mem.get(key, now)
+        if e is not None:
+            self.stats.mem_hits += 1
+            return e
+        ttl = self.ttl(endpoint)
+        hit = self.disk.get(key, ttl, now)
+        if hit is not None:
+            self.stats.disk_hits += 1
+            # Promote with whatever freshness the disk copy has left
+            text, age = hit
+            return self.mem.put(key, text, now + ttl - age)
+        self.stats.misses += 1
+        return None
+
+    def get(self, endpoint: str, key: str) -> Optional[str]:
+        """Cached response text, or None on miss/expiry."""
+        e = self._entry(endpoint, key)
+        self.stats.evictions_mem = self.mem.evictions
+        return None if e is None else e.text
+
+    def put(self, endpoint: str, key: str, text: str):
+        """Store a fresh response in both tiers."""
+        self.mem.put(key, text, time.time() + self.ttl(endpoint))
+        self.disk.put(key, text)
+        self.stats.stores += 1
+        self.stats.evictions_mem = self.mem.evictions
+        self.stats.evictions_disk = self.disk.evictions
+
+    def parsed(self, endpoint: str, key: str, kind: str, parse: Callable[[str], Any]) -> Optional[Any]:
+        """
+        Parsed form of a response already in the memory tier; parses at most
+        once per entry. Callers get a copy (when the value has `.copy()`), so
+        mutating a returned DataFrame never changes the cached one.
+        """
+        e = self.mem.get(key, time.time())
+        if e is None:
+            return None
+        if kind not in e.parsed:
+            e.parsed[kind] = parse(e.text)
+        v = e.parsed[kind]
+        return v.copy() if hasattr(v, "copy") else v
+
+    def snapshot(self) -> Dict[str, float]:
+        """Counters plus current tier sizes."""
+        self.stats.evictions_mem = self.mem.evictions
+        self.stats.evictions_disk = self.disk.evictions
+        d = self.stats.snapshot()
+        d["mem_entries"] = len(self.mem)
+        d["disk_bytes"] = self.disk._bytes
+        return d
+
+    def clear(self):
+        self.mem.clear()
+
+_default: Optional[TwoTierCache] = None
+_default_lock = threading.Lock()
+
+def default_cache() -> TwoTierCache:
+    """Process-wide cache shared by the sync and async ORATS clients."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = TwoTierCache(CACHE)
+        return _default
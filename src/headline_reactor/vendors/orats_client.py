@@ -1,52 +1,61 @@
 # src/headline_reactor/vendors/orats_client.py
 from __future__ import annotations
-import os, time, json, hashlib
+import os, time
+from io import StringIO
 from pathlib import Path
 from typing import Dict, Optional
+import pandas as pd
 import requests
+from . import orats_http
+from .orats_cache import CACHE, DEFAULT_TTLS, TwoTierCache, default_cache
 
 BASE = "https://api.orats.io/datav2"
-CACHE = Path("data/cache/orats")
-CACHE.mkdir(parents=True, exist_ok=True)
 TOKEN = os.getenv("ORATS_TOKEN")
 
 class OratsClient:
-    """Resilient ORATS client with TTL cache and exponential backoff."""
+    """Resilient ORATS client with two-tier (memory + disk) TTL cache, shared rate limiter and backoff."""
     
-    def __init__(self, ttl_sec: int = 15):
+    def __init__(self, ttl_sec: Optional[int] = None, ttls: Optional[Dict[str,int]] = None,
+                 cache: Optional[TwoTierCache] = None):
         assert TOKEN, "Set ORATS_TOKEN environment variable"
-        self.ttl = ttl_sec
-        self.s = requests.Session()
-        self.s.headers.update({"Accept": "text/csv"})
-
-    def _cache_path(self, endpoint: str, params: Dict[str,str]) -> Path:
-        """Generate cache file path from endpoint and params."""
-        key = json.dumps([endpoint, sorted(params.items())], separators=(",",":"))
-        h = hashlib.sha1(key.encode()).hexdigest()
-        return CACHE / f"{endpoint.replace('/','_')}_{h}.csv"
+        if cache is None and ttl_sec is None and not ttls:
+            cache = default_cache()
+        elif cache is None:
+            # An explicit ttl_sec applies to every endpoint; ttls overrides per endpoint
+            per_ep = {ep: ttl_sec for ep in DEFAULT_TTLS} if ttl_sec is not None else {}
+            per_ep.update(ttls or {})
+            cache = TwoTierCache(CACHE, default_ttl=ttl_sec or 15, ttls=per_ep)
+        self.cache = cache
+        self.s = orats_http.session()
 
     def _get(self, endpoint: str, params: Dict[str,str]) -> str:
         """Get data with TTL cache and retry logic."""
+        # Key on the request itself, never on the token
+        key = self.cache.key(endpoint, params)
+        text = self.cache.get(endpoint, key)
+        if text is not None:
+            return text
+        
         params = dict(params)
         params["token"] = TOKEN
         
-        # Check cache first
-        p = self._cache_path(endpoint, params)
-        if p.exists() and (time.time() - p.stat().st_mtime) < self.ttl:
-            return p.read_text()
-        
         # Fetch with retry and exponential backoff for 429/5xx
         url = f"{BASE}/{endpoint}"
         for i in range(4):
             try:
-                r = self.s.get(url, params=params, timeout=8)
+                t0 = time.perf_counter()
+                r = orats_http.get(url, params, timeout=8)
+                self.cache.stats.record_fetch((time.perf_counter() - t0) * 1000)
                 if r.status_code == 200:
                     # Cache successful response
-                    p.write_text(r.text)
+                    self.cache.put(endpoint, key, r.text)
                     return r.text
                 
-                # Retry on rate limit or server errors
-                if r.status_code in (429, 500, 502, 503, 504):
+                # 429: the shared limiter has already paused all ORATS traffic
+                if r.status_code == 429:
+                    continue
+                # Retry on server errors
+                if r.status_code in (500, 502, 503, 504):
                     time.sleep(0.3 * (2**i))
                     continue
                 
@@ -61,6 +70,12 @@ class OratsClient:
         r.raise_for_status()
         return r.text
 
+    def _frame(self, endpoint: str, params: Dict[str,str]) -> pd.DataFrame:
+        """Get data as a DataFrame, parsed once per in-memory cache entry."""
+        text = self._get(endpoint, params)
+        df = self.cache.parsed(endpoint, self.cache.key(endpoint, params), "frame", _read_csv)
+        return df if df is not None else _read_csv(text)
+
     def summaries(self, ticker: str) -> str:
         """Get live one-minute summaries for a ticker."""
         return self._get("live/one-minute/summaries", {"ticker": ticker})
@@ -73,3 +88,13 @@ class OratsClient:
         """Get live one-minute data for a specific option (OPRA code)."""
         return self._get("live/one-minute/strikes/option", {"ticker": opra})
 
+    def summaries_df(self, ticker: str) -> pd.DataFrame:
+        """Summaries as a parsed DataFrame."""
+        return self._frame("live/one-minute/summaries", {"ticker": ticker})
+
+    def chain_df(self, ticker: str) -> pd.DataFrame:
+        """Options chain as a parsed DataFrame."""
+        return self._frame("live/one-minute/strikes/chain", {"ticker": ticker})
+
+def _read_csv(text: str) -> pd.DataFrame:
+    return pd.read_csv(StringIO(text)) if text and text.strip() else pd.DataFrame()
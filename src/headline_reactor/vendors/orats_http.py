@@ -0,0 +1,124 @@
+# src/headline_reactor/vendors/orats_http.py
+"""Process-wide ORATS transport: one pooled Session behind one token-bucket limiter."""
+from __future__ import annotations
+import os, time, threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from ..ops.metrics import metrics
+
+# Vendor limit (requests/minute) and the fraction of it we allow ourselves
+RATE_PER_MIN = float(os.getenv("ORATS_RATE_PER_MIN", "1000"))
+HEADROOM = float(os.getenv("ORATS_RATE_HEADROOM", "0.9"))
+POOL_SIZE = int(os.getenv("ORATS_POOL_SIZE", "16"))
+
+@dataclass
+class LimiterStats:
+    """Wait-time counters for the limiter."""
+    acquired: int = 0
+    waited: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+    throttled: int = 0          # 429s reported back by callers
+
+    def snapshot(self) -> Dict[str, float]:
+        d = asdict(self)
+        d["wait_ms_avg"] = self.wait_ms_total / self.waited if self.waited else 0.0
+        return d
+
+class TokenBucket:
+    """Thread-safe token bucket; `acquire` blocks until a token is available."""
+
+    def __init__(self, rate_per_sec: float, burst: Optional[float] = None):
+        self.rate = rate_per_sec
+        self.capacity = burst if burst is not None else max(1.0, rate_per_sec)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._hold_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = LimiterStats()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _reserve(self, n: float) -> float:
+        """Take `n` tokens (possibly going negative) and return how long to sleep."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= n
+            wait = max(0.0, -self._tokens / self.rate, self._hold_until - now)
+            self.stats.acquired += 1
+            if wait > 0:
+                ms = wait * 1000
+                self.stats.waited += 1
+                self.stats.wait_ms_total += ms
+                self.stats.wait_ms_max = max(self.stats.wait_ms_max, ms)
+            return wait
+
+    def acquire(self, n: float = 1.0) -> float:
+        """Block until `n` tokens are granted; returns seconds waited."""
+        wait = self._reserve(n)
+        if wait > 0:
+            metrics.timing("orats.ratelimit.wait_ms", int(wait * 1000))
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self, n: float = 1.0) -> bool:
+        """Take tokens only if available right now."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._hold_until or self._tokens < n:
+                return False
+            self._tokens -= n
+            self.stats.acquired += 1
+            return True
+
+    def throttle(self, seconds: float):
+        """Vendor said 429: pause every caller for `seconds` and drop accumulated burst."""
+        with self._lock:
+            self._hold_until = max(self._hold_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self.stats.throttled += 1
+        metrics.incr("orats.ratelimit.throttled")
+
+_bucket: Optional[TokenBucket] = None
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+def limiter() -> TokenBucket:
+    """The process-wide ORATS limiter (just under the vendor rate)."""
+    global _bucket
+    with _lock:
+        if _bucket is None:
+            per_sec = RATE_PER_MIN * HEADROOM / 60.0
+            _bucket = TokenBucket(per_sec, burst=max(1.0, per_sec))
+        return _bucket
+
+def session() -> requests.Session:
+    """The process-wide pooled ORATS session."""
+    global _session
+    with _lock:
+        if _session is None:
+            s = requests.Session()
+            s.headers.update({"Accept": "text/csv"})
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, pool_block=True)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+def get(url: str, params: Dict[str, str], timeout: float = 8.0) -> requests.Response:
+    """Rate-limited GET over the shared session; a 429 throttles every other caller too."""
+    limiter().acquire()
+    r = session().get(url, params=params, timeout=timeout)
+    if r.status_code == 429:
+        try:
+            pause = float(r.headers.get("Retry-After", "1"))
+        except ValueError:
+            pause = 1.0
+        limiter().throttle(pause)
+    return r
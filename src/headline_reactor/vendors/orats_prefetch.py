@@ -0,0 +1,168 @@
+# src/headline_reactor/vendors/orats_prefetch.py
+from __future__ import annotations
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future, TimeoutError as FutTimeout
+from typing import Dict, List, Optional
+import requests
+from .orats_store import ChainPartition, ChainStore, get_store
+
+class _Inflight:
+    """One background load, shared by every batch that asked for the ticker while it ran."""
+    __slots__ = ("fut", "refs")
+
+    def __init__(self):
+        self.fut: Optional[Future] = None
+        self.refs = 0
+
+class Prefetcher:
+    """
+    Background fetch + parse of ORATS chains on the shared ORATS event loop
+    (`orats_async.OratsLoop`). The loop's client coalesces identical requests
+    and caches responses; the prefetcher adds per-ticker loads shared across
+    headlines, which are cancelled once no headline wants them.
+    """
+
+    def __init__(self, store: ChainStore, loop=None, max_age_sec: float = 60.0):
+        self.store = store
+        self.loop = loop
+        self.max_age_sec = max_age_sec
+        self._inflight: Dict[str, _Inflight] = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.cancelled = 0
+
+    def snapshot(self) -> Dict[str, float]:
+        """In-flight (queued or running) loads plus lifetime counters, including requests the client coalesced."""
+        with self._lock:
+            inflight = sum(1 for e in self._inflight.values() if not e.fut.done())
+        coalesced = self.loop.client.coalesced if self.loop is not None else 0
+        return {"inflight": inflight, "started": self.started, "cancelled": self.cancelled, "coalesced": coalesced}
+
+    def batch(self) -> "PrefetchBatch":
+        """Prefetches owned by one headline; cancel() when the headline is done or abandoned."""
+        return PrefetchBatch(self)
+
+    def _submit(self, ticker: str) -> Optional[_Inflight]:
+        """Join the in-flight load for the ticker, or start one; the caller holds a reference until `_release`."""
+        if self.loop is None:
+            return None
+        t = ticker.upper()
+        created = False
+        with self._lock:
+            e = self._inflight.get(t)
+            if e is None or e.fut.done():
+                e = self._inflight[t] = _Inflight()
+                e.fut = self.loop.submit(self._load(t, e))
+                self.started += 1
+                created = True
+            e.refs += 1
+        if created:
+            # Registered outside the lock: it runs immediately if the load already finished
+            e.fut.add_done_callback(lambda f, k=t, ent=e: self._forget(k, ent))
+        return e
+
+    def _release(self, e: _Inflight):
+        """Drop one batch's interest; the load is cancelled only when no batch still wants it."""
+        with self._lock:
+            e.refs -= 1
+            if e.refs > 0 or e.fut.done():
+                return
+        # Outside the lock: a successful cancel runs the done callback (_forget) right here
+        if e.fut.cancel():
+            self.cancelled += 1
+
+    def _forget(self, ticker: str, e: _Inflight):
+        with self._lock:
+            if self._inflight.get(ticker) is e:
+                del self._inflight[ticker]
+
+    async def _load(self, ticker: str, e: _Inflight) -> Optional[ChainPartition]:
+        # A cancel that arrived while the load was queued reaches the task only
+        # after its first step, so check before sending anything
+        if e.fut is not None and e.fut.cancelled():
+            return None
+        # Later cancels stop the task at an await: while the request is pending,
+        # or before the parse. The shared HTTP fetch itself is shielded and still
+        # lands in the response cache for the next caller.
+        text = await self.loop.client.chain(ticker)
+        # Parse (and write the parquet partition) off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.store.put_csv, text)
+        return self.store.latest(ticker)
+
+class PrefetchBatch:
+    """Speculative fetches started for a single headline."""
+
+    def __init__(self, pf: Prefetcher):
+        self.pf = pf
+        self.futs: Dict[str, Future] = {}
+        self._held: Dict[str, _Inflight] = {}
+        self.late = 0          # wait budget ran out first: the planner's deadline, not a vendor failure
+        self.timeouts = 0      # ORATS request timeouts (after the client's retries)
+        self.errors = 0        # other ORATS failures: HTTP errors, 429s the client gave up on
+
+    def warm(self, ticker: str):
+        """Start loading a ticker's chain unless a fresh one is loaded or in flight."""
+        t = ticker.upper()
+        if t in self.futs or self.pf.store.fresh(t, self.pf.max_age_sec) is not None:
+            return
+        e = self.pf._submit(t)
+        if e is not None:
+            self.futs[t] = e.fut
+            self._held[t] = e
+
+    def warm_many(self, tickers: List[str]):
+        for t in tickers:
+            self.warm(t)
+
+    def wait(self, ticker: str, timeout: float) -> Optional[ChainPartition]:
+        """
+        Chain for `ticker` no older than the prefetcher's `max_age_sec`, waiting up
+        to `timeout` seconds for an in-flight prefetch; None if nothing fresh is loaded.
+        Only failures of the load itself count as `timeouts`/`errors`.
+        """
+        t = ticker.upper()
+        fut = self.futs.get(t)
+        if fut is not None:
+            try:
+                fut.result(timeout=timeout)
+            except FutTimeout:
+                self.late += 1
+            except CancelledError:
+                pass
+            except requests.exceptions.Timeout:
+                self.timeouts += 1
+            except Exception:
+                self.errors += 1
+        return self.pf.store.fresh(t, self.pf.max_age_sec)
+
+    def cancel(self):
+        """Release this headline's prefetches; each is cancelled once no other headline is waiting on it."""
+        held, self._held = self._held, {}
+        for e in held.values():
+            self.pf._release(e)
+
+    def __enter__(self) -> "PrefetchBatch":
+        return self
+
+    def __exit__(self, *exc):
+        self.cancel()
+
+_prefetcher: Optional[Prefetcher] = None
+_lock = threading.Lock()
+
+def get_prefetcher() -> Prefetcher:
+    """Process-wide prefetcher over the shared chain store and ORATS loop (inert without ORATS_TOKEN)."""
+    global _prefetcher
+    with _lock:
+        if _prefetcher is None:
+            loop = None
+            try:
+                from .orats_client import TOKEN
+                if TOKEN:
+                    from .orats_async import get_loop
+                    loop = get_loop()
+            except Exception:
+                loop = None
+            _prefetcher = Prefetcher(get_store(), loop)
+        return _prefetcher
@@ -0,0 +1,260 @@
+# src/headline_reactor/vendors/orats_store.py
+from __future__ import annotations
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from io import StringIO
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+STORE_ROOT = Path("data/cache/orats/chains")
+
+# ORATS strikes-chain columns we keep, with the dtype they are stored as.
+# One ORATS row carries both the call and the put for an (expiry, strike).
+CHAIN_COLUMNS: Dict[str, str] = {
+    "strike": "float64",
+    "dte": "int32",
+    "stockPrice": "float64",
+    "callBidPrice": "float64",
+    "callAskPrice": "float64",
+    "putBidPrice": "float64",
+    "putAskPrice": "float64",
+    "callOpenInterest": "float64",
+    "putOpenInterest": "float64",
+    "smvVol": "float64",
+    "delta": "float64",          # call delta; put delta = delta - 1
+}
+
+@dataclass
+class OptQuote:
+    """A single listed option picked from a chain."""
+    ticker: str
+    expiry: str          # YYYY-MM-DD
+    strike: float
+    right: str           # "C" or "P"
+    bid: float
+    ask: float
+    delta: float
+    dte: int
+
+    @property
+    def mid(self) -> Optional[float]:
+        """Mid price, or None if either side is missing."""
+        if np.isnan(self.bid) or np.isnan(self.ask) or self.bid <= 0 or self.ask <= 0:
+            return None
+        return 0.5 * (self.bid + self.ask)
+
+@dataclass
+class ChainPartition:
+    """One ticker/trade-date chain held as typed column arrays, sorted by (expiry, strike)."""
+    ticker: str
+    trade_date: str
+    expiry: np.ndarray                      # datetime64[D]
+    cols: Dict[str, np.ndarray]
+    loaded_at: float = field(default_factory=time.time)
+    expiries: np.ndarray = field(init=False)   # sorted unique expiries
+    bounds: np.ndarray = field(init=False)     # row offsets per expiry, len(expiries)+1
+    index: Dict[Tuple[str, float, str], int] = field(init=False)
+
+    def __post_init__(self):
+        self.expiries, starts = np.unique(self.expiry, return_index=True)
+        self.bounds = np.append(starts, len(self.expiry))
+        self.index = {}
+        strikes = self.cols["strike"]
+        exp_str = self.expiry.astype(str).tolist()
+        for i in range(len(strikes)):
+            k = float(strikes[i])
+            self.index[(exp_str[i], k, "C")] = i
+            self.index[(exp_str[i], k, "P")] = i
+
+    def __len__(self) -> int:
+        return len(self.expiry)
+
+    @property
+    def spot(self) -> Optional[float]:
+        """Underlying price reported with the chain."""
+        px = self.cols["stockPrice"]
+        return float(px[0]) if len(px) and not np.isnan(px[0]) else None
+
+    def _quote(self, i: int, right: str) -> OptQuote:
+        c = self.cols
+        if right == "C":
+            bid, ask, delta = c["callBidPrice"][i], c["callAskPrice"][i], c["delta"][i]
+        else:
+            bid, ask, delta = c["putBidPrice"][i], c["putAskPrice"][i], c["delta"][i] - 1.0
+        return OptQuote(self.ticker, str(self.expiry[i]), float(c["strike"][i]), right,
+                        float(bid), float(ask), float(delta), int(c["dte"][i]))
+
+    def quote(self, expiry: str, strike: float, right: str) -> Optional[OptQuote]:
+        """Exact (expiry, strike, right) lookup."""
+        i = self.index.get((expiry, float(strike), right.upper()))
+        return None if i is None else self._quote(i, right.upper())
+
+    def _expiry_slice(self, min_dte: int) -> Optional[slice]:
+        """Rows for the nearest expiry with at least `min_dte` days left."""
+        dte = self.cols["dte"]
+        for j in range(len(self.expiries)):
+            lo, hi = int(self.bounds[j]), int(self.bounds[j + 1])
+            if dte[lo] >= min_dte:
+                return slice(lo, hi)
+        return None
+
+    def atm(self, right: str = "C", min_dte: int = 1) -> Optional[OptQuote]:
+        """Nearest-expiry option whose strike is closest to spot."""
+        spot = self.spot
+        sl = self._expiry_slice(min_dte)
+        if spot is None or sl is None:
+            return None
+        strikes = self.cols["strike"][sl]
+        k = bisect.bisect_left(strikes, spot)
+        cand = [j for j in (k - 1, k) if 0 <= j < len(strikes)]
+        best = min(cand, key=lambda j: abs(strikes[j] - spot))
+        return self._quote(sl.start + best, right.upper())
+
+    def by_delta(self, target: float, right: str = "P", min_dte: int = 1) -> Optional[OptQuote]:
+        """Nearest-expiry option whose |delta| is closest to `target`."""
+        sl = self._expiry_slice(min_dte)
+        if sl is None:
+            return None
+        d = self.cols["delta"][sl]
+        if right.upper() == "P":
+            d = d - 1.0
+        err = np.abs(np.abs(d) - abs(target))
+        if np.isnan(err).all():
+            return None
+        return self._quote(sl.start + int(np.nanargmin(err)), right.upper())
+
+def parse_chain(text: str) -> List[ChainPartition]:
+    """Parse ORATS strikes-chain CSV text into one partition per (ticker, tradeDate)."""
+    if not text or not text.strip():
+        return []
+    df = pd.read_csv(StringIO(text))
+    if df.empty or not {"ticker", "expirDate", "strike"}.issubset(df.columns):
+        return []
+    if "tradeDate" not in df.columns:
+        df["tradeDate"] = pd.Timestamp.now(tz="UTC").strftime("%Y-%m-%d")
+    return _partitions(df)
+
+def _partitions(df: pd.DataFrame) -> List[ChainPartition]:
+    out: List[ChainPartition] = []
+    for (ticker, trade_date), g in df.groupby(["ticker", "tradeDate"], sort=False):
+        g = g.sort_values(["expirDate", "strike"], kind="stable")
+        expiry = pd.to_datetime(g["expirDate"]).to_numpy().astype("datetime64[D]")
+        cols = {}
+        for name, dtype in CHAIN_COLUMNS.items():
+            if name in g.columns:
+                s = pd.to_numeric(g[name], errors="coerce")
+                cols[name] = (s.fillna(0) if dtype.startswith("int") else s).to_numpy(dtype=dtype)
+            else:
+                cols[name] = np.full(len(g), 0 if dtype.startswith("int") else np.nan, dtype=dtype)
+        out.append(ChainPartition(str(ticker).upper(), str(trade_date)[:10], expiry, cols))
+    return out
+
+class ChainStore:
+    """Options chains parsed once and kept by ticker → trade date, with optional parquet partitions on disk."""
+
+    def __init__(self, client=None, root: Optional[Path] = STORE_ROOT, persist: bool = True):
+        self.client = client
+        self.root = root
+        self.persist = persist and root is not None
+        self._parts: Dict[str, Dict[str, ChainPartition]] = {}
+        self._lock = threading.Lock()
+
+    def put_csv(self, text: str) -> List[ChainPartition]:
+        """Parse chain CSV text and add its partitions."""
+        parts = parse_chain(text)
+        for p in parts:
+            self.put(p)
+        return parts
+
+    def put(self, part: ChainPartition):
+        """Add (or replace) a parsed partition."""
+        with self._lock:
+            self._parts.setdefault(part.ticker, {})[part.trade_date] = part
+        if self.persist:
+            self._write(part)
+
+    def latest(self, ticker: str) -> Optional[ChainPartition]:
+        """Most recent in-memory partition for a ticker (never parses or fetches)."""
+        days = self._parts.get(ticker.upper())
+        if not days:
+            return None
+        return days[max(days)]
+
+    def fresh(self, ticker: str, max_age_sec: float) -> Optional[ChainPartition]:
+        """Latest partition if it was loaded within `max_age_sec`."""
+        p = self.latest(ticker)
+        return p if p is not None and time.time() - p.loaded_at < max_age_sec else None
+
+    def partition(self, ticker: str, trade_date: str) -> Optional[ChainPartition]:
+        """Partition for a ticker on a given trade date (memory, then disk)."""
+        p = self._parts.get(ticker.upper(), {}).get(trade_date)
+        if p is None and self.persist:
+            p = self._read(ticker.upper(), trade_date)
+            if p is not None:
+                with self._lock:
+                    self._parts.setdefault(p.ticker, {})[trade_date] = p
+        return p
+
+    def refresh(self, ticker: str) -> Optional[ChainPartition]:
+        """Fetch the live chain for a ticker and load it."""
+        if self.client is None:
+            return None
+        try:
+            self.put_csv(self.client.chain(ticker))
+        except Exception:
+            return None
+        return self.latest(ticker)
+
+    def tickers(self) -> List[str]:
+        return sorted(self._parts)
+
+    def clear(self):
+        with self._lock:
+            self._parts.clear()
+
+    # ---- parquet partitions: <root>/<TICKER>/<tradeDate>.parquet ----
+    def _path(self, ticker: str, trade_date: str) -> Path:
+        return self.root / ticker / f"{trade_date}.parquet"
+
+    def _write(self, part: ChainPartition):
+        try:
+            p = self._path(part.ticker, part.trade_date)
+            p.parent.mkdir(parents=True, exist_ok=True)
+            df = pd.DataFrame({"expirDate": part.expiry, **part.cols})
+            tmp = p.with_suffix(".tmp")
+            df.to_parquet(tmp, index=False)
+            tmp.replace(p)
+        except Exception:
+            pass  # disk partitions are a convenience, never fatal
+
+    def _read(self, ticker: str, trade_date: str) -> Optional[ChainPartition]:
+        p = self._path(ticker, trade_date)
+        if not p.exists():
+            return None
+        try:
+            df = pd.read_parquet(p)
+        except Exception:
+            return None
+        expiry = df["expirDate"].to_numpy().astype("datetime64[D]")
+        cols = {name: df[name].to_numpy(dtype=dtype) for name, dtype in CHAIN_COLUMNS.items() if name in df.columns}
+        return ChainPartition(ticker, trade_date, expiry, cols, loaded_at=p.stat().st_mtime)
+
+_store: Optional[ChainStore] = None
+
+def get_store() -> ChainStore:
+    """Process-wide chain store, backed by `OratsClient` when ORATS_TOKEN is set."""
+    global _store
+    if _store is None:
+        client = None
+        try:
+            from .orats_client import OratsClient, TOKEN
+            if TOKEN:
+                client = OratsClient()
+        except Exception:
+            client = None
+        _store = ChainStore(client=client)
+    return _store
@@ -0,0 +1,7 @@
+# tests/conftest.py
+import os
+
+# Bloomberg code runs against the offline stand-in; must be set before bbg_api is imported
+os.environ.setdefault("BLP_OFFLINE", "1")
+os.environ.setdefault("BLP_OFFLINE_LATENCY_MS", "0")
+os.environ.setdefault("BLP_OFFLINE_PER_SEC_US", "0")
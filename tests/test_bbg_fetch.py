@@ -0,0 +1,69 @@
+# tests/test_bbg_fetch.py
+import json
+import pytest
+from headline_reactor.vendors import bbg_offline
+from headline_reactor.vendors.bbg_fetch import BeqsPager
+
+PAGE = 3000      # the offline service pages BEQS results like the real one
+
+@pytest.fixture
+def screens(tmp_path, monkeypatch):
+    """Offline session serving fixed screens of the given sizes (no synthetic fallback)."""
+    def make(**sizes):
+        beqs = {name: [f"S{i:05d} US Equity" for i in range(n)] for name, n in sizes.items()}
+        (tmp_path / "beqs.json").write_text(json.dumps(beqs))
+        cfg = bbg_offline.OfflineConfig(fixtures=tmp_path, synthetic=False, latency_ms=0, per_security_us=0)
+        monkeypatch.setattr(bbg_offline, "_data", bbg_offline.FixtureData(cfg))
+        sess = bbg_offline.Session()
+        sess.start()
+        sess.openService("//blp/refdata")
+        return sess, sess.getService("//blp/refdata")
+    return make
+
+def test_single_short_page(screens):
+    sess, svc = screens(SMALL=10)
+    res = BeqsPager(sess, svc, window=4).fetch("SMALL")
+    assert res.error is None
+    assert res.securities == [f"S{i:05d} US" for i in range(10)]
+    assert res.pages == 1 and sess.requests == 1
+
+def test_windows_until_short_page(screens):
+    sess, svc = screens(BIG=10000)
+    res = BeqsPager(sess, svc, window=2).fetch("BIG")
+    assert res.error is None
+    assert res.securities == [f"S{i:05d} US" for i in range(10000)]
+    # [0], then [1, 2] full, then [3, 4]: page 3 is short, page 4 speculative and empty
+    assert res.pages == 5
+
+def test_exact_multiple_ends_on_empty_page(screens):
+    sess, svc = screens(EVEN=2 * PAGE)
+    res = BeqsPager(sess, svc, window=4).fetch("EVEN")
+    assert len(res.securities) == 2 * PAGE
+    assert res.pages == 1 + 4        # page 2 comes back empty; 3 and 4 were speculative
+
+def test_max_results_caps_pages(screens):
+    sess, svc = screens(BIG=10000)
+    res = BeqsPager(sess, svc, window=4).fetch("BIG", max_results=2 * PAGE)
+    assert len(res.securities) == 2 * PAGE
+    assert res.pages == 2
+
+def test_response_error_ends_screen(screens):
+    sess, svc = screens(SMALL=10)
+    res = BeqsPager(sess, svc).fetch("MISSING")
+    assert res.securities == []
+    assert res.error == "Screen not found: MISSING"
+
+def test_unanswered_page_times_out(screens, monkeypatch):
+    sess, svc = screens(BIG=10000)
+    send = sess.sendRequest
+
+    def drop_page_two(req, correlationId=None, identity=None):
+        if req.overrides().get("START_POSITION") == str(2 * PAGE):
+            return correlationId
+        return send(req, correlationId=correlationId)
+
+    monkeypatch.setattr(sess, "sendRequest", drop_page_two)
+    res = BeqsPager(sess, svc, window=4, timeout_ms=10, page_timeout_sec=0.2).fetch("BIG")
+    assert res.error == "no response in 0.2s"
+    # Pages before the gap are kept; nothing after it is merged
+    assert len(res.securities) == 2 * PAGE
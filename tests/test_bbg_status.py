@@ -0,0 +1,91 @@
+# tests/test_bbg_status.py
+import json
+import time
+import pytest
+from headline_reactor.vendors import bbg_status
+from headline_reactor.vendors.bbg_status import StatusService, status_key
+
+@pytest.mark.parametrize("sec,exch,key", [
+    ("AAPL UW Equity", None, "AAPL US"),
+    ("AAPL UN", None, "AAPL US"),
+    ("aapl", None, "AAPL US"),
+    ("VOD LN Equity", None, "VOD LN"),
+    ("VOD", "LN", "VOD LN"),
+    ("SAP Equity", "GY", "SAP GY"),
+    ("", None, ""),
+])
+def test_status_key(sec, exch, key):
+    assert status_key(sec, exch) == key
+
+def _feed(path, *recs):
+    with open(path, "a", encoding="utf-8") as fh:
+        for r in recs:
+            fh.write(json.dumps(r) + "\n")
+
+def _until(cond, timeout=5.0):
+    deadline = time.time() + timeout
+    while not cond():
+        assert time.time() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+@pytest.fixture
+def svc():
+    s = StatusService()
+    yield s
+    s.stop()
+
+def test_replay_halt_luld_ssr_transitions(svc, tmp_path):
+    feed = tmp_path / "status.jsonl"
+    _feed(feed,
+          {"ts": 1, "security": "AAPL UW Equity", "TRADING_STATUS": "Trading",
+           "LULD_LOWER_PRICE_BAND": "190", "LULD_UPPER_PRICE_BAND": "210"},
+          {"ts": 2, "security": "VOD LN Equity", "TRADING_STATUS": "Halted"})
+    svc.replay(feed)
+    assert svc.wait_ready(5)
+    assert not svc.halted("AAPL") and svc.halted("VOD", "LN")
+    assert svc.luld_ok("AAPL US Equity", 200) and not svc.luld_ok("AAPL", 185)
+    assert not svc.ssr("AAPL")
+    # Listings don't share a status
+    assert not svc.halted("VOD") and svc.row("VOD") == {}
+
+    updates = svc.updates
+    _feed(feed,
+          {"ts": 3, "security": "AAPL UN Equity", "TRADING_STATUS": "LULD Halt"},
+          {"ts": 4, "security": "AAPL", "SHORT_SALE_RESTRICTION": "Y"},
+          {"ts": 5, "security": "VOD LN Equity", "TRADING_STATUS": "Trading"})
+    _until(lambda: svc.updates >= updates + 3)     # followed like tail -f
+    assert svc.halted("AAPL") and svc.ssr("AAPL") and not svc.halted("VOD", "LN")
+    # Partial ticks merge into the row: the bands survive the status change
+    assert svc.row("AAPL")["LULD_LOWER_PRICE_BAND"] == "190"
+
+def test_unknown_symbol_reads_tradeable(svc):
+    assert not svc.halted("ZZZZ") and svc.luld_ok("ZZZZ", 1.0) and not svc.ssr("ZZZZ")
+
+def test_replay_without_follow_stops_at_end(svc, tmp_path):
+    feed = tmp_path / "status.jsonl"
+    _feed(feed, {"security": "AAPL", "TRADING_STATUS": "Halted"})
+    with open(feed, "a", encoding="utf-8") as fh:
+        fh.write("not json\n")
+    svc.replay(feed, follow=False)
+    svc._thread.join(5)
+    assert not svc.running and svc.halted("AAPL") and svc.updates == 1
+
+def test_missing_feed_raises(svc, tmp_path):
+    with pytest.raises(RuntimeError, match="not found"):
+        svc.replay(tmp_path / "missing.jsonl")
+
+def test_failed_subscribe_stops_session(svc, monkeypatch):
+    class Broken:
+        stopped = False
+
+        def subscribe(self, subs):
+            raise RuntimeError("entitlement refused")
+
+        def stop(self):
+            self.stopped = True
+
+    sess = Broken()
+    monkeypatch.setattr(bbg_status, "start_session", lambda: sess)
+    with pytest.raises(RuntimeError, match="entitlement"):
+        svc.subscribe(["AAPL US Equity"])
+    assert sess.stopped and svc._session is None and not svc.running
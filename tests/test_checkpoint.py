@@ -0,0 +1,71 @@
+# tests/test_checkpoint.py
+import pytest
+from headline_reactor.catalogs.checkpoint import ChunkCheckpoint, RunState, fingerprint
+from headline_reactor.vendors import bbg_offline
+from headline_reactor.vendors.bbg_fetch import PipelinedFetcher, security_rows
+
+SECS = [f"S{i:03d} US Equity" for i in range(10)]
+FIELDS = ["NAME"]
+
+class Crash(Exception):
+    pass
+
+def _session():
+    sess = bbg_offline.Session()
+    sess.start()
+    sess.openService("//blp/refdata")
+    return sess
+
+def _fetch(ckpt, crash_after=None):
+    """Chunked refdata fetch saving each chunk to `ckpt`; raises Crash after `crash_after` saved chunks."""
+    sess = _session()
+    rows = {}
+
+    def done(i):
+        ckpt.save(i, rows.pop(i, []))
+        if crash_after is not None and len(ckpt.done()) >= crash_after:
+            raise Crash()
+
+    f = PipelinedFetcher(sess, sess.getService("//blp/refdata"), "ReferenceDataRequest", chunk=3, concurrency=1)
+    f.run(SECS, FIELDS, lambda i, msg: rows.setdefault(i, []).extend(security_rows(msg, FIELDS, str, key="bbg")),
+          skip=ckpt.done(), on_chunk_done=done)
+    return sess.requests
+
+def test_resumes_mid_step(tmp_path):
+    key = fingerprint("ReferenceDataRequest", SECS, FIELDS, 3)
+    with pytest.raises(Crash):
+        _fetch(ChunkCheckpoint(tmp_path / "refdata", key), crash_after=2)
+
+    ckpt = ChunkCheckpoint(tmp_path / "refdata", key)
+    assert ckpt.done() == {0, 1}
+    assert _fetch(ckpt) == 2                  # only chunks 2 and 3 are requested again
+    assert ckpt.done() == {0, 1, 2, 3}
+    assert ckpt.load()["bbg"].tolist() == SECS
+
+def test_changed_key_starts_over(tmp_path):
+    with pytest.raises(Crash):
+        _fetch(ChunkCheckpoint(tmp_path / "refdata", fingerprint(SECS, 3)), crash_after=1)
+    ckpt = ChunkCheckpoint(tmp_path / "refdata", fingerprint(SECS, 4))
+    assert ckpt.done() == set() and ckpt.load().empty
+    assert not (tmp_path / "refdata").exists()
+
+def test_empty_chunk_is_marked_done(tmp_path):
+    ckpt = ChunkCheckpoint(tmp_path / "c", "k")
+    ckpt.save(0, [])
+    ckpt.save(1, [{"bbg": "A"}])
+    again = ChunkCheckpoint(tmp_path / "c", "k")
+    assert again.done() == {0, 1}
+    assert again.load()["bbg"].tolist() == ["A"]
+
+def test_fingerprint_tracks_inputs():
+    assert fingerprint(SECS, FIELDS) == fingerprint(list(SECS), tuple(FIELDS))
+    assert fingerprint(SECS, FIELDS) != fingerprint(SECS[:-1], FIELDS)
+    assert fingerprint(["ab"], ["c"]) != fingerprint(["a"], ["bc"])
+
+def test_run_state_survives_restart(tmp_path):
+    RunState(tmp_path).mark_done("universe", ["A"])
+    state = RunState(tmp_path)
+    assert state.is_done("universe") and state.value("universe") == ["A"]
+    assert not state.is_done("stats")
+    state.clear()
+    assert not RunState(tmp_path).is_done("universe")
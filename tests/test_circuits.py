@@ -0,0 +1,51 @@
+# tests/test_circuits.py
+from headline_reactor.safety.circuits import Circuit, CircuitState, RollingCounter
+
+def test_rolling_counter_window():
+    r = RollingCounter(60_000)          # 12 buckets of 5s
+    for t in (0, 1_000, 4_999):
+        r.add(t)
+    assert r.count(4_999) == 3
+    r.add(30_000, k=2)
+    assert r.count(59_999) == 5
+    assert r.count(60_000) == 2         # first bucket expired
+    assert r.count(89_999) == 2
+    assert r.count(90_000) == 0
+
+def test_rolling_counter_late_events():
+    r = RollingCounter(60_000)
+    r.add(100_000)
+    r.add(50_000)                       # still inside the window
+    r.add(30_000)                       # older than the window: dropped
+    assert r.count(100_000) == 2
+    assert r.count(110_000) == 1
+
+def test_rolling_counter_long_gap_and_clear():
+    r = RollingCounter(60_000)
+    r.add(0, k=5)
+    r.add(10_000_000)
+    assert r.count(10_000_000) == 1
+    assert sum(r.counts) == r.total == 1
+    r.clear()
+    assert r.count(10_000_000) == 0
+    r.add(10_000_000)
+    assert r.count(10_000_000) == 1
+
+def test_circuit_degrades_and_recovers():
+    c = Circuit(CircuitState(max_timeouts=2))
+    c.record_timeout(1_000, "orats")
+    assert c.next_mode(1_000) == "FULL"
+    c.record_timeout(2_000, "ocr")
+    assert c.next_mode(2_000) == "ETF_ONLY"
+    assert c.reasons(2_000) == "timeouts: ocr=1, orats=1"
+    assert c.counts(2_000)["timeout"] == {"ocr": 1, "orats": 1}
+    assert c.next_mode(61_000) == "FULL"
+    assert c.reasons(61_000) == ""
+
+def test_circuit_reset():
+    c = Circuit(CircuitState(max_errors=1))
+    c.record_error(0, "bbg")
+    assert c.should_degrade(0)
+    c.reset()
+    assert not c.should_degrade(0)
+    assert c.counts(0) == {"error": {}, "timeout": {}, "wide_spread": {}}
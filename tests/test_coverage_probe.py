@@ -0,0 +1,61 @@
+# tests/test_coverage_probe.py
+import pytest
+import us_universe_pipeline as pipe
+from us_universe_pipeline import CoverageProbe, ProbeJournal
+
+FOUND = "ticker,tradeDate,stockPrice\nBRK.B,2026-10-19,480.1\n"
+
+class Resp:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+@pytest.fixture
+def answers(monkeypatch):
+    """ORATS answers by spelling; a missing spelling gets a 404."""
+    table = {}
+
+    def get(url, params, timeout=8.0):
+        a = table.get(params["ticker"], Resp(404))
+        if isinstance(a, Exception):
+            raise a
+        return a
+
+    monkeypatch.setenv("ORATS_TOKEN", "test-token")
+    monkeypatch.setattr(pipe.orats_http, "get", get)
+    return table
+
+def test_found_on_a_later_spelling(answers, tmp_path):
+    answers["BRK.B"] = Resp(200, FOUND)
+    journal = ProbeJournal(tmp_path / "probe.jsonl")
+    row = CoverageProbe(journal).probe("BRK/B")
+    assert (row["orats_ok"], row["orats_symbol"], row["rule"], row["error"]) == (True, "BRK.B", "slash_to_dot", None)
+    assert row["last_checked_utc"]
+    assert [r["symbol"] for r in journal.load()] == ["BRK/B"]
+
+def test_not_found_is_a_clean_answer(answers, tmp_path):
+    answers["ZZZZ"] = Resp(200, "")          # empty body: ORATS has no data for it
+    journal = ProbeJournal(tmp_path / "probe.jsonl")
+    probe = CoverageProbe(journal)
+    for sym in ("ZZZZ", "QQQQ"):             # QQQQ gets a 404
+        row = probe.probe(sym)
+        assert (row["orats_ok"], row["error"]) == (False, None)
+        assert row["last_checked_utc"]
+    assert len(journal.load()) == 2 and probe.errors == 0
+
+@pytest.mark.parametrize("answer", [Resp(401), Resp(403), Resp(400), Resp(429), Resp(503), TimeoutError()])
+def test_failures_are_not_stamped_or_journaled(answers, tmp_path, answer):
+    answers["AAPL"] = answer
+    journal = ProbeJournal(tmp_path / "probe.jsonl")
+    probe = CoverageProbe(journal)
+    row = probe.probe("AAPL")
+    assert row["orats_ok"] is False and row["error"]
+    assert row["last_checked_utc"] is None
+    assert journal.load() == [] and probe.errors == 1
+
+def test_error_on_one_spelling_is_not_a_not_found(answers, tmp_path):
+    answers["BRK/B"] = Resp(401)
+    journal = ProbeJournal(tmp_path / "probe.jsonl")
+    row = CoverageProbe(journal).probe("BRK/B")     # the other spellings 404
+    assert row["error"] == "HTTP 401" and row["last_checked_utc"] is None
+    assert journal.load() == []
@@ -0,0 +1,71 @@
+# tests/test_dag.py
+import threading
+import pytest
+from headline_reactor.catalogs.checkpoint import RunState
+from headline_reactor.catalogs.dag import Dag, Step
+
+class Calls:
+    def __init__(self):
+        self.names = []
+        self._lock = threading.Lock()
+
+    def step(self, name, value=None, fail=False, deps=(), rows=None):
+        def run(ctx):
+            with self._lock:
+                self.names.append(name)
+            if fail:
+                raise RuntimeError(f"{name} broke")
+            return value if value is not None else {d: ctx[d] for d in deps}
+        return Step(name, run, list(deps), rows)
+
+def _pipeline(calls, fail_stats=False):
+    # universe -> secmaster -> stats ; universe -> etfs (independent of secmaster/stats)
+    return [
+        calls.step("universe", value=["A", "B"]),
+        calls.step("secmaster", value="secmaster.parquet", deps=["universe"]),
+        calls.step("stats", fail=fail_stats, deps=["secmaster"]),
+        calls.step("report", deps=["stats"]),
+        calls.step("etfs", value="etfs.parquet", deps=["universe"]),
+    ]
+
+def test_runs_in_dependency_order_and_passes_outputs():
+    calls = Calls()
+    res = Dag(_pipeline(calls)).run()
+    assert {n: r.status for n, r in res.items()} == dict.fromkeys(
+        ["universe", "secmaster", "etfs", "stats", "report"], "ok")
+    order = calls.names
+    assert order.index("universe") < order.index("secmaster") < order.index("stats") < order.index("report")
+    assert order.index("universe") < order.index("etfs")
+
+def test_failed_step_skips_dependents_but_not_independent_steps():
+    calls = Calls()
+    res = Dag(_pipeline(calls, fail_stats=True)).run()
+    assert res["stats"].status == "failed" and res["stats"].error == "RuntimeError: stats broke"
+    assert res["report"].status == "skipped" and res["report"].error == "upstream failed"
+    assert res["etfs"].status == "ok" and res["secmaster"].status == "ok"
+    assert "report" not in calls.names
+
+def test_resume_skips_completed_steps(tmp_path):
+    first = Calls()
+    Dag(_pipeline(first, fail_stats=True), state=RunState(tmp_path / "run")).run()
+    assert sorted(first.names) == ["etfs", "secmaster", "stats", "universe"]
+
+    again = Calls()
+    res = Dag(_pipeline(again), state=RunState(tmp_path / "run")).run()
+    assert sorted(again.names) == ["report", "stats"]
+    assert {n for n, r in res.items() if r.status == "resumed"} == {"universe", "secmaster", "etfs"}
+    assert res["report"].status == "ok"
+    # Resumed outputs are fed to the steps that still had to run
+    assert RunState(tmp_path / "run").value("stats") == {"secmaster": "secmaster.parquet"}
+
+def test_rows_counter_failure_does_not_fail_step():
+    calls = Calls()
+    steps = [calls.step("universe", value=["A"], rows=lambda out: 1 / 0),
+             calls.step("secmaster", value="x", deps=["universe"], rows=lambda out: 7)]
+    res = Dag(steps).run()
+    assert (res["universe"].status, res["universe"].rows) == ("ok", None)
+    assert res["secmaster"].rows == 7
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match="unknown steps"):
+        Dag([Step("a", lambda ctx: 1, ["missing"])])
@@ -0,0 +1,76 @@
+# tests/test_fx.py
+import pytest
+from headline_reactor.catalogs import fx
+from headline_reactor.catalogs.fx import FxCache
+
+class Clock:
+    def __init__(self):
+        self.t = 1_800_000_000.0
+
+    def __call__(self):
+        return self.t
+
+class Fetcher:
+    def __init__(self, rates):
+        self.rates = rates
+        self.calls = []
+
+    def __call__(self, tickers):
+        self.calls.append(list(tickers))
+        return {t.split()[0]: self.rates[t[:3]] for t in tickers if t[:3] in self.rates}
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(fx.time, "time", c)
+    return c
+
+def test_ensure_fetches_missing_pairs_once(tmp_path, clock):
+    fetch = Fetcher({"EUR": 1.1, "JPY": 0.0067})
+    cache = FxCache(tmp_path / "fx.parquet", ttl_hours=1, fetch=fetch)
+    assert cache.ensure(["eur", "USD", "JPY", None]) == {"EURUSD": 1.1, "JPYUSD": 0.0067}
+    assert fetch.calls == [["EURUSD Curncy", "JPYUSD Curncy"]]
+    cache.ensure(["EUR", "JPY"])
+    assert len(fetch.calls) == 1
+
+def test_expired_pairs_are_refetched(tmp_path, clock):
+    fetch = Fetcher({"EUR": 1.1, "GBP": 1.3})
+    cache = FxCache(tmp_path / "fx.parquet", ttl_hours=1, fetch=fetch)
+    cache.ensure(["EUR"])
+    clock.t += 1800
+    cache.ensure(["GBP"])
+    assert cache.stale(["EUR", "GBP"]) == []
+    clock.t += 1800
+    assert cache.stale(["EUR", "GBP"]) == ["EUR"]
+    fetch.rates["EUR"] = 1.2
+    assert cache.ensure(["EUR", "GBP"]) == {"EURUSD": 1.2, "GBPUSD": 1.3}
+    assert fetch.calls[-1] == ["EURUSD Curncy"]
+
+def test_stale_rate_kept_when_refresh_fails(tmp_path, clock):
+    fetch = Fetcher({"EUR": 1.1})
+    cache = FxCache(tmp_path / "fx.parquet", ttl_hours=1, fetch=fetch)
+    cache.ensure(["EUR"])
+    clock.t += 7200
+    fetch.rates = {}
+    assert cache.ensure(["EUR"]) == {"EURUSD": 1.1}
+    assert cache.stale(["EUR"]) == ["EUR"]
+
+def test_lookups_never_fetch(tmp_path, clock):
+    fetch = Fetcher({"EUR": 1.25})
+    cache = FxCache(tmp_path / "fx.parquet", fetch=fetch)
+    assert cache.rate("EUR") is None and cache.to_usd(10, "EUR") is None
+    assert cache.rate("USD") == 1.0 and cache.rate(None) == 1.0
+    assert fetch.calls == []
+    cache.ensure(["EUR"])
+    assert cache.to_usd(10, "eur") == 12.5
+    assert cache.from_usd(12.5, "EUR") == pytest.approx(10)
+
+def test_rates_persist_with_fetch_time(tmp_path, clock):
+    path = tmp_path / "fx.parquet"
+    FxCache(path, ttl_hours=1, fetch=Fetcher({"CHF": 1.15})).ensure(["CHF"])
+    clock.t += 1800
+    reloaded = FxCache(path, ttl_hours=1)
+    assert reloaded.rate("CHF") == 1.15
+    assert reloaded.stale(["CHF"]) == []
+    clock.t += 1800
+    assert reloaded.stale(["CHF"]) == ["CHF"]
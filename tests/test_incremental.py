@@ -0,0 +1,113 @@
+# tests/test_incremental.py
+from datetime import datetime, timezone
+from pathlib import Path
+import pandas as pd
+import pytest
+from headline_reactor.catalogs import incremental
+from headline_reactor.catalogs.incremental import (REFRESH_COL, UniverseDiff, catalog_version, diff_universe,
+                                                   merge_refresh, write_versioned)
+
+def _catalog():
+    return pd.DataFrame({
+        "bbg": ["A US Equity", "B US Equity", "C US Equity", "D US Equity"],
+        "px": [1.0, 2.0, 3.0, 4.0],
+        REFRESH_COL: ["2026-10-03T00:00:00", "2026-10-01T00:00:00", None, "2026-10-02T00:00:00"],
+    })
+
+def test_diff_without_catalog_fetches_everything():
+    d = diff_universe(["A", "B", "A"], None)
+    assert (d.added, d.removed, d.kept, d.stale) == (["A", "B"], [], [], [])
+    assert diff_universe(["A"], pd.DataFrame()).added == ["A"]
+
+def test_diff_added_removed_kept():
+    secs = ["E US Equity", "A US Equity", "B US Equity", "C US Equity"]
+    d = diff_universe(secs, _catalog(), stale_fraction=0)
+    assert d.added == ["E US Equity"]
+    assert d.removed == ["D US Equity"]
+    assert d.kept == ["A US Equity", "B US Equity", "C US Equity"]
+    assert d.stale == []
+    assert d.to_fetch == ["E US Equity"]
+
+def test_diff_refetches_oldest_kept_rows_first():
+    secs = ["A US Equity", "B US Equity", "C US Equity", "D US Equity"]
+    # Never-refreshed rows sort first, then oldest timestamps
+    assert diff_universe(secs, _catalog(), stale_fraction=0.5).stale == ["C US Equity", "B US Equity"]
+    # ceil(4 * 0.05) = 1, min_stale raises it, and it is capped at the kept count
+    assert diff_universe(secs, _catalog()).stale == ["C US Equity"]
+    assert len(diff_universe(secs, _catalog(), min_stale=10).stale) == 4
+
+def test_diff_stale_without_refresh_column():
+    cat = _catalog().drop(columns=[REFRESH_COL])
+    d = diff_universe(["B US Equity", "A US Equity"], cat, stale_fraction=0.5)
+    assert d.stale == ["A US Equity"]
+
+def test_merge_replaces_refetched_and_drops_removed():
+    secs = ["E US Equity", "A US Equity", "B US Equity", "C US Equity"]
+    cat = _catalog()
+    d = UniverseDiff(added=["E US Equity"], removed=["D US Equity"],
+                     kept=["A US Equity", "B US Equity", "C US Equity"], stale=["C US Equity"])
+    fresh = pd.DataFrame({"bbg": ["C US Equity", "E US Equity"], "px": [30.0, 5.0]})
+    out = merge_refresh(cat, fresh, d, secs)
+    assert out["bbg"].tolist() == secs
+    assert out["px"].tolist() == [5.0, 1.0, 2.0, 30.0]
+    stamped = out.set_index("bbg")[REFRESH_COL]
+    assert stamped["A US Equity"] == "2026-10-03T00:00:00"
+    assert stamped["C US Equity"] == stamped["E US Equity"]
+    assert stamped["C US Equity"] > "2026-10-03T00:00:00"
+    assert REFRESH_COL not in fresh.columns
+
+def test_merge_without_catalog_orders_fresh_rows():
+    fresh = pd.DataFrame({"bbg": ["B", "A", "X"], "px": [2.0, 1.0, 9.0]})
+    out = merge_refresh(None, fresh, diff_universe(["A", "B"], None), ["A", "B"])
+    assert out["bbg"].tolist() == ["A", "B"]
+    assert out.index.tolist() == [0, 1]
+
+class FrozenClock:
+    """Stands in for incremental.datetime so several writes land in the same microsecond."""
+    t = datetime(2026, 10, 19, 14, 30, 0, 123456, tzinfo=timezone.utc)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.t
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(incremental, "datetime", FrozenClock)
+    yield FrozenClock
+    FrozenClock.t = datetime(2026, 10, 19, 14, 30, 0, 123456, tzinfo=timezone.utc)
+
+def _versions(path):
+    return sorted(p.name for p in (path.parent / "versions").glob("*.parquet"))
+
+def test_writes_in_the_same_microsecond_keep_both(tmp_path, clock):
+    path = tmp_path / "secmaster.parquet"
+    v1 = write_versioned(pd.DataFrame({"bbg": ["A"]}), path)
+    v2 = write_versioned(pd.DataFrame({"bbg": ["A", "B"]}), path)
+    assert (v1, v2) == ("20261019T143000123456Z", "20261019T143000123456Z-1")
+    assert _versions(path) == ["secmaster.20261019T143000123456Z-1.parquet", "secmaster.20261019T143000123456Z.parquet"]
+    assert catalog_version(path) == v2
+    assert pd.read_parquet(path)["bbg"].tolist() == ["A", "B"]
+
+def test_pruning_removes_the_oldest_versions(tmp_path, clock):
+    path = tmp_path / "secmaster.parquet"
+    written = []
+    for i in range(3):                       # same microsecond: Z, Z-1, Z-2
+        written.append(write_versioned(pd.DataFrame({"n": [i]}), path, keep=2))
+    assert sorted(_versions(path)) == sorted(f"secmaster.{v}.parquet" for v in written[1:])
+    clock.t = clock.t.replace(microsecond=123457)
+    written.append(write_versioned(pd.DataFrame({"n": [3]}), path, keep=2))
+    assert sorted(_versions(path)) == sorted(f"secmaster.{v}.parquet" for v in written[2:])
+    assert catalog_version(path) == written[-1]
+    assert pd.read_parquet(path)["n"].tolist() == [3]
+
+def test_version_order_handles_older_stamps():
+    def key(name):
+        return incremental._version_order("secmaster", Path("versions") / name)
+
+    # Second-precision stamps from before microseconds were added sort by their time too
+    names = ["secmaster.20261019T143000123456Z-1.parquet", "secmaster.20261019T143001Z.parquet",
+             "secmaster.20261019T143000123456Z.parquet", "secmaster.20261019T142959Z.parquet"]
+    assert sorted(names, key=key) == ["secmaster.20261019T142959Z.parquet",
+                                      "secmaster.20261019T143000123456Z.parquet",
+                                      "secmaster.20261019T143000123456Z-1.parquet",
+                                      "secmaster.20261019T143001Z.parquet"]
@@ -0,0 +1,53 @@
+# tests/test_latency.py
+import json
+import pytest
+from headline_reactor.ops import latency
+from headline_reactor.ops.latency import FrameTrace, LatencyLog
+
+def _session(path, rows):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows) + "not json\n", encoding="utf-8")
+    return path
+
+@pytest.fixture
+def logs(tmp_path):
+    # ocr: 10..100 ms, plan: 1..10 ms, e2e their sum; string fields are ignored
+    rows = [{"ts": 1_700_000_000 + i, "hash": f"h{i}", "label": "ma_confirmed",
+             "ocr_ms": 10.0 * i, "plan_ms": float(i), "e2e_ms": 11.0 * i} for i in range(1, 11)]
+    return [_session(tmp_path / "session-20261019-090000.jsonl", rows[:6]),
+            _session(tmp_path / "session-20261019-100000.jsonl", rows[6:])]
+
+def test_per_stage_percentiles(logs):
+    stats = latency.percentiles(latency.load(logs))
+    assert set(stats) == {"ocr", "plan", "e2e"}
+    ocr = stats["ocr"]
+    assert ocr["count"] == 10 and ocr["mean"] == 55.0 and ocr["max"] == 100.0
+    assert ocr["p50"] == 55.0 and ocr["p90"] == pytest.approx(91.0) and ocr["p99"] == pytest.approx(99.1)
+    assert stats["plan"]["p50"] == 5.5 and stats["e2e"]["max"] == 110.0
+
+def test_report_lists_stages_with_e2e_last(logs):
+    lines = latency.report(logs)
+    assert lines[0].split()[:2] == ["stage", "count"]
+    assert [l.split()[0] for l in lines[1:]] == ["ocr", "plan", "e2e"]
+    assert lines[1].split()[1:4] == ["10", "55.0", "55.0"]
+
+def test_log_round_trip(tmp_path):
+    tr = FrameTrace()
+    tr.mark("ocr")
+    tr.mark("plan")
+    tr.mark("ocr")                        # a repeated stage adds up
+    log = LatencyLog(tmp_path)
+    b = log.record(tr, hash="abc")
+    log.close()
+    assert set(b) == {"ocr_ms", "plan_ms", "e2e_ms"}
+    assert b["e2e_ms"] == pytest.approx(b["ocr_ms"] + b["plan_ms"], abs=0.01)
+    (row,) = latency.load([log.path])
+    assert row["hash"] == "abc" and row["e2e_ms"] == b["e2e_ms"]
+    assert latency.latest(tmp_path) == log.path
+
+def test_latency_report_command(logs):
+    cli = pytest.importorskip("headline_reactor.cli")
+    from typer.testing import CliRunner
+    res = CliRunner().invoke(cli.app, ["latency-report", str(logs[0].parent)])
+    assert res.exit_code == 0, res.output
+    assert res.output.splitlines()[0] == "2 session log(s)"
+    assert res.output.splitlines()[-1].split()[:2] == ["e2e", "10"]
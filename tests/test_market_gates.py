@@ -0,0 +1,42 @@
+# tests/test_market_gates.py
+from datetime import datetime, timezone
+import pytest
+from headline_reactor.safety.market_gates import ET, USMarketCalendar
+
+@pytest.fixture(scope="module")
+def cal():
+    return USMarketCalendar(2026)
+
+def _et(*args):
+    return ET.localize(datetime(*args))
+
+def test_regular_session(cal):
+    info = cal.session_info(_et(2026, 10, 19, 15, 30))
+    assert (info.is_open, info.minutes_to_close, info.reason) == (True, 30, "open")
+    assert cal.session_info(_et(2026, 10, 19, 8, 0)).reason == "pre-open"
+    assert cal.session_info(_et(2026, 10, 19, 8, 0)).minutes_to_close == 390
+    assert cal.session_info(_et(2026, 10, 19, 16, 1)).reason == "post-close"
+
+def test_early_close_day_after_thanksgiving(cal):
+    info = cal.session_info(_et(2026, 11, 27, 12, 0))
+    assert (info.is_open, info.minutes_to_close) == (True, 60)
+    assert cal.session_info(_et(2026, 11, 27, 8, 0)).minutes_to_close == 210
+    assert not cal.is_market_open(_et(2026, 11, 27, 13, 30))
+    assert cal.session_info(_et(2026, 11, 27, 13, 30)).reason == "post-close"
+
+def test_holidays_and_weekends(cal):
+    for when in (_et(2026, 11, 26, 11, 0), _et(2026, 12, 25, 11, 0), _et(2026, 10, 17, 11, 0)):
+        info = cal.session_info(when)
+        assert (info.is_open, info.reason) == (False, "holiday/closed")
+
+def test_naive_and_utc_inputs(cal):
+    assert cal.is_market_open(datetime(2026, 12, 24, 12, 59))          # naive = ET, early close at 13:00
+    assert not cal.is_market_open(datetime(2026, 12, 24, 13, 1))
+    assert cal.is_market_open(datetime(2026, 10, 19, 14, 0, tzinfo=timezone.utc))   # 10:00 ET
+    assert not cal.is_market_open(datetime(2026, 10, 19, 13, 0, tzinfo=timezone.utc))
+
+def test_rolls_into_next_year():
+    cal = USMarketCalendar(2026)
+    assert cal.session_info(_et(2027, 1, 1, 11, 0)).reason == "holiday/closed"
+    assert cal.is_market_open(_et(2027, 1, 4, 11, 0))
+    assert cal._sched[0] == 2027
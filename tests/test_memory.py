@@ -0,0 +1,68 @@
+# tests/test_memory.py
+import tracemalloc
+import pytest
+from headline_reactor.ops.memory import MemoryTelemetry
+from headline_reactor.ops.metrics import registry
+
+@pytest.fixture
+def mem():
+    assert not tracemalloc.is_tracing()
+    m = MemoryTelemetry(interval_s=3600)          # samples only when the test asks
+    yield m
+    m.stop()
+
+def test_sample_publishes_gauges_and_sizes(mem):
+    seen = {"a", "b"}
+    mem.size("watch.seen", lambda: len(seen))
+    mem.size("broken", lambda: None.mem)          # a size that can't be read is skipped
+    mem.start()
+    seen.add("c")
+    vals = mem.sample()
+    assert mem.samples == 2 and vals["rss_mb"] > 0 and "traced_mb" in vals
+    assert vals["size.watch.seen"] == 3 and "size.broken" not in vals
+    assert registry.gauges["mem.size.watch.seen"] == 3
+    assert mem.first["size.watch.seen"] == 2
+    assert mem.summary().startswith("rss ")
+
+def grow(keep):
+    keep.extend(bytearray(4096) for _ in range(500))
+
+def test_growth_reports_allocation_site(mem):
+    keep = []
+    mem.start()
+    grow(keep)
+    mem.sample()
+    site, size, count = mem.growth()[0]
+    assert site.startswith("test_memory.py:") and size >= 500 * 4096 and count >= 500
+    assert any(k.startswith("mem.alloc_growth_bytes") for k in registry.collect())
+
+def test_stop_unregisters_and_keeps_final_growth(mem):
+    keep = []
+    mem.start()
+    assert mem._collect in registry.collectors
+    grow(keep)
+    mem.stop()
+    assert not tracemalloc.is_tracing() and mem._thread is None
+    assert mem._collect not in registry.collectors
+    assert not any(k.startswith("mem.alloc_growth_bytes") for k in registry.collect())
+    assert mem.growth()[0][0].startswith("test_memory.py:")     # the final diff survives stop()
+    mem.stop()                                                   # idempotent
+
+def test_does_not_stop_tracing_it_did_not_start(mem):
+    tracemalloc.start()
+    try:
+        mem.start()
+        mem.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+def test_watch_telemetry_does_not_build_orats_cache(monkeypatch):
+    cli = pytest.importorskip("headline_reactor.cli")
+    from headline_reactor.vendors import orats_cache
+    monkeypatch.setattr(orats_cache, "_default", None)
+    mem = cli._start_memory(3600, set())
+    try:
+        assert orats_cache._default is None and "size.orats.mem_entries" not in mem.last
+    finally:
+        mem.stop()
@@ -0,0 +1,94 @@
+# tests/test_metrics.py
+import random
+import socket
+import pytest
+from headline_reactor.ops.metrics import N_BUCKETS, SUB, Histogram, Registry, Statsd, _index, _upper
+
+def test_small_values_are_exact():
+    for v in range(SUB):
+        assert _index(v) == v and _upper(v) == v
+    assert _index(-5) == 0
+
+def test_buckets_cover_values_in_order():
+    rng = random.Random(7)
+    values = list(range(SUB, 5000)) + [rng.randrange(1, 2**43) for _ in range(5000)]
+    for v in values:
+        i = _index(v)
+        assert _upper(i - 1) < v <= _upper(i)
+        assert (_upper(i) - v) / v <= 1 / SUB        # within one sub-bucket
+    assert [_index(_upper(i)) for i in range(N_BUCKETS)] == list(range(N_BUCKETS))
+
+def test_values_past_range_clamp_to_last_bucket():
+    assert _index(2**50) == N_BUCKETS - 1
+
+def test_percentiles():
+    h = Histogram()
+    assert h.percentile(50) == 0 and h.snapshot() == {"count": 0}
+    for ms in range(1, 101):
+        h.record(ms * 1_000_000)
+    assert h.n == 100 and h.min_ns == 1_000_000 and h.max_ns == 100_000_000
+    assert h.percentile(50) == pytest.approx(50_000_000, rel=1 / SUB)
+    assert h.percentile(99) == pytest.approx(99_000_000, rel=1 / SUB)
+    assert h.percentile(100) == h.max_ns       # never reports past the largest sample
+    assert h.percentile(0) == pytest.approx(1_000_000, rel=1 / SUB)
+
+def test_snapshot_in_ms():
+    h = Histogram()
+    for ns in (1_000_000, 3_000_000):
+        h.record(ns)
+    snap = h.snapshot()
+    assert snap["count"] == 2 and snap["mean_ms"] == 2.0 and snap["max_ms"] == 3.0
+    assert snap["p50_ms"] == pytest.approx(1.0, rel=1 / SUB)
+
+def test_registry_collect_merges_collectors():
+    reg = Registry()
+    reg.set("queue.depth", 3)
+    reg.collector(lambda: {"cache.hit_rate": 0.5})
+    reg.collector(lambda: 1 / 0)                # a failing collector is skipped
+    assert reg.collect() == {"queue.depth": 3, "cache.hit_rate": 0.5}
+    assert reg.histogram("x") is reg.histogram("x")
+    fn = reg.collector(lambda: {"extra": 1})
+    reg.remove_collector(fn)
+    reg.remove_collector(fn)                    # already gone: no-op
+    assert "extra" not in reg.collect() and len(reg.collectors) == 2
+
+@pytest.fixture
+def udp():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1)
+    yield sock
+    sock.close()
+
+def _statsd(udp, **kw):
+    return Statsd(port=udp.getsockname()[1], ns="t", enabled=True, flush_ms=3_600_000, **kw)
+
+def test_statsd_aggregates_until_flush(udp):
+    s = _statsd(udp)
+    try:
+        s.incr("hits")
+        s.incr("hits", 2)
+        s.gauge("depth", 4)
+        s.gauge("depth", 7)
+        s.timing("lat", 1.5)
+        s.timing("lat", 2.5)
+        assert s.packets == 0
+        s.flush()
+        assert udp.recv(2048).decode().split("\n") == ["t.hits:3|c", "t.depth:7|g", "t.lat:1.5|ms", "t.lat:2.5|ms"]
+        s.flush()
+        assert s.packets == 1               # nothing left to send
+    finally:
+        s.close()
+
+def test_statsd_splits_packets(udp):
+    s = _statsd(udp, max_packet=40, max_timings=5)
+    try:
+        for i in range(8):
+            s.timing("lat", i)
+        assert s.dropped == 3
+        s.flush()
+        packets = [udp.recv(2048).decode() for _ in range(s.packets)]
+        assert all(len(p) <= 40 for p in packets) and len(packets) > 1
+        assert "\n".join(packets).split("\n") == [f"t.lat:{i}|ms" for i in range(5)]
+    finally:
+        s.close()
@@ -0,0 +1,96 @@
+# tests/test_orats_async.py
+import threading
+import time
+from collections import Counter
+import pytest
+import requests
+from headline_reactor.vendors import orats_async
+from headline_reactor.vendors.orats_async import AsyncOratsClient, OratsLoop
+from headline_reactor.vendors.orats_cache import TwoTierCache
+
+class Resp:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+class FakeHttp:
+    """Stands in for orats_http.get: per-ticker delay, status and call counts."""
+
+    def __init__(self):
+        self.delay = {}
+        self.status = {}
+        self.calls = Counter()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, url, params, timeout=8.0):
+        t = params["ticker"]
+        kind = url.rsplit("/", 1)[-1]
+        self.calls[(t, kind)] += 1
+        self.release.wait(5)
+        time.sleep(self.delay.get(t, 0.0))
+        status = self.status.get(t, 200)
+        return Resp(status, f"{kind},{t}\n1,2\n" if status == 200 else "")
+
+@pytest.fixture
+def http(monkeypatch):
+    fake = FakeHttp()
+    monkeypatch.setattr(orats_async, "TOKEN", "test-token")
+    monkeypatch.setattr(orats_async.orats_http, "get", fake)
+    return fake
+
+@pytest.fixture
+def oloop(http, tmp_path):
+    client = AsyncOratsClient(max_connections=4, cache=TwoTierCache(tmp_path), retries=2)
+    loop = OratsLoop(client)
+    yield loop
+    loop.close()
+
+def test_identical_requests_are_coalesced(oloop, http):
+    http.release.clear()
+    futs = [oloop.submit(oloop.client.chain("AAPL")) for _ in range(3)]
+    time.sleep(0.1)
+    http.release.set()
+    assert {f.result(timeout=5) for f in futs} == {"chain,AAPL\n1,2\n"}
+    assert http.calls[("AAPL", "chain")] == 1
+    assert oloop.client.coalesced == 2
+    # Later callers are served from the cache
+    assert oloop.submit(oloop.client.chain("AAPL")).result(timeout=5) == "chain,AAPL\n1,2\n"
+    assert http.calls[("AAPL", "chain")] == 1
+
+def test_caller_timeout_does_not_cancel_shared_fetch(oloop, http):
+    http.delay["SLOW"] = 0.3
+    with pytest.raises(Exception):
+        oloop.submit(oloop.client.chain("SLOW", timeout=0.05)).result(timeout=5)
+    # The fetch kept running and lands in the cache for the next caller
+    deadline = time.time() + 5
+    while oloop.client.cache.get(orats_async.ENDPOINTS["chain"],
+                                 oloop.client.cache.key(orats_async.ENDPOINTS["chain"], {"ticker": "SLOW"})) is None:
+        assert time.time() < deadline
+        time.sleep(0.02)
+    assert oloop.submit(oloop.client.chain("SLOW")).result(timeout=5) == "chain,SLOW\n1,2\n"
+    assert http.calls[("SLOW", "chain")] == 1
+
+def test_fetch_many_returns_what_finished_within_budget(oloop, http):
+    http.delay["SLOW"] = 0.5
+    t0 = time.perf_counter()
+    out = oloop.fetch_many(iter(["AAPL", "SLOW", "AAPL"]), kinds=("chain",), budget_ms=200)
+    assert time.perf_counter() - t0 < 0.45
+    assert out == {("AAPL", "chain"): "chain,AAPL\n1,2\n", ("SLOW", "chain"): None}
+
+def test_fetch_many_failures_map_to_none(oloop, http):
+    http.status["BAD"] = 404
+    out = oloop.fetch_many(["AAPL", "BAD"], budget_ms=2000)
+    assert out[("BAD", "summaries")] is None and out[("BAD", "chain")] is None
+    assert out[("AAPL", "summaries")] == "summaries,AAPL\n1,2\n"
+
+def test_fetch_many_fallback_covers_every_ticker(oloop):
+    async def broken(*args, **kw):
+        raise RuntimeError("loop gone")
+    oloop.client.fetch_many = broken
+    out = oloop.fetch_many(iter(["AAPL", "MSFT"]), kinds=("chain",), budget_ms=50)
+    assert out == {("AAPL", "chain"): None, ("MSFT", "chain"): None}
@@ -0,0 +1,53 @@
+# tests/test_orats_http.py
+import pytest
+from headline_reactor.vendors import orats_http
+from headline_reactor.vendors.orats_http import TokenBucket
+
+class Clock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(orats_http.time, "monotonic", c)
+    return c
+
+def test_burst_then_rate(clock):
+    b = TokenBucket(rate_per_sec=10, burst=3)
+    assert [b.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.t += 0.1
+    assert b.try_acquire()
+    assert b._reserve(1) == pytest.approx(0.1)
+    assert b.stats.waited == 1
+
+def test_throttle_holds_every_caller(clock):
+    b = TokenBucket(rate_per_sec=10, burst=5)
+    b.throttle(2.0)
+    assert b.stats.throttled == 1
+    assert not b.try_acquire()
+    clock.t += 1.0
+    assert not b.try_acquire()
+    assert b._reserve(1) == pytest.approx(1.0)
+
+def test_throttle_drops_accumulated_burst(clock):
+    b = TokenBucket(rate_per_sec=10, burst=5)
+    b.throttle(0.2)
+    clock.t += 0.2
+    # Only what refilled during the hold is available, not the old burst of 5
+    assert [b.try_acquire() for _ in range(3)] == [True, True, False]
+    b.throttle(0.5)
+    clock.t += 0.2
+    assert not b.try_acquire()
+
+def test_throttle_never_shortens_hold(clock):
+    b = TokenBucket(rate_per_sec=10, burst=5)
+    b.throttle(3.0)
+    b.throttle(1.0)
+    clock.t += 2.0
+    assert not b.try_acquire()
+    clock.t += 1.0
+    assert b.try_acquire()
@@ -0,0 +1,140 @@
+# tests/test_orats_prefetch.py
+import asyncio
+import threading
+import time
+from collections import Counter
+import pytest
+import requests
+from headline_reactor.vendors.orats_async import OratsLoop
+from headline_reactor.vendors.orats_prefetch import Prefetcher
+from headline_reactor.vendors.orats_store import ChainStore
+
+def chain_csv(ticker):
+    return ("ticker,tradeDate,expirDate,dte,strike,stockPrice,callBidPrice,callAskPrice,delta\n"
+            f"{ticker},2026-10-19,2026-10-23,4,100,100.5,1.9,2.1,0.55\n")
+
+class FakeClient:
+    """Async client stand-in: chain() holds until `release` is set, then raises for tickers in `fail`/`slow`."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.release = threading.Event()
+        self.fail = set()
+        self.slow = set()
+        self.coalesced = 0
+
+    async def chain(self, ticker, timeout=None):
+        self.calls[ticker] += 1
+        while not self.release.is_set():
+            await asyncio.sleep(0.005)
+        if ticker in self.fail:
+            raise RuntimeError("HTTP 500")
+        if ticker in self.slow:
+            raise requests.exceptions.ReadTimeout("read timed out")
+        return chain_csv(ticker)
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+@pytest.fixture
+def pf(client, tmp_path):
+    loop = OratsLoop(client)
+    yield Prefetcher(ChainStore(root=tmp_path, persist=False), loop)
+    client.release.set()
+    loop.close()
+
+def _until(cond, timeout=5.0):
+    deadline = time.time() + timeout
+    while not cond():
+        assert time.time() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+def test_load_reaches_store(pf, client):
+    client.release.set()
+    with pf.batch() as b:
+        b.warm("aapl")
+        part = b.wait("AAPL", 5)
+    assert part is not None and part.ticker == "AAPL"
+    assert client.calls["AAPL"] == 1
+    # A fresh chain is not fetched again
+    with pf.batch() as b:
+        b.warm("AAPL")
+        assert b.futs == {}
+
+def test_shared_ticker_across_batches(pf, client):
+    b1, b2 = pf.batch(), pf.batch()
+    b1.warm("AAPL")
+    b2.warm("AAPL")
+    assert pf.started == 1 and b1.futs["AAPL"] is b2.futs["AAPL"]
+    b1.cancel()                          # b2 still wants it: not cancelled
+    assert pf.cancelled == 0 and not b2.futs["AAPL"].cancelled()
+    client.release.set()
+    assert b2.wait("AAPL", 5) is not None
+    b2.cancel()
+    assert pf.cancelled == 0 and pf.snapshot()["inflight"] == 0
+
+def test_last_release_cancels(pf, client):
+    b1, b2 = pf.batch(), pf.batch()
+    b1.warm("AAPL")
+    b2.warm("AAPL")
+    _until(lambda: client.calls["AAPL"] == 1)
+    b1.cancel()
+    b2.cancel()
+    assert pf.cancelled == 1
+    assert pf.snapshot()["inflight"] == 0
+    # The next headline starts a new load instead of joining the cancelled one
+    b3 = pf.batch()
+    b3.warm("AAPL")
+    assert pf.started == 2 and not b3.futs["AAPL"].cancelled()
+    b3.cancel()
+
+def test_cancel_while_queued(pf, client):
+    blocked, unblock = threading.Event(), threading.Event()
+
+    def hold():
+        blocked.set()
+        unblock.wait(5)
+
+    pf.loop.loop.call_soon_threadsafe(hold)      # the loop thread is busy: loads stay queued
+    blocked.wait(5)
+    with pf.batch() as b:
+        b.warm("AAPL")
+    unblock.set()
+    client.release.set()
+    time.sleep(0.1)
+    assert pf.cancelled == 1
+    assert client.calls["AAPL"] == 0             # never started
+    assert pf.store.latest("AAPL") is None
+
+def test_abandon_between_steps(pf, client):
+    with pf.batch() as b:
+        b.warm("AAPL")
+        _until(lambda: client.calls["AAPL"] == 1)   # request sent, response pending
+    client.release.set()
+    time.sleep(0.1)
+    assert pf.cancelled == 1
+    assert pf.store.latest("AAPL") is None          # the parse step was skipped
+
+def test_wait_budget_and_errors(pf, client):
+    client.fail.add("BAD")
+    client.slow.add("SLOW")
+    with pf.batch() as b:
+        b.warm_many(["AAPL", "BAD", "SLOW"])
+        assert b.wait("AAPL", 0.02) is None
+        assert (b.late, b.timeouts, b.errors) == (1, 0, 0)   # the budget ran out, ORATS did not fail
+        client.release.set()
+        assert b.wait("BAD", 5) is None and b.errors == 1
+        assert b.wait("SLOW", 5) is None and b.timeouts == 1
+        assert b.wait("AAPL", 5) is not None
+        assert (b.late, b.timeouts, b.errors) == (1, 1, 1)
+
+def test_without_loop_is_inert(tmp_path):
+    pf = Prefetcher(ChainStore(root=tmp_path, persist=False), loop=None)
+    with pf.batch() as b:
+        b.warm("AAPL")
+        assert b.futs == {} and b.wait("AAPL", 1) is None
+    assert pf.snapshot() == {"inflight": 0, "started": 0, "cancelled": 0, "coalesced": 0}
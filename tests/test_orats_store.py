@@ -0,0 +1,116 @@
+# tests/test_orats_store.py
+import os
+from headline_reactor.vendors.orats_store import ChainStore, parse_chain
+
+HEADER = "ticker,tradeDate,expirDate,dte,strike,stockPrice,callBidPrice,callAskPrice,putBidPrice,putAskPrice,delta"
+ROWS = [
+    # expiry rows deliberately out of order; parse_chain sorts by (expiry, strike)
+    "AAPL,2026-10-19,2026-11-20,32,105,101.2,1.0,1.2,4.8,5.0,0.35",
+    "AAPL,2026-10-19,2026-10-23,4,100,101.2,1.9,2.1,0.7,0.8,0.62",
+    "AAPL,2026-10-19,2026-10-23,4,95,101.2,6.1,6.3,0.1,0.2,0.90",
+    "AAPL,2026-10-19,2026-10-23,4,105,101.2,0.2,0.3,3.9,4.1,0.18",
+    "AAPL,2026-10-19,2026-10-20,1,100,101.2,1.3,1.4,0.1,0.2,0.85",
+    "AAPL,2026-10-19,2026-11-20,32,100,101.2,3.0,3.2,1.8,2.0,0.58",
+]
+
+def _chain():
+    parts = parse_chain("\n".join([HEADER] + ROWS))
+    assert len(parts) == 1
+    return parts[0]
+
+def test_parse_chain_sorts_and_bounds_expiries():
+    ch = _chain()
+    assert ch.ticker == "AAPL" and ch.trade_date == "2026-10-19"
+    assert len(ch) == 6
+    assert [str(e) for e in ch.expiries] == ["2026-10-20", "2026-10-23", "2026-11-20"]
+    assert ch.bounds.tolist() == [0, 1, 4, 6]
+    assert ch.cols["strike"].tolist() == [100, 95, 100, 105, 100, 105]
+    assert ch.spot == 101.2
+
+def test_parse_chain_empty_or_missing_columns():
+    assert parse_chain("") == []
+    assert parse_chain("ticker,strike\nAAPL,100\n") == []
+
+def test_quote_exact_lookup():
+    ch = _chain()
+    q = ch.quote("2026-10-23", 105, "p")
+    assert (q.expiry, q.strike, q.right, q.bid, q.ask, q.dte) == ("2026-10-23", 105.0, "P", 3.9, 4.1, 4)
+    assert abs(q.delta - (0.18 - 1.0)) < 1e-12
+    assert q.mid == 4.0
+    assert ch.quote("2026-10-23", 110, "C") is None
+
+def test_expiry_slice_honours_min_dte():
+    ch = _chain()
+    assert ch._expiry_slice(1) == slice(0, 1)
+    assert ch._expiry_slice(2) == slice(1, 4)
+    assert ch._expiry_slice(30) == slice(4, 6)
+    assert ch._expiry_slice(60) is None
+
+def test_atm_picks_strike_nearest_spot():
+    ch = _chain()
+    q = ch.atm("C", min_dte=2)
+    assert (q.expiry, q.strike, q.right) == ("2026-10-23", 100.0, "C")
+    assert ch.atm(min_dte=60) is None
+
+def test_by_delta_uses_put_delta():
+    ch = _chain()
+    put = ch.by_delta(0.10, "P", min_dte=2)          # put deltas -0.10/-0.38/-0.82
+    assert (put.strike, put.right) == (95.0, "P")
+    call = ch.by_delta(0.20, "C", min_dte=2)
+    assert call.strike == 105.0
+
+class FakeClient:
+    def __init__(self, text=None, fail=False):
+        self.text = text if text is not None else "\n".join([HEADER] + ROWS)
+        self.fail = fail
+        self.calls = 0
+
+    def chain(self, ticker):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("HTTP 503")
+        return self.text
+
+def test_fresh_honours_max_age(tmp_path):
+    store = ChainStore(root=tmp_path, persist=False)
+    store.put_csv("\n".join([HEADER] + ROWS))
+    part = store.latest("aapl")
+    assert store.fresh("AAPL", 60) is part
+    part.loaded_at -= 61
+    assert store.fresh("AAPL", 60) is None
+    assert store.latest("AAPL") is part          # stale data is still there for callers that accept it
+    assert store.fresh("MSFT", 60) is None
+
+def test_refresh_loads_through_client(tmp_path):
+    client = FakeClient()
+    store = ChainStore(client=client, root=tmp_path, persist=False)
+    part = store.refresh("aapl")
+    assert client.calls == 1
+    assert part is store.latest("AAPL") and len(part) == 6
+    assert ChainStore(root=tmp_path).refresh("AAPL") is None      # no client: never fetches
+
+def test_refresh_failure_keeps_previous_chain(tmp_path):
+    client = FakeClient()
+    store = ChainStore(client=client, root=tmp_path, persist=False)
+    first = store.refresh("AAPL")
+    client.fail = True
+    assert store.refresh("AAPL") is None
+    assert store.latest("AAPL") is first
+
+def test_partitions_persist_to_parquet(tmp_path):
+    ChainStore(root=tmp_path).put_csv("\n".join([HEADER] + ROWS))
+    path = tmp_path / "AAPL" / "2026-10-19.parquet"
+    assert path.exists()
+    os.utime(path, (1_000, 1_000))
+    other = ChainStore(root=tmp_path)
+    assert other.latest("AAPL") is None                 # disk is only read for an explicit trade date
+    part = other.partition("aapl", "2026-10-19")
+    assert part.loaded_at == 1_000                       # age comes from the file, so it is not fresh
+    assert part.cols["strike"].tolist() == [100, 95, 100, 105, 100, 105]
+    assert part.atm("C", min_dte=2).strike == 100.0
+    assert other.latest("AAPL") is part
+    assert other.partition("AAPL", "2026-10-20") is None
+
+def test_persist_off_writes_nothing(tmp_path):
+    ChainStore(root=tmp_path, persist=False).put_csv("\n".join([HEADER] + ROWS))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,76 @@
+# tests/test_planner.py
+import pandas as pd
+import pytest
+import yaml
+from headline_reactor import instrument_selector_v2 as planner
+from headline_reactor.liquidity import now_ms
+from headline_reactor.safety.circuits import Circuit, CircuitState
+
+@pytest.fixture
+def cfg_path(tmp_path):
+    sec, etf = tmp_path / "secmaster.parquet", tmp_path / "etfs.parquet"
+    pd.DataFrame([{"symbol": "AAPL", "exchange": "US", "sector": "Technology", "country": "US"}]).to_parquet(sec)
+    pd.DataFrame([{"etf": "XLK", "type": "sector", "sector": "Technology", "country": None}]).to_parquet(etf)
+    cfg = {
+        "catalog_paths": {"secmaster": str(sec), "etf_catalog": str(etf), "stats": str(tmp_path / "stats.parquet")},
+        "order_defaults": {"ttl_sec": 600},
+        "budgets": {"equity_usd": 2000, "futures_usd": 5000, "crypto_usd": 1000},
+    }
+    p = tmp_path / "newsreactor.yml"
+    p.write_text(yaml.safe_dump(cfg), encoding="utf-8")
+    return p
+
+@pytest.fixture
+def circuit(monkeypatch):
+    c = Circuit(CircuitState(max_timeouts=2))
+    monkeypatch.setattr(planner, "get_circuit", lambda cfg=None: c)
+    return c
+
+def test_tripped_circuit_uses_etf_only(cfg_path, circuit, monkeypatch):
+    def full(*a, **k):
+        raise AssertionError("full planner ran in ETF_ONLY mode")
+
+    monkeypatch.setattr(planner, "_full", full)
+    circuit.record_timeout(now_ms(), "orats")
+    circuit.record_error(now_ms(), "orats")
+    circuit.record_timeout(now_ms(), "orats")
+    cands = planner.select_candidates("ma_confirmed", "AAPL to buy startup", "AAPL to buy startup", cfg_path)
+    assert [c.line for c in cands] == ["XLK BUY $2000 IOC TTL=10m (NEWS: ma_confirmed)"]
+    assert cands[0].rationale.endswith("[ETF_ONLY]")
+
+class LateBatch:
+    """Prefetch batch whose waits all run out of budget, plus the given vendor failures."""
+
+    def __init__(self, late=0, timeouts=0, errors=0):
+        self.late, self.timeouts, self.errors = late, timeouts, errors
+
+    def warm(self, ticker):
+        pass
+
+    def wait(self, ticker, timeout):
+        self.late += 1
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+def _run_full(cfg_path, circuit, monkeypatch, batch):
+    monkeypatch.setattr(planner, "get_prefetcher", lambda: type("P", (), {"batch": lambda self: batch})())
+    cfg = yaml.safe_load(cfg_path.read_text(encoding="utf-8"))
+    planner._full("ma_confirmed", "BUY", "markets flat", cfg, circuit,
+                  cfg_path.parent / "secmaster.parquet", cfg_path.parent / "etfs.parquet",
+                  cfg_path.parent / "stats.parquet")
+    return circuit.counts(now_ms())
+
+def test_missed_prefetch_budget_does_not_trip_circuit(cfg_path, circuit, monkeypatch):
+    counts = _run_full(cfg_path, circuit, monkeypatch, LateBatch(late=5))
+    assert counts["timeout"] == {} and counts["error"] == {}
+    assert circuit.next_mode(now_ms()) == "FULL"
+
+def test_orats_failures_feed_circuit(cfg_path, circuit, monkeypatch):
+    counts = _run_full(cfg_path, circuit, monkeypatch, LateBatch(late=1, timeouts=2, errors=1))
+    assert counts["timeout"] == {"orats": 2} and counts["error"] == {"orats": 1}
+    assert circuit.next_mode(now_ms()) == "ETF_ONLY"
@@ -0,0 +1,40 @@
+# tests/test_profiler.py
+import time
+from headline_reactor.ops.profiler import HeadlineProfiler
+
+def evaluate_headline(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+def test_keeps_only_headlines_over_threshold(tmp_path):
+    prof = HeadlineProfiler(True, out_dir=tmp_path, over_ms=80, interval_ms=1)
+    with prof.headline("fast"):
+        evaluate_headline(20)
+    assert prof.last_path is None and list(tmp_path.iterdir()) == []
+
+    with prof.headline("slow"):
+        evaluate_headline(120)
+    p = prof.last_path
+    assert p is not None and p.parent == tmp_path and "-slow-" in p.name and p.suffix == ".folded"
+    lines = p.read_text(encoding="utf-8").splitlines()
+    # Collapsed format: root;...;leaf <count>, the evaluating function on the stack
+    stack, n = lines[0].rsplit(" ", 1)
+    assert int(n) > 0 and "test_profiler:evaluate_headline" in stack.split(";")
+    assert list(tmp_path.iterdir()) == [p]
+
+def test_every_nth_headline(tmp_path):
+    prof = HeadlineProfiler(True, out_dir=tmp_path, every=2, interval_ms=1)
+    kept = []
+    for i in range(4):
+        with prof.headline(f"h{i}"):
+            evaluate_headline(15)
+        kept.append(prof.last_path is not None)
+    assert kept == [False, True, False, True]
+
+def test_disabled_writes_nothing(tmp_path):
+    prof = HeadlineProfiler(False, out_dir=tmp_path)
+    with prof.headline("x"):
+        evaluate_headline(5)
+    assert prof.last_path is None and prof.seen == 0
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,64 @@
+# tests/test_prometheus.py
+import urllib.error
+import urllib.request
+import pytest
+from headline_reactor.ops.metrics import Registry, registry
+from headline_reactor.ops.prometheus import render, serve
+
+def test_render_empty_registry():
+    assert render(Registry()) == "\n"
+
+def test_render_counters_gauges_and_collectors():
+    reg = Registry()
+    reg.inc("orats.ratelimit.throttled", 2)
+    reg.inc('circuit.events{kind="error"}')
+    reg.inc('circuit.events{kind="timeout"}', 3)
+    reg.set("queue-depth", 4)
+    reg.collector(lambda: {"cache.hit_rate": 0.25})
+    lines = render(reg).splitlines()
+    assert lines == [
+        "# TYPE reactor_circuit_events_total counter",
+        'reactor_circuit_events_total{kind="error"} 1',
+        'reactor_circuit_events_total{kind="timeout"} 3',
+        "# TYPE reactor_orats_ratelimit_throttled_total counter",
+        "reactor_orats_ratelimit_throttled_total 2",
+        "# TYPE reactor_cache_hit_rate gauge",
+        "reactor_cache_hit_rate 0.25",
+        "# TYPE reactor_queue_depth gauge",
+        "reactor_queue_depth 4",
+    ]
+
+def test_render_latency_summaries():
+    reg = Registry()
+    reg.histogram("unused")                 # no samples: not exported
+    h = reg.histogram("ocr_ms")
+    for ns in (1_000_000, 2_000_000, 3_000_000, 4_000_000):
+        h.record(ns)
+    lines = render(reg).splitlines()
+    assert lines[0] == "# TYPE reactor_latency_seconds summary"
+    assert [l.split(" ")[0] for l in lines[1:]] == [
+        'reactor_latency_seconds{name="ocr_ms",quantile="0.5"}',
+        'reactor_latency_seconds{name="ocr_ms",quantile="0.9"}',
+        'reactor_latency_seconds{name="ocr_ms",quantile="0.99"}',
+        'reactor_latency_seconds_sum{name="ocr_ms"}',
+        'reactor_latency_seconds_count{name="ocr_ms"}',
+    ]
+    values = [float(l.split(" ")[1]) for l in lines[1:]]
+    assert abs(values[0] - 0.002) / 0.002 < 1 / 32
+    assert values[2] == 0.004               # capped at the largest sample
+    assert values[3:] == [0.01, 4]
+
+def test_serve_metrics_endpoint():
+    registry.inc("test.scrapes")
+    srv = serve(0)
+    try:
+        url = f"http://127.0.0.1:{srv.server_address[1]}"
+        with urllib.request.urlopen(url + "/metrics", timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "reactor_test_scrapes_total 1" in resp.read().decode().splitlines()
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(url + "/other", timeout=5)
+        assert err.value.code == 404
+    finally:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,36 @@
+# tests/test_spans.py
+import time
+import pytest
+from headline_reactor.ops import spans
+from headline_reactor.ops.metrics import registry
+
+@pytest.fixture(autouse=True)
+def clean():
+    spans.reset()
+    yield
+    spans.reset()
+
+def test_context_manager_reaches_registry_histogram():
+    with spans.span("test.sleep"):
+        time.sleep(0.02)
+    h = registry.histograms["span.test.sleep"]
+    assert h.n == 1 and h.max_ns >= 20_000_000
+    assert spans.snapshot()["test.sleep"]["count"] == 1
+
+def test_decorator_records_even_when_the_stage_raises():
+    @spans.span("test.boom")
+    def boom():
+        raise ValueError("x")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            boom()
+    assert spans.histogram("test.boom").n == 3
+    assert boom.__name__ == "boom"
+
+def test_report_and_reset():
+    spans.record("test.a", 2_000_000)
+    lines = spans.report()
+    assert lines[0].split()[0] == "stage" and lines[1].split()[:2] == ["test.a", "1"]
+    spans.reset()
+    assert "span.test.a" not in registry.histograms and spans.report() == lines[:1]
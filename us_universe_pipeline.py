@@ -1,23 +1,32 @@
 # us_universe_pipeline.py
 from __future__ import annotations
-import os, math, time
+import os, re, math, time, json, threading
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from datetime import datetime, timedelta, timezone
 import pandas as pd
-import requests
+import pyarrow as pa
 from dateutil import tz
 from tqdm import tqdm
 import typer
-
-# Bloomberg
-try:
-    import blpapi
-except Exception:
-    blpapi = None
+from headline_reactor.vendors import orats_http
+from headline_reactor.vendors.bbg_fetch import BeqsPager, PipelinedFetcher, security_rows
+from headline_reactor.vendors.bbg_session import get_pool
+from headline_reactor.catalogs.incremental import (REFRESH_COL, VersionedStream, diff_universe, merge_refresh,
+                                                   load_existing, now_utc, write_versioned)
+from headline_reactor.catalogs.stats import STATS_COLUMNS, liquidity_stats
+from headline_reactor.catalogs.fx import FxCache
+from headline_reactor.catalogs.checkpoint import ChunkCheckpoint, RunState, fingerprint
+from headline_reactor.catalogs.dag import Dag, Step
+
+# Bloomberg (real bindings, or the offline stand-in when BLP_OFFLINE is set)
+from headline_reactor.vendors.bbg_api import blpapi
 
 app = typer.Typer(add_completion=False)
 CAT = Path("catalog"); CAT.mkdir(parents=True, exist_ok=True)
+BLP_CHUNK = int(os.getenv("BLP_CHUNK", "450"))        # securities per request
+BLP_INFLIGHT = int(os.getenv("BLP_INFLIGHT", "4"))    # chunk requests outstanding at once
 
 # ---------- Bloomberg helpers ----------
 def _require_blp():
@@ -25,125 +34,60 @@ def _require_blp():
         typer.echo("blpapi not installed. Install Bloomberg Desktop API Python bindings.")
         raise typer.Exit(2)
 
-def _session() -> blpapi.Session:
-    host, port = os.getenv("BLP_HOST", "localhost"), int(os.getenv("BLP_PORT", "8194"))
-    opts = blpapi.SessionOptions(); opts.setServerHost(host); opts.setServerPort(port)
-    s = blpapi.Session(opts)
-    if not s.start(): raise RuntimeError("Failed to start Bloomberg session")
-    return s
-
-def _open(s: blpapi.Session, svc: str) -> blpapi.Service:
-    if not s.openService(svc): raise RuntimeError(f"Failed to open {svc}")
-    return s.getService(svc)
-
-def _send(s: blpapi.Session, service: blpapi.Service, req: blpapi.Request) -> List[blpapi.Message]:
-    cid = blpapi.CorrelationId(); s.sendRequest(req, correlationId=cid)
-    out = []
-    while True:
-        ev = s.nextEvent()
-        for msg in ev:
-            if msg.correlationIds() and msg.correlationIds()[0] == cid:
-                out.append(msg)
-        if ev.eventType() == blpapi.Event.RESPONSE: break
-    return out
-
 # ---------- BEQS (Bloomberg Equity Screening) ----------
-def beqs_list(screen_name: str, screen_type: str = "PRIVATE", max_results: int = 25000) -> List[str]:
+BEQS_PAGE = 3000                                                   # results per BEQS request
+BEQS_WINDOW = int(os.getenv("BEQS_WINDOW", "4"))                   # speculative pages in flight
+BEQS_CACHE_TTL_H = float(os.getenv("BEQS_CACHE_TTL_HOURS", "12"))  # reuse screen output this long
+BEQS_CACHE = CAT / ".beqs_cache"
+
+def _beqs_cache_path(screen_name: str, screen_type: str) -> Path:
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{screen_type}_{screen_name}")
+    return BEQS_CACHE / f"{safe}.json"
+
+def _beqs_cached(screen_name: str, screen_type: str, ttl_hours: float) -> Optional[List[str]]:
+    p = _beqs_cache_path(screen_name, screen_type)
+    try:
+        d = json.loads(p.read_text())
+    except Exception:
+        return None
+    age_h = (time.time() - d.get("fetched_at", 0)) / 3600
+    return d.get("securities") if age_h < ttl_hours else None
+
+def _beqs_store(screen_name: str, screen_type: str, secs: List[str]):
+    p = _beqs_cache_path(screen_name, screen_type)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"screen": screen_name, "type": screen_type, "fetched_at": time.time(), "securities": secs}))
+    tmp.replace(p)
+
+def beqs_list(screen_name: str, screen_type: str = "PRIVATE", max_results: int = 25000,
+              cache_ttl_hours: float = BEQS_CACHE_TTL_H, window: int = BEQS_WINDOW,
+              refresh: bool = False) -> List[str]:
     """
-    Fetch securities from a saved BEQS screen with pagination. Returns list like ['AAPL US Equity', ...].
-    Bloomberg BEQS has a 3,000 result limit per request - we need to paginate using overrides.
+    Fetch securities from a saved BEQS screen. Returns list like ['AAPL US Equity', ...].
+    Pages of 3,000 (START_POSITION overrides) are fetched several at a time on one pooled
+    session; complete results are cached for `cache_ttl_hours` (0 disables the cache,
+    `refresh` skips reading it).
     """
+    if cache_ttl_hours > 0 and not refresh:
+        cached = _beqs_cached(screen_name, screen_type, cache_ttl_hours)
+        if cached is not None:
+            typer.echo(f"    Cached: {len(cached)} securities from '{screen_name}' (< {cache_ttl_hours:g}h old)")
+            return cached
     _require_blp()
-    s = _session()
-    try:
-        ref = _open(s, "//blp/refdata")
-        all_secs: List[str] = []
-        offset = 0
-        page_size = 3000
-        
-        while offset < max_results:
-            req = ref.createRequest("BeqsRequest")
-            
-            # Set required screenName element
-            req.getElement("screenName").setValue(screen_name)
-            
-            # Set optional screenType element (GLOBAL or PRIVATE)
-            req.getElement("screenType").setValue(screen_type)
-            
-            # Add pagination overrides (START_POSITION and MAX_RESULTS)
-            if offset > 0:
-                ovr = req.getElement("overrides")
-                o1 = ovr.appendElement()
-                o1.setElement("fieldId", "START_POSITION")
-                o1.setElement("value", str(offset))
-            
-            # Send request and collect response
-            msgs = _send(s, ref, req)
-            
-            page_secs: List[str] = []
-            for m in msgs:
-                # Check for errors first
-                if m.hasElement("responseError"):
-                    err = m.getElement("responseError")
-                    err_msg = err.getElementAsString("message") if err.hasElement("message") else "Unknown error"
-                    typer.echo(f"    [ERROR] {err_msg}")
-                    return all_secs  # Return what we have so far
-                
-                # Try data -> securityData -> security
-                if m.hasElement("data"):
-                    data = m.getElement("data")
-                    
-                    # Check for securityData at data level
-                    if data.hasElement("securityData"):
-                        sd = data.getElement("securityData")
-                        for i in range(sd.numValues()):
-                            sec_elem = sd.getValueAsElement(i)
-                            
-                            # Each element should have a 'security' field
-                            if sec_elem.hasElement("security"):
-                                sec = sec_elem.getElementAsString("security")
-                                if sec:
-                                    # Normalize to "TICKER EXCH Equity" format
-                                    if not sec.endswith("Equity") and not sec.endswith("Index"):
-                                        sec = sec + " Equity"
-                                    page_secs.append(sec)
-                
-                # Direct securityData at message level
-                if m.hasElement("securityData"):
-                    sd = m.getElement("securityData")
-                    for i in range(sd.numValues()):
-                        sec_elem = sd.getValueAsElement(i)
-                        if sec_elem.hasElement("security"):
-                            sec = sec_elem.getElementAsString("security")
-                            if sec:
-                                # Normalize format
-                                if not sec.endswith("Equity") and not sec.endswith("Index"):
-                                    sec = sec + " Equity"
-                                page_secs.append(sec)
-            
-            if not page_secs:
-                typer.echo(f"    Page {offset//page_size + 1}: No more results")
-                break
-            
-            all_secs.extend(page_secs)
-            typer.echo(f"    Page {offset//page_size + 1}: Retrieved {len(page_secs)} securities (total: {len(all_secs)})")
-            
-            # If we got less than page_size, we're done
-            if len(page_secs) < page_size:
-                break
-            
-            offset += page_size
-        
-        # Dedup keeping order
-        out, seen = [], set()
-        for x in all_secs:
-            if x not in seen:
-                seen.add(x); out.append(x)
-        
-        typer.echo(f"    Total unique: {len(out)} securities from '{screen_name}'")
-        return out
-    finally:
-        s.stop()
+    with get_pool().lease() as bbg:
+        pager = BeqsPager(bbg.session, bbg.service("//blp/refdata"), page_size=BEQS_PAGE, window=window)
+        res = pager.fetch(screen_name, screen_type, max_results)
+    if res.error:
+        typer.echo(f"    [ERROR] {res.error}")
+
+    # Normalize to "TICKER EXCH Equity" format and dedup keeping order
+    out = list(dict.fromkeys(sec if sec.endswith(("Equity", "Index")) else sec + " Equity" for sec in res.securities))
+    typer.echo(f"    Total unique: {len(out)} securities from '{screen_name}' "
+               f"({res.pages} pages requested, {res.wall_ms/1000:.1f}s)")
+    if out and not res.error and cache_ttl_hours > 0:
+        _beqs_store(screen_name, screen_type, out)
+    return out
 
 # ---------- Refdata / Static ----------
 REF_FIELDS = [
@@ -162,238 +106,210 @@ EXCH_TO_MIC = {
     "SS":"XSHG","SZ":"XSHE"
 }
 
-def refdata(securities: List[str], fields: List[str]) -> pd.DataFrame:
-    _require_blp()
-    s = _session()
-    try:
-        ref = _open(s, "//blp/refdata")
-        out_rows: List[Dict[str,Any]] = []
-        CHUNK = 450
-        for i in range(0,len(securities),CHUNK):
-            req = ref.createRequest("ReferenceDataRequest")
-            e_secs = req.getElement("securities")
-            for sec in securities[i:i+CHUNK]: e_secs.appendValue(sec)
-            e_flds = req.getElement("fields")
-            for f in fields: e_flds.appendValue(f)
-
-            for msg in _send(s, ref, req):
-                if not msg.hasElement("securityData"): continue
-                sd = msg.getElement("securityData")
-                for j in range(sd.numValues()):
-                    r = sd.getValueAsElement(j)
-                    sec = r.getElementAsString("security")
-                    fd = r.getElement("fieldData")
-                    row = {"bbg": sec}
-                    for f in fields:
-                        if fd.hasElement(f):
-                            row[f] = _elem(fd.getElement(f))
-                    out_rows.append(row)
-        return pd.DataFrame(out_rows)
-    finally:
-        s.stop()
-
-def static_snap(securities: List[str], fields: List[str]) -> pd.DataFrame:
-    _require_blp()
-    s = _session()
-    try:
-        svc = _open(s, "//blp/staticmktdata")
-        out_rows: List[Dict[str,Any]] = []
-        CHUNK = 450
-        for i in range(0,len(securities),CHUNK):
-            req = svc.createRequest("StaticMarketDataRequest")
-            e_secs = req.getElement("securities")
-            for sec in securities[i:i+CHUNK]: e_secs.appendValue(sec)
-            e_flds = req.getElement("fields")
-            for f in fields: e_flds.appendValue(f)
-            for msg in _send(s, svc, req):
-                if not msg.hasElement("securityData"): continue
-                sd = msg.getElement("securityData")
-                for j in range(sd.numValues()):
-                    r = sd.getValueAsElement(j)
-                    sec = r.getElementAsString("security")
-                    fd = r.getElement("fieldData")
-                    row = {"bbg": sec}
-                    for f in fields:
-                        if fd.hasElement(f):
-                            row[f] = _elem(fd.getElement(f))
-                    out_rows.append(row)
-        return pd.DataFrame(out_rows)
-    finally:
-        s.stop()
-
-def _elem(e: blpapi.Element):
-    try:
-        if e.datatype()==blpapi.DataType.STRING: return e.getValueAsString()
-        if e.datatype() in (blpapi.DataType.FLOAT64, blpapi.DataType.FLOAT32): return float(e.getValueAsFloat64())
-        if e.datatype() in (blpapi.DataType.INT32, blpapi.DataType.INT64): return int(e.getValueAsInteger())
-        if e.datatype()==blpapi.DataType.BOOL: return bool(e.getValueAsBool())
-        return e.toString()
-    except Exception:
-        return None
-
-# ---------- Build steps ----------
-def normalize_ref(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out["symbol"]   = out.get("TICKER")
-    out["exchange"] = out.get("EXCH_CODE")
-    # MIC: prefer ID_MIC_PRIM_EXCH; else map EXCH_CODE
-    out["mic"]      = out.get("ID_MIC_PRIM_EXCH")
-    out.loc[out["mic"].isna(), "mic"] = out["exchange"].map(EXCH_TO_MIC)
-    out["country"]  = out.get("CNTRY_OF_DOMICILE")
-    out["name"]     = out.get("SECURITY_NAME")
-    out["sector"]   = out.get("GICS_SECTOR_NAME").fillna(out.get("INDUSTRY_SECTOR"))
-    out["isin"]     = out.get("ID_ISIN")
-    out["ric"]      = out.get("ID_RIC")
-    # tags - handle Series properly
-    st = out["SECURITY_TYP"].fillna("").astype(str).str.upper() if "SECURITY_TYP" in out.columns else pd.Series([""] * len(out))
-    st2 = out["SECURITY_TYP2"].fillna("").astype(str).str.upper() if "SECURITY_TYP2" in out.columns else pd.Series([""] * len(out))
-    adrflag = (out["ADR_FLAG"]==True) if "ADR_FLAG" in out.columns else pd.Series([False] * len(out))
-    out["is_adr"]   = adrflag.fillna(False)
-    out["is_etf"]   = st.eq("ETF") | st.str.contains("ETF", na=False) | st2.str.contains("ETF|ETP", regex=True, na=False)
-    out["is_common"]= (~out["is_etf"]) & (~out["is_adr"])
-    keep = ["symbol","exchange","mic","country","sector","name","isin","ric","bbg","is_common","is_etf","is_adr"]
-    out = out[keep].drop_duplicates(subset=["bbg"]).reset_index(drop=True)
-    return out
-
-def fx_needed(crncy: pd.Series) -> List[str]:
-    pairs=set()
-    for c in crncy.dropna().astype(str):
-        if c.upper()!="USD": pairs.add(f"{c.upper()}USD Curncy")
-    return sorted(pairs)
-
-def fetch_fx(pairs: List[str]) -> Dict[str,float]:
-    if not pairs: return {}
-    df = refdata(pairs, ["PX_LAST"])
-    fx = {}
-    for _,r in df.iterrows():
-        sec = r["bbg"]
-        px  = r.get("PX_LAST")
-        if px: fx[sec.split()[0].upper()] = float(px)
-    return fx
-
 def adv_spread(secmaster: pd.DataFrame) -> pd.DataFrame:
-    # Snapshot
     snap = static_snap(secmaster["bbg"].tolist(), SNAP_FIELDS)
-    if snap.empty: return pd.DataFrame(columns=["symbol","adv_usd","avg_spread_bps"])
+    if snap.empty: return pd.DataFrame(columns=STATS_COLUMNS)
     tmp = secmaster[["bbg","symbol"]].merge(snap, on="bbg", how="left")
-    # FX → USD
-    pairs = fx_needed(tmp["CRNCY"])
-    fx_map= fetch_fx(pairs)
-    def fx_to_usd(c):
-        if not isinstance(c,str) or c.upper()=="USD": return 1.0
-        return float(fx_map.get(c.upper()+"USD", 0.0)) or 0.0
-
-    adv, spd = [], []
-    for _,r in tmp.iterrows():
-        v = r.get("VOLUME_AVG_30D") if pd.notna(r.get("VOLUME_AVG_30D")) else r.get("VOLUME_AVG_20D")
-        px= r.get("PX_LAST"); cr=r.get("CRNCY")
-        f = fx_to_usd(cr)
-        adv.append(float(v)*float(px)*f if (pd.notna(v) and pd.notna(px) and f>0) else None)
-        bid,ask = r.get("BID"), r.get("ASK")
-        if pd.notna(bid) and pd.notna(ask) and bid>0 and ask>0:
-            mid=0.5*(bid+ask); spd.append((ask-bid)/mid*10000.0)
-        else:
-            spd.append(None)
-    out = pd.DataFrame({"symbol": tmp["symbol"], "adv_usd": adv, "avg_spread_bps": spd})
-    out = out.groupby("symbol", as_index=False).agg({"adv_usd":"max","avg_spread_bps":"min"})
-    return out
+    return liquidity_stats(tmp, fx_rates(tmp["CRNCY"]) if "CRNCY" in tmp.columns else {})
 
 # ---------- ORATS coverage ----------
 BASE_ORATS = "https://api.orats.io/datav2"
+ORATS_NOT_FOUND = 404     # unknown ticker; any other non-200 is an error, not an answer
 def _orats_token() -> str:
     tok = os.getenv("ORATS_TOKEN"); 
     if not tok: raise RuntimeError("Set ORATS_TOKEN env var")
     return tok
 
-def _try_orats_symbol(sym: str) -> Tuple[Optional[str], bool]:
-    """Probe a few symbol forms against the summaries endpoint to see what ORATS accepts."""
-    import re
-    forms = [sym,
-             sym.replace("/", "."),         # BRK/B -> BRK.B
-             sym.replace(".", ""),          # BRK.B -> BRKB
-             re.sub(r'[^A-Z0-9]+','',sym)]  # strip punctuation
-    hdr = {"Accept":"text/csv"}
-    for f in dict.fromkeys(forms):
+# Symbol spellings ORATS may accept, tried in order of how often each has worked
+ORATS_RULES: List[Tuple[str, Callable[[str], str]]] = [
+    ("as_is",        lambda s: s),
+    ("slash_to_dot", lambda s: s.replace("/", ".")),           # BRK/B -> BRK.B
+    ("drop_dot",     lambda s: s.replace(".", "")),            # BRK.B -> BRKB
+    ("alnum_only",   lambda s: re.sub(r'[^A-Z0-9]+', '', s)),  # strip punctuation
+]
+
+class ProbeJournal:
+    """Append-only JSONL of probe results so an interrupted coverage run can resume."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fh = None
+
+    def load(self) -> List[Dict[str, Any]]:
+        if not self.path.exists(): return []
+        rows = []
+        for line in self.path.read_text().splitlines():
+            try: rows.append(json.loads(line))
+            except ValueError: pass  # torn last line from a crash
+        return rows
+
+    def append(self, row: Dict[str, Any]):
+        with self._lock:
+            if self._fh is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write(json.dumps(row) + "\n"); self._fh.flush()
+
+    def close(self, remove: bool = False):
+        with self._lock:
+            if self._fh: self._fh.close(); self._fh = None
+            if remove and self.path.exists(): self.path.unlink()
+
+class CoverageProbe:
+    """Probe ORATS symbol coverage, learning which spelling rule works first."""
+
+    def __init__(self, journal: Optional[ProbeJournal] = None):
+        self.journal = journal
+        self.wins: Counter = Counter()
+        self.probes = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def learn(self, rows: List[Dict[str, Any]]):
+        for r in rows:
+            # Only punctuated symbols say anything about which spelling ORATS prefers
+            if r.get("orats_ok") and r.get("rule") and not str(r["symbol"]).isalnum():
+                self.wins[r["rule"]] += 1
+
+    def _forms(self, sym: str) -> List[Tuple[str, str]]:
+        if sym.isalnum(): return [("as_is", sym)]
+        order = sorted(ORATS_RULES, key=lambda nr: -self.wins[nr[0]])  # stable: ties keep default order
+        out, seen = [], set()
+        for name, fn in order:
+            f = fn(sym)
+            if f and f not in seen:
+                seen.add(f); out.append((name, f))
+        return out
+
+    def probe(self, sym: str) -> Dict[str, Any]:
+        """
+        Try spellings for one symbol over the shared ORATS session. Only a clean
+        answer (found, or every spelling answered "not found": a 404, or a 200
+        without data) is stamped and journaled. Anything else - a network error,
+        401/403 from a bad token, 429, 5xx - leaves `error` set and no
+        `last_checked_utc`, so the next resume probes the symbol again.
+        """
         url = f"{BASE_ORATS}/live/one-minute/summaries"
-        try:
-            r = requests.get(url, params={"ticker": f, "token": _orats_token()}, headers=hdr, timeout=10)
-            if r.status_code==200 and "ticker,tradeDate" in r.text.splitlines()[0]:
-                return f, True
-        except Exception:
-            pass
-    return None, False
-
-def check_orats_coverage(symbols: List[str], max_workers: int = 8) -> pd.DataFrame:
+        row = {"symbol": sym, "orats_symbol": None, "orats_ok": False, "rule": None, "error": None}
+        for name, f in self._forms(sym):
+            with self._lock: self.probes += 1
+            try:
+                r = orats_http.get(url, {"ticker": f, "token": _orats_token()}, timeout=10)
+            except Exception as e:
+                row["error"] = type(e).__name__
+                continue
+            if r.status_code not in (200, ORATS_NOT_FOUND):
+                row["error"] = f"HTTP {r.status_code}"
+                continue
+            lines = r.text.splitlines()
+            if r.status_code == 200 and lines and "ticker,tradeDate" in lines[0]:
+                row.update(orats_symbol=f, orats_ok=True, rule=name, error=None)
+                if not sym.isalnum():
+                    with self._lock: self.wins[name] += 1
+                break
+        if row["error"] is not None:
+            with self._lock: self.errors += 1
+            row["last_checked_utc"] = None
+            return row
+        row["last_checked_utc"] = _utc_stamp()
+        if self.journal: self.journal.append(row)
+        return row
+
+def _utc_stamp(dt: Optional[datetime] = None) -> str:
+    """UTC time as naive ISO seconds, the format journals and coverage files already hold."""
+    return (dt or datetime.now(timezone.utc)).strftime("%Y-%m-%dT%H:%M:%S")
+
+def _latest_by_symbol(rows: pd.DataFrame) -> pd.DataFrame:
+    if rows.empty: return rows
+    # Unstamped (failed) probes sort first, so any clean result for the symbol wins
+    return rows.sort_values("last_checked_utc", na_position="first").drop_duplicates("symbol", keep="last")
+
+def check_orats_coverage(symbols: List[str], max_workers: int = 8,
+                         previous: Optional[pd.DataFrame] = None,
+                         journal_path: Optional[Path] = None,
+                         max_age_days: Optional[float] = None) -> pd.DataFrame:
+    """
+    Probe ORATS coverage for `symbols`. With `previous` results and/or a journal, symbols
+    checked within `max_age_days` are kept as-is and only unchecked or stale ones are probed.
+    """
     from concurrent.futures import ThreadPoolExecutor, as_completed
-    rows=[]
+    journal = ProbeJournal(journal_path) if journal_path else None
+    prior = [] if previous is None or previous.empty else previous.to_dict("records")
+    if journal: prior += journal.load()
+    known = _latest_by_symbol(pd.DataFrame(prior)) if prior else pd.DataFrame()
+
+    fresh: set = set()
+    if not known.empty and max_age_days is not None:
+        cutoff = _utc_stamp(datetime.now(timezone.utc) - timedelta(days=max_age_days))
+        checked = known["last_checked_utc"]
+        fresh = set(known.loc[checked.notna() & (checked.astype(str) >= cutoff), "symbol"])
+    todo = [s for s in dict.fromkeys(symbols) if s not in fresh]
+    if fresh:
+        typer.echo(f"    Resuming: {len(fresh):,} symbols fresh, {len(todo):,} to probe")
+
+    probe = CoverageProbe(journal)
+    probe.learn(prior)
+    rows = []
+    t0 = time.perf_counter()
     with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futs = {ex.submit(_try_orats_symbol, s): s for s in symbols}
-        for fut in tqdm(as_completed(futs), total=len(futs), desc="ORATS probe"):
-            s = futs[fut]
-            orats_sym, ok = fut.result()
-            rows.append({"symbol": s, "orats_symbol": orats_sym, "orats_ok": bool(ok), 
-                         "last_checked_utc": datetime.utcnow().isoformat(timespec="seconds")})
-    return pd.DataFrame(rows)
+        futs = [ex.submit(probe.probe, s) for s in todo]
+        bar = tqdm(as_completed(futs), total=len(futs), desc="ORATS probe")
+        for fut in bar:
+            rows.append(fut.result())
+            dt = time.perf_counter() - t0
+            if dt > 0 and len(rows) % 50 == 0:
+                bar.set_postfix(probes_per_s=f"{probe.probes/dt:.1f}")
+    dt = max(time.perf_counter() - t0, 1e-9)
+    if todo:
+        typer.echo(f"    {probe.probes:,} probes for {len(rows):,} symbols in {dt:.1f}s "
+                   f"({probe.probes/dt:.1f} probes/s, {len(rows)/dt:.1f} symbols/s)")
+    if probe.errors:
+        typer.echo(f"    {probe.errors:,} symbols failed or were throttled; they will be re-probed on the next run")
+
+    new = pd.DataFrame(rows, columns=["symbol","orats_symbol","orats_ok","rule","last_checked_utc","error"])
+    keep = known[known["symbol"].isin(fresh)] if fresh else known.iloc[0:0]
+    out = _latest_by_symbol(pd.concat([keep, new], ignore_index=True)) if not keep.empty else new
+    out = out[out["symbol"].isin(set(symbols))].reset_index(drop=True)
+    if journal: journal.close()
+    return out
 
 # ---------- Build steps ----------
-def refdata(securities: List[str], fields: List[str]) -> pd.DataFrame:
-    _require_blp()
-    s = _session()
-    try:
-        ref = _open(s, "//blp/refdata")
-        out_rows: List[Dict[str,Any]] = []
-        CHUNK = 450
-        for i in range(0,len(securities),CHUNK):
-            req = ref.createRequest("ReferenceDataRequest")
-            e_secs = req.getElement("securities")
-            for sec in securities[i:i+CHUNK]: e_secs.appendValue(sec)
-            e_flds = req.getElement("fields")
-            for f in fields: e_flds.appendValue(f)
-
-            for msg in _send(s, ref, req):
-                if not msg.hasElement("securityData"): continue
-                sd = msg.getElement("securityData")
-                for j in range(sd.numValues()):
-                    r = sd.getValueAsElement(j)
-                    sec = r.getElementAsString("security")
-                    fd = r.getElement("fieldData")
-                    row = {"bbg": sec}
-                    for f in fields:
-                        if fd.hasElement(f):
-                            row[f] = _elem(fd.getElement(f))
-                    out_rows.append(row)
-        return pd.DataFrame(out_rows)
-    finally:
-        s.stop()
-
-def static_snap(securities: List[str], fields: List[str]) -> pd.DataFrame:
+def _fetch_chunks(service_name: str, request_type: str, securities: List[str], fields: List[str],
+                 on_chunk: Callable[[int, List[Dict[str,Any]]], None], chunk: int = BLP_CHUNK,
+                 concurrency: int = BLP_INFLIGHT, skip: Optional[set] = None):
+    """Pipelined chunked fetch; each chunk's decoded rows go to `on_chunk(idx, rows)` as soon as it completes."""
     _require_blp()
-    s = _session()
-    try:
-        svc = _open(s, "//blp/staticmktdata")
-        out_rows: List[Dict[str,Any]] = []
-        CHUNK = 450
-        for i in range(0,len(securities),CHUNK):
-            req = svc.createRequest("StaticMarketDataRequest")
-            e_secs = req.getElement("securities")
-            for sec in securities[i:i+CHUNK]: e_secs.appendValue(sec)
-            e_flds = req.getElement("fields")
-            for f in fields: e_flds.appendValue(f)
-            for msg in _send(s, svc, req):
-                if not msg.hasElement("securityData"): continue
-                sd = msg.getElement("securityData")
-                for j in range(sd.numValues()):
-                    r = sd.getValueAsElement(j)
-                    sec = r.getElementAsString("security")
-                    fd = r.getElement("fieldData")
-                    row = {"bbg": sec}
-                    for f in fields:
-                        if fd.hasElement(f):
-                            row[f] = _elem(fd.getElement(f))
-                    out_rows.append(row)
-        return pd.DataFrame(out_rows)
-    finally:
-        s.stop()
+    with get_pool().lease() as bbg:
+        svc = bbg.service(service_name)
+        fetcher = PipelinedFetcher(bbg.session, svc, request_type, chunk=chunk, concurrency=concurrency)
+        by_chunk: Dict[int, List[Dict[str,Any]]] = {}
+        rep = fetcher.run(securities, fields,
+                          lambda i, msg: by_chunk.setdefault(i, []).extend(security_rows(msg, fields, _elem, key="bbg")),
+                          skip=skip, on_chunk_done=lambda i: on_chunk(i, by_chunk.pop(i, [])))
+        if len(rep.chunks) > 1 or rep.failed(): typer.echo(f"    {request_type}: {rep.summary()}")
+
+def _fetch(service_name: str, request_type: str, securities: List[str], fields: List[str],
+           chunk: int = BLP_CHUNK, concurrency: int = BLP_INFLIGHT,
+           checkpoint: Optional[ChunkCheckpoint] = None) -> pd.DataFrame:
+    """Chunked fetch into one frame; with a checkpoint, completed chunks are saved and skipped on rerun."""
+    if checkpoint is not None:
+        skip = checkpoint.done()
+        if skip: typer.echo(f"    {request_type}: resuming, {len(skip)} chunks already saved")
+        _fetch_chunks(service_name, request_type, securities, fields, checkpoint.save, chunk, concurrency, skip)
+        return checkpoint.load()
+    frames: List[pd.DataFrame] = []
+    _fetch_chunks(service_name, request_type, securities, fields,
+                  lambda _i, rows: frames.append(pd.DataFrame(rows)) if rows else None, chunk, concurrency)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def refdata(securities: List[str], fields: List[str], chunk: int = BLP_CHUNK, concurrency: int = BLP_INFLIGHT,
+            checkpoint: Optional[ChunkCheckpoint] = None) -> pd.DataFrame:
+    return _fetch("//blp/refdata", "ReferenceDataRequest", securities, fields, chunk, concurrency, checkpoint)
+
+def static_snap(securities: List[str], fields: List[str], chunk: int = BLP_CHUNK, concurrency: int = BLP_INFLIGHT,
+                checkpoint: Optional[ChunkCheckpoint] = None) -> pd.DataFrame:
+    return _fetch("//blp/staticmktdata", "StaticMarketDataRequest", securities, fields, chunk, concurrency, checkpoint)
 
 def _elem(e: blpapi.Element):
     try:
@@ -405,52 +321,116 @@ def _elem(e: blpapi.Element):
     except Exception:
         return None
 
+UNIVERSE_SCHEMA = pa.schema([(c, pa.string()) for c in
+                             ["symbol","exchange","mic","country","sector","name","isin","ric","bbg"]] +
+                            [(c, pa.bool_()) for c in ["is_common","is_etf","is_adr"]] +
+                            [(REFRESH_COL, pa.string())])
+
+def _col(df: pd.DataFrame, name: str) -> pd.Series:
+    return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
 def normalize_ref(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    out["symbol"]   = out.get("TICKER")
-    out["exchange"] = out.get("EXCH_CODE")
+    """Raw refdata rows -> universe columns; builds only the kept columns rather than copying the raw frame."""
+    exchange = _col(df, "EXCH_CODE")
     # MIC: prefer ID_MIC_PRIM_EXCH; else map EXCH_CODE
-    out["mic"]      = out.get("ID_MIC_PRIM_EXCH")
-    out.loc[out["mic"].isna(), "mic"] = out["exchange"].map(EXCH_TO_MIC)
-    out["country"]  = out.get("CNTRY_OF_DOMICILE")
-    out["name"]     = out.get("SECURITY_NAME")
-    out["sector"]   = out.get("GICS_SECTOR_NAME").fillna(out.get("INDUSTRY_SECTOR"))
-    out["isin"]     = out.get("ID_ISIN")
-    out["ric"]      = out.get("ID_RIC")
-    # tags - handle Series properly
-    st = out["SECURITY_TYP"].fillna("").astype(str).str.upper() if "SECURITY_TYP" in out.columns else pd.Series([""] * len(out))
-    st2 = out["SECURITY_TYP2"].fillna("").astype(str).str.upper() if "SECURITY_TYP2" in out.columns else pd.Series([""] * len(out))
-    adrflag = (out["ADR_FLAG"]==True) if "ADR_FLAG" in out.columns else pd.Series([False] * len(out))
-    out["is_adr"]   = adrflag.fillna(False)
-    out["is_etf"]   = st.eq("ETF") | st.str.contains("ETF", na=False) | st2.str.contains("ETF|ETP", regex=True, na=False)
-    out["is_common"]= (~out["is_etf"]) & (~out["is_adr"])
-    keep = ["symbol","exchange","mic","country","sector","name","isin","ric","bbg","is_common","is_etf","is_adr"]
-    out = out[keep].drop_duplicates(subset=["bbg"]).reset_index(drop=True)
-    return out
-
-def fx_needed(crncy: pd.Series) -> List[str]:
-    pairs=set()
-    for c in crncy.dropna().astype(str):
-        if c.upper()!="USD": pairs.add(f"{c.upper()}USD Curncy")
-    return sorted(pairs)
+    mic = _col(df, "ID_MIC_PRIM_EXCH")
+    mic = mic.where(mic.notna(), exchange.map(EXCH_TO_MIC))
+    # tags
+    st = _col(df, "SECURITY_TYP").fillna("").astype(str).str.upper()
+    st2 = _col(df, "SECURITY_TYP2").fillna("").astype(str).str.upper()
+    is_adr = _col(df, "ADR_FLAG").eq(True)
+    is_etf = st.eq("ETF") | st.str.contains("ETF", na=False) | st2.str.contains("ETF|ETP", regex=True, na=False)
+    out = pd.DataFrame({
+        "symbol":    _col(df, "TICKER"),
+        "exchange":  exchange,
+        "mic":       mic,
+        "country":   _col(df, "CNTRY_OF_DOMICILE"),
+        "sector":    _col(df, "GICS_SECTOR_NAME").fillna(_col(df, "INDUSTRY_SECTOR")),
+        "name":      _col(df, "SECURITY_NAME"),
+        "isin":      _col(df, "ID_ISIN"),
+        "ric":       _col(df, "ID_RIC"),
+        "bbg":       _col(df, "bbg"),
+        "is_common": ~is_etf & ~is_adr,
+        "is_etf":    is_etf,
+        "is_adr":    is_adr,
+    })
+    return out.drop_duplicates(subset=["bbg"]).reset_index(drop=True)
+
+def fx_rates(crncy: pd.Series) -> Dict[str,float]:
+    """{"EURUSD": rate} for the currencies in `crncy`, from the FX cache (stale pairs refetched in bulk)."""
+    return FxCache(fetch=fetch_fx).ensure(crncy.dropna().unique())
 
 def fetch_fx(pairs: List[str]) -> Dict[str,float]:
     if not pairs: return {}
     df = refdata(pairs, ["PX_LAST"])
     fx = {}
-    for _,r in df.iterrows():
-        sec = r["bbg"]
-        px  = r.get("PX_LAST")
-        if px: fx[sec.split()[0].upper()] = float(px)
+    for sec, px in zip(df["bbg"], df.get("PX_LAST", pd.Series(dtype=float))):
+        if pd.notna(px) and px: fx[sec.split()[0].upper()] = float(px)
     return fx
 
 # ---------- CLI commands ----------
+def _stream_universe(securities: List[str], out: Path, ckpt: Optional[ChunkCheckpoint]) -> int:
+    """Full build: normalize each refdata chunk and append it to a new catalog version as a row group."""
+    stamp = now_utc()
+    with VersionedStream(out, UNIVERSE_SCHEMA) as w:
+        write = lambda rows: w.write(normalize_ref(pd.DataFrame(rows)).assign(**{REFRESH_COL: stamp}))
+        if ckpt is not None:
+            skip = ckpt.done()
+            if skip: typer.echo(f"    ReferenceDataRequest: resuming, {len(skip)} chunks already saved")
+            _fetch_chunks("//blp/refdata", "ReferenceDataRequest", securities, REF_FIELDS, ckpt.save, skip=skip)
+            for frame in ckpt.iter_frames():
+                write(frame)
+        else:
+            # Chunks complete out of order; hold early ones back so rows keep request order
+            held: Dict[int, List[Dict[str,Any]]] = {}
+            nxt = 0
+            def on_chunk(i: int, rows: List[Dict[str,Any]]):
+                nonlocal nxt
+                held[i] = rows
+                while nxt in held:
+                    rows = held.pop(nxt); nxt += 1
+                    if rows: write(rows)
+            _fetch_chunks("//blp/refdata", "ReferenceDataRequest", securities, REF_FIELDS, on_chunk)
+        if w.rows == 0:
+            raise RuntimeError("No refdata rows returned; check entitlements.")
+    typer.echo(f"[OK] Wrote {out} ({w.rows:,} rows in {w.row_groups} row groups, version {w.version}).")
+    return w.rows
+
+def build_universe(securities: List[str], out: Path, incremental: bool = False,
+                   stale_fraction: float = 0.05, run: Optional[RunState] = None) -> int:
+    """Refdata-enrich `securities` into `out` (versioned); incremental mode reuses unchanged rows. Returns row count."""
+    existing = load_existing(out) if incremental else None
+    if existing is not None and REFRESH_COL not in existing.columns:
+        typer.echo(f"  {out} predates incremental builds; doing a full refresh.")
+        existing = None
+    diff = diff_universe(securities, existing, key="bbg", stale_fraction=stale_fraction)
+    if existing is not None:
+        typer.echo(f"  Incremental: {diff.summary()}")
+    fetch = diff.to_fetch
+    typer.echo(f"Enriching {len(fetch):,} securities with Bloomberg refdata...")
+    ckpt = run.chunks("refdata", fingerprint("ReferenceDataRequest", fetch, REF_FIELDS, BLP_CHUNK)) if run else None
+    if existing is None:
+        n = _stream_universe(fetch, out, ckpt)
+    else:
+        rdf = refdata(fetch, REF_FIELDS, checkpoint=ckpt) if fetch else pd.DataFrame()
+        fresh = normalize_ref(rdf) if not rdf.empty else existing.iloc[0:0]
+        norm = merge_refresh(existing, fresh, diff, securities, key="bbg")
+        version = write_versioned(norm, out)
+        typer.echo(f"[OK] Wrote {out} ({len(norm):,} rows, version {version}).")
+        n = len(norm)
+    tags = pd.read_parquet(out, columns=["is_common","is_etf","is_adr"])
+    typer.echo(f"     Common stocks: {tags['is_common'].sum()}")
+    typer.echo(f"     ETFs: {tags['is_etf'].sum()}")
+    typer.echo(f"     ADRs: {tags['is_adr'].sum()}")
+    return n
+
 @app.command()
 def beqs(common: str = typer.Option("US_COMMON_PRIMARY"),
          etf:    str = typer.Option("US_ETF_PRIMARY"),
          adr:    str = typer.Option("US_ADR_PRIMARY"),
          screen_type: str = typer.Option("PRIVATE"),
-         out: str = typer.Option(str(CAT / "beqs_securities.parquet"))):
+         out: str = typer.Option(str(CAT / "beqs_securities.parquet")),
+         refresh: bool = typer.Option(False, help="Ignore cached screen output")):
     """Pull securities from saved BEQS screens (stocks, ETFs, ADRs)."""
     typer.echo(f"Fetching from BEQS screens:")
     typer.echo(f"  Common stocks: {common}")
@@ -460,14 +440,14 @@ def beqs(common: str = typer.Option("US_COMMON_PRIMARY"),
     secs=[]
     try:
         typer.echo(f"\nPulling {common}...")
-        secs += beqs_list(common, screen_type)
+        secs += beqs_list(common, screen_type, refresh=refresh)
         typer.echo(f"  Found {len(secs)} securities")
     except Exception as e:
         typer.echo(f"  [WARN] Could not fetch {common}: {e}")
     
     try:
         typer.echo(f"\nPulling {etf}...")
-        etfs = beqs_list(etf, screen_type)
+        etfs = beqs_list(etf, screen_type, refresh=refresh)
         secs += etfs
         typer.echo(f"  Found {len(etfs)} ETFs")
     except Exception as e:
@@ -475,7 +455,7 @@ def beqs(common: str = typer.Option("US_COMMON_PRIMARY"),
     
     try:
         typer.echo(f"\nPulling {adr}...")
-        adrs = beqs_list(adr, screen_type)
+        adrs = beqs_list(adr, screen_type, refresh=refresh)
         secs += adrs
         typer.echo(f"  Found {len(adrs)} ADRs")
     except Exception as e:
@@ -491,21 +471,17 @@ def beqs(common: str = typer.Option("US_COMMON_PRIMARY"),
 
 @app.command()
 def refdata_enrich(beqs_path: str = typer.Option(str(CAT / "beqs_securities.parquet")),
-                   out: str = typer.Option(str(CAT / "us_universe.parquet"))):
+                   out: str = typer.Option(str(CAT / "us_universe.parquet")),
+                   incremental: bool = typer.Option(False, help="Refetch only new listings plus a stale slice"),
+                   stale_fraction: float = typer.Option(0.05, help="Share of unchanged rows refetched per incremental run")):
     """Enrich BEQS with refdata; write us_universe.parquet."""
     if not Path(beqs_path).exists(): 
         typer.echo("Missing BEQS list. Run `beqs` first."); raise typer.Exit(2)
     b = pd.read_parquet(beqs_path)
-    typer.echo(f"Enriching {len(b):,} securities with Bloomberg refdata...")
-    rdf = refdata(b["bbg"].tolist(), REF_FIELDS)
-    if rdf.empty:
-        typer.echo("No refdata rows returned; check entitlements."); raise typer.Exit(1)
-    norm = normalize_ref(rdf)
-    norm.to_parquet(out, index=False)
-    typer.echo(f"[OK] Wrote {out} ({len(norm):,} rows).")
-    typer.echo(f"     Common stocks: {norm['is_common'].sum()}")
-    typer.echo(f"     ETFs: {norm['is_etf'].sum()}")
-    typer.echo(f"     ADRs: {norm['is_adr'].sum()}")
+    try:
+        build_universe(b["bbg"].tolist(), Path(out), incremental, stale_fraction)
+    except RuntimeError as e:
+        typer.echo(str(e)); raise typer.Exit(1)
 
 @app.command()
 def stats_cmd(out: str = typer.Option(str(CAT / "stats.parquet")),
@@ -519,10 +495,24 @@ def stats_cmd(out: str = typer.Option(str(CAT / "stats.parquet")),
     st.to_parquet(out, index=False)
     typer.echo(f"[OK] Wrote {out} ({len(st):,} rows).")
 
+def run_orats_coverage(symbols: List[str], out: Path, max_workers: int = 8,
+                       resume: bool = True, max_age_days: float = 7.0) -> pd.DataFrame:
+    """Probe coverage, resuming from `out` and its journal; journal is removed once `out` is written."""
+    journal = out.with_suffix(".journal.jsonl")
+    previous = pd.read_parquet(out) if resume and out.exists() else None
+    if not resume and journal.exists(): journal.unlink()
+    df = check_orats_coverage(symbols, max_workers=max_workers, previous=previous,
+                              journal_path=journal, max_age_days=max_age_days if resume else None)
+    df.to_parquet(out, index=False)
+    ProbeJournal(journal).close(remove=True)
+    return df
+
 @app.command()
 def orats_cmd(universe_path: str = typer.Option(str(CAT / "us_universe.parquet")),
           out: str = typer.Option(str(CAT / "orats_coverage.parquet")),
-          max_workers: int = typer.Option(8)):
+          max_workers: int = typer.Option(8),
+          resume: bool = typer.Option(True, help="Skip symbols checked within --max-age-days (from previous output/journal)"),
+          max_age_days: float = typer.Option(7.0, help="Re-probe symbols whose last_checked_utc is older than this")):
     """Probe ORATS coverage & canonical symbol forms."""
     if not Path(universe_path).exists():
         typer.echo("Missing us_universe.parquet. Run `refdata-enrich` first."); raise typer.Exit(2)
@@ -530,25 +520,31 @@ def orats_cmd(universe_path: str = typer.Option(str(CAT / "us_universe.parquet")
     # Focus first on common stocks + ETFs (most optionable); ADRs optional
     symbols = sm["symbol"].dropna().astype(str).unique().tolist()
     typer.echo(f"Checking ORATS coverage for {len(symbols):,} symbols...")
-    df = check_orats_coverage(symbols, max_workers=max_workers)
-    df.to_parquet(out, index=False)
+    df = run_orats_coverage(symbols, Path(out), max_workers=max_workers, resume=resume, max_age_days=max_age_days)
     ok_count = df['orats_ok'].sum()
     typer.echo(f"[OK] Wrote {out} ({len(df):,} symbols checked, {ok_count:,} available on ORATS).")
+    lim = orats_http.limiter().stats
+    typer.echo(f"     Rate limiter: {lim.waited:,}/{lim.acquired:,} requests waited "
+               f"(avg {lim.snapshot()['wait_ms_avg']:.0f}ms, max {lim.wait_ms_max:.0f}ms, {lim.throttled} throttled)")
+
+SECTOR_ETFS = [("XLB","Basic Materials"),("XLE","Energy"),("XLF","Financials"),("XLI","Industrials"),
+               ("XLK","Information Technology"),("XLP","Consumer Staples"),("XLU","Utilities"),
+               ("XLV","Health Care"),("XLY","Consumer Discretionary"),("XLC","Communication Services"),
+               ("SMH","Semiconductors"),("SOXX","Semiconductors"),("XBI","Biotech"),("KBE","Banks"),("XOP","Oil & Gas")]
+COUNTRY_ETFS = [("SPY","US"),("QQQ","US"),("IWM","US"),("EWJ","JP"),("EWG","DE"),("EWQ","FR"),
+                ("EWU","GB"),("EWP","ES"),("EWI","IT"),("EWL","CH"),("EWN","NL"),
+                ("EWA","AU"),("EWC","CA"),("EWZ","BR"),("EWT","TW"),("EWY","KR"),("EWH","HK"),
+                ("MCHI","CN"),("FXI","CN"),("EWW","MX"),("EZA","ZA"),("INDA","IN"),("EPI","IN")]
+
+def etf_rows() -> List[Dict[str, Any]]:
+    rows = [{"etf":etf,"type":"sector","sector":sec,"country":None} for etf, sec in SECTOR_ETFS]
+    rows += [{"etf":etf,"type":"country","sector":None,"country":c} for etf, c in COUNTRY_ETFS]
+    return rows
 
 @app.command()
 def etfs_cmd(out: str = typer.Option(str(CAT / "etf_catalog.parquet"))):
     """Seed sector/country ETF map for sympathy proxies (edit freely)."""
-    rows=[]
-    sector = [("XLB","Basic Materials"),("XLE","Energy"),("XLF","Financials"),("XLI","Industrials"),
-              ("XLK","Information Technology"),("XLP","Consumer Staples"),("XLU","Utilities"),
-              ("XLV","Health Care"),("XLY","Consumer Discretionary"),("XLC","Communication Services"),
-              ("SMH","Semiconductors"),("SOXX","Semiconductors"),("XBI","Biotech"),("KBE","Banks"),("XOP","Oil & Gas")]
-    country = [("SPY","US"),("QQQ","US"),("IWM","US"),("EWJ","JP"),("EWG","DE"),("EWQ","FR"),
-               ("EWU","GB"),("EWP","ES"),("EWI","IT"),("EWL","CH"),("EWN","NL"),
-               ("EWA","AU"),("EWC","CA"),("EWZ","BR"),("EWT","TW"),("EWY","KR"),("EWH","HK"),
-               ("MCHI","CN"),("FXI","CN"),("EWW","MX"),("EZA","ZA"),("INDA","IN"),("EPI","IN")]
-    for etf, sec in sector: rows.append({"etf":etf,"type":"sector","sector":sec,"country":None})
-    for etf, c  in country: rows.append({"etf":etf,"type":"country","sector":None,"country":c})
+    rows = etf_rows()
     pd.DataFrame(rows).to_parquet(out, index=False)
     typer.echo(f"[OK] Wrote {out} ({len(rows)} ETFs).")
 
@@ -557,132 +553,111 @@ def all_cmd(common: str = typer.Option("US_COMMON_PRIMARY"),
             etf: str = typer.Option("US_ETF_PRIMARY"),
             adr: str = typer.Option("US_ADR_PRIMARY"),
             screen_type: str = typer.Option("PRIVATE"),
-            skip_orats: bool = typer.Option(False, help="Skip ORATS coverage check (faster)")):
-    """Run end-to-end: BEQS -> Refdata -> Stats -> ETF map (optionally ORATS)."""
+            skip_orats: bool = typer.Option(False, help="Skip ORATS coverage check (faster)"),
+            incremental: bool = typer.Option(False, help="Refetch refdata only for new listings plus a stale slice"),
+            stale_fraction: float = typer.Option(0.05, help="Share of unchanged rows refetched per incremental run"),
+            fresh: bool = typer.Option(False, help="Discard checkpoints left by an interrupted run"),
+            refresh_beqs: bool = typer.Option(False, help="Ignore cached BEQS screen output"),
+            workers: int = typer.Option(4, help="Independent steps run concurrently")):
+    """Run end-to-end as a DAG: BEQS -> Refdata -> {Stats, ORATS}, ETF map alongside; reruns resume."""
     typer.echo("=" * 70)
     typer.echo("US UNIVERSE PIPELINE - FULL BUILD")
     typer.echo("=" * 70)
-    
-    # Step 1: BEQS
-    typer.echo("\n[1/5] Fetching BEQS universes...")
-    typer.echo(f"  Common stocks: {common}")
-    typer.echo(f"  ETFs: {etf}")
-    typer.echo(f"  ADRs: {adr}")
-    
-    secs = []
-    try:
-        typer.echo(f"\nPulling {common}...")
-        secs += beqs_list(common, screen_type)
-        typer.echo(f"  Found {len(secs)} securities")
-    except Exception as e:
-        typer.echo(f"  [WARN] Could not fetch {common}: {e}")
-    
-    try:
-        typer.echo(f"\nPulling {etf}...")
-        etfs_list = beqs_list(etf, screen_type)
-        secs += etfs_list
-        typer.echo(f"  Found {len(etfs_list)} ETFs")
-    except Exception as e:
-        typer.echo(f"  [WARN] Could not fetch {etf}: {e}")
-    
-    try:
-        typer.echo(f"\nPulling {adr}...")
-        adrs_list = beqs_list(adr, screen_type)
-        secs += adrs_list
-        typer.echo(f"  Found {len(adrs_list)} ADRs")
-    except Exception as e:
-        typer.echo(f"  [WARN] Could not fetch {adr}: {e}")
-    
-    if not secs:
-        typer.echo("\n[ERROR] No securities retrieved. Check screen names exist in Terminal.")
-        raise typer.Exit(1)
-    
+
+    run = RunState(CAT / ".run")
+    if fresh:
+        run.clear()
+    elif run.root.exists():
+        typer.echo(f"Resuming interrupted run from {run.root} (use --fresh to start over)")
+
     beqs_path = CAT / "beqs_securities.parquet"
-    pd.DataFrame({"bbg": list(dict.fromkeys(secs))}).to_parquet(beqs_path, index=False)
-    typer.echo(f"\n[OK] Wrote {beqs_path} ({len(set(secs)):,} unique securities).")
-    
-    # Step 2: Refdata
-    typer.echo("\n[2/5] Enriching with Bloomberg refdata...")
-    b = pd.read_parquet(beqs_path)
-    rdf = refdata(b["bbg"].tolist(), REF_FIELDS)
-    if rdf.empty:
-        typer.echo("No refdata rows returned; check entitlements."); raise typer.Exit(1)
-    norm = normalize_ref(rdf)
     universe_path = CAT / "us_universe.parquet"
-    norm.to_parquet(universe_path, index=False)
-    typer.echo(f"[OK] Wrote {universe_path} ({len(norm):,} rows).")
-    typer.echo(f"     Common stocks: {norm['is_common'].sum()}")
-    typer.echo(f"     ETFs: {norm['is_etf'].sum()}")
-    typer.echo(f"     ADRs: {norm['is_adr'].sum()}")
-    
-    # Step 3: Stats (use refdata since static market data not available)
-    typer.echo("\n[3/5] Computing liquidity stats via refdata...")
-    sm = pd.read_parquet(universe_path)
-    typer.echo(f"    Fetching stats for {len(sm):,} securities...")
-    snap_fields = ["PX_LAST", "VOLUME_AVG_30D", "VOLUME_AVG_20D", "BID", "ASK", "CRNCY"]
-    snap_df = refdata(sm["bbg"].tolist(), snap_fields)
-    
-    # Merge and compute
-    tmp = sm[["bbg","symbol"]].merge(snap_df, on="bbg", how="left")
-    
-    # ADV USD
-    adv_usd = []
-    for _, r in tmp.iterrows():
-        v = r.get("VOLUME_AVG_30D") if pd.notna(r.get("VOLUME_AVG_30D")) else r.get("VOLUME_AVG_20D")
-        px = r.get("PX_LAST")
-        # Assuming USD for simplicity (FX conversion would add time)
-        if pd.notna(v) and pd.notna(px) and v > 0 and px > 0:
-            adv_usd.append(float(v) * float(px))
-        else:
-            adv_usd.append(None)
-    
-    # Spread bps
-    spreads = []
-    for _, r in tmp.iterrows():
-        bid, ask = r.get("BID"), r.get("ASK")
-        if pd.notna(bid) and pd.notna(ask) and bid > 0 and ask > 0:
-            mid = 0.5 * (bid + ask)
-            bps = (ask - bid) / mid * 10000.0
-            spreads.append(max(bps, 0.0))
-        else:
-            spreads.append(None)
-    
-    st = pd.DataFrame({"symbol": tmp["symbol"], "adv_usd": adv_usd, "avg_spread_bps": spreads})
-    st = st.groupby("symbol", as_index=False).agg({"adv_usd":"max","avg_spread_bps":"min"})
-    
     stats_path = CAT / "stats.parquet"
-    st.to_parquet(stats_path, index=False)
-    typer.echo(f"[OK] Wrote {stats_path} ({len(st):,} rows).")
-    
-    # Step 4: ETFs
-    typer.echo("\n[4/5] Creating ETF catalog...")
-    rows=[]
-    sector = [("XLB","Basic Materials"),("XLE","Energy"),("XLF","Financials"),("XLI","Industrials"),
-              ("XLK","Information Technology"),("XLP","Consumer Staples"),("XLU","Utilities"),
-              ("XLV","Health Care"),("XLY","Consumer Discretionary"),("XLC","Communication Services"),
-              ("SMH","Semiconductors"),("SOXX","Semiconductors"),("XBI","Biotech"),("KBE","Banks"),("XOP","Oil & Gas")]
-    country = [("SPY","US"),("QQQ","US"),("IWM","US"),("EWJ","JP"),("EWG","DE"),("EWQ","FR"),
-               ("EWU","GB"),("EWP","ES"),("EWI","IT"),("EWL","CH"),("EWN","NL"),
-               ("EWA","AU"),("EWC","CA"),("EWZ","BR"),("EWT","TW"),("EWY","KR"),("EWH","HK"),
-               ("MCHI","CN"),("FXI","CN"),("EWW","MX"),("EZA","ZA"),("INDA","IN"),("EPI","IN")]
-    for e, sec in sector: rows.append({"etf":e,"type":"sector","sector":sec,"country":None})
-    for e, c  in country: rows.append({"etf":e,"type":"country","sector":None,"country":c})
     etf_path = CAT / "etf_catalog.parquet"
-    pd.DataFrame(rows).to_parquet(etf_path, index=False)
-    typer.echo(f"[OK] Wrote {etf_path} ({len(rows)} ETFs).")
-    
-    # Step 5: ORATS (optional)
-    if not skip_orats:
-        typer.echo("\n[5/5] Checking ORATS coverage...")
+    orats_path = CAT / "orats_coverage.parquet"
+
+    def screen(name: str) -> Callable[[Dict[str, Any]], List[str]]:
+        def _run(ctx):
+            typer.echo(f"\n[beqs] Pulling {name}...")
+            try:
+                secs = beqs_list(name, screen_type, refresh=refresh_beqs)
+            except Exception as e:
+                typer.echo(f"  [WARN] Could not fetch {name}: {e}")
+                secs = []
+            typer.echo(f"  Found {len(secs)} securities in {name}")
+            return secs
+        return _run
+
+    def beqs_step(ctx):
+        secs = ctx["beqs_common"] + ctx["beqs_etf"] + ctx["beqs_adr"]
+        if not secs:
+            raise RuntimeError("No securities retrieved. Check screen names exist in Terminal.")
+        uniq = list(dict.fromkeys(secs))
+        pd.DataFrame({"bbg": uniq}).to_parquet(beqs_path, index=False)
+        typer.echo(f"\n[OK] Wrote {beqs_path} ({len(uniq):,} unique securities).")
+        return len(uniq)
+
+    def refdata_step(ctx):
+        typer.echo("\n[refdata] Enriching with Bloomberg refdata...")
+        b = pd.read_parquet(beqs_path)
+        return build_universe(b["bbg"].tolist(), universe_path, incremental, stale_fraction, run=run)
+
+    def stats_step(ctx):
+        # Stats via refdata since static market data is not always entitled
+        sm = pd.read_parquet(universe_path)
+        typer.echo(f"\n[stats] Fetching stats for {len(sm):,} securities...")
+        snap_fields = ["PX_LAST", "VOLUME_AVG_30D", "VOLUME_AVG_20D", "BID", "ASK", "CRNCY"]
+        secs = sm["bbg"].tolist()
+        ckpt = run.chunks("stats", fingerprint("ReferenceDataRequest", secs, snap_fields, BLP_CHUNK))
+        snap_df = refdata(secs, snap_fields, checkpoint=ckpt)
+        tmp = sm[["bbg","symbol"]].merge(snap_df, on="bbg", how="left") if not snap_df.empty else sm[["bbg","symbol"]]
+        fx_map = fx_rates(tmp["CRNCY"]) if "CRNCY" in tmp.columns else {}
+        st = liquidity_stats(tmp, fx_map)
+        st.to_parquet(stats_path, index=False)
+        typer.echo(f"[OK] Wrote {stats_path} ({len(st):,} rows).")
+        return len(st)
+
+    def etfs_step(ctx):
+        rows = etf_rows()
+        pd.DataFrame(rows).to_parquet(etf_path, index=False)
+        typer.echo(f"\n[OK] Wrote {etf_path} ({len(rows)} ETFs).")
+        return len(rows)
+
+    def orats_step(ctx):
+        sm = pd.read_parquet(universe_path)
         symbols = sm["symbol"].dropna().astype(str).unique().tolist()
-        df_orats = check_orats_coverage(symbols, max_workers=8)
-        orats_path = CAT / "orats_coverage.parquet"
-        df_orats.to_parquet(orats_path, index=False)
-        ok_count = df_orats['orats_ok'].sum()
-        typer.echo(f"[OK] Wrote {orats_path} ({len(df_orats):,} symbols checked, {ok_count:,} available on ORATS).")
-    else:
-        typer.echo("\n[5/5] Skipped ORATS coverage check")
-    
+        typer.echo(f"\n[orats] Checking ORATS coverage for {len(symbols):,} symbols...")
+        df_orats = run_orats_coverage(symbols, orats_path, max_workers=8)
+        typer.echo(f"[OK] Wrote {orats_path} ({len(df_orats):,} symbols checked, {df_orats['orats_ok'].sum():,} available on ORATS).")
+        return len(df_orats)
+
+    steps = [
+        Step("beqs_common", screen(common), rows=len),
+        Step("beqs_etf", screen(etf), rows=len),
+        Step("beqs_adr", screen(adr), rows=len),
+        Step("beqs", beqs_step, ["beqs_common", "beqs_etf", "beqs_adr"], rows=int),
+        Step("refdata", refdata_step, ["beqs"], rows=int),
+        Step("stats", stats_step, ["refdata"], rows=int),
+        Step("etfs", etfs_step, rows=int),
+    ]
+    if not skip_orats:
+        steps.append(Step("orats", orats_step, ["refdata"], rows=int))
+
+    t0 = time.perf_counter()
+    results = Dag(steps, state=run, max_workers=workers).run()
+    wall = time.perf_counter() - t0
+
+    typer.echo("\n" + "=" * 70)
+    typer.echo(f"STEP SUMMARY ({wall:.1f}s wall)")
+    typer.echo("=" * 70)
+    for s in steps:
+        typer.echo(results[s.name].line())
+    failed = [r.name for r in results.values() if r.status in ("failed", "skipped")]
+    if failed:
+        typer.echo(f"\n[ERROR] Incomplete: {', '.join(failed)}. Completed steps and chunks are checkpointed in {run.root}; rerun to resume.")
+        raise typer.Exit(1)
+    run.clear()
+
     typer.echo("\n" + "=" * 70)
     typer.echo("CATALOG BUILD COMPLETE")
     typer.echo("=" * 70)